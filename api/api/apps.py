@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    name = 'api'
+
+    def ready(self):
+        # Branche le profil SQLite sur l'ouverture des connexions et la vérification des caches
+        from . import caching, db  # noqa: F401
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from users.authentication import user_snapshot_cache
+from .renderers import FastJSONRenderer
+
+User = get_user_model()
+
+
+# Vue Django asynchrone pour les endpoints de lecture servis sous ASGI (/api/async/...) :
+# authentification JWT, permissions et requêtes via l'ORM asynchrone (aget, acount, async for),
+# puis sérialisation par les serializers DRF sur des objets entièrement chargés.
+# Les erreurs ont le même format que celles de DRF ({"detail": ...}).
+class AsyncAPIView(View):
+    http_method_names = ['get', 'head']
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+        try:
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            user = await self.authenticate(request)
+            # Request DRF sans authentificateur : query_params et build_absolute_uri pour les serializers
+            self.drf_request = Request(request, authenticators=())
+            self.drf_request.user = user
+            return await handler(request, *args, **kwargs)
+        except exceptions.APIException as e:
+            headers = {}
+            if isinstance(e, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                headers['WWW-Authenticate'] = JWTAuthentication().authenticate_header(request)
+            data = e.detail if isinstance(e.detail, (list, dict)) else {'detail': e.detail}
+            return self.render(data, status=e.status_code, headers=headers)
+
+    async def head(self, request, *args, **kwargs):
+        response = await self.get(request, *args, **kwargs)
+        response.content = b''
+        return response
+
+    async def authenticate(self, request):
+        # Même validation que CachedJWTAuthentication, l'utilisateur absent du cache
+        # étant lu par l'ORM asynchrone
+        authentication = JWTAuthentication()
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            raise exceptions.NotAuthenticated()
+        token = authentication.get_validated_token(raw_token)
+        try:
+            user_id = token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise exceptions.AuthenticationFailed("Token contained no recognizable user identification")
+        user = await user_snapshot_cache.aget(user_id)
+        if user is None:
+            try:
+                user = await user_snapshot_cache.aload(id=user_id)
+            except User.DoesNotExist:
+                raise exceptions.AuthenticationFailed("User not found", code='user_not_found')
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed("User is inactive", code='user_inactive')
+        return user
+
+    async def get_object_or_404(self, queryset, **lookup):
+        obj = await queryset.filter(**lookup).afirst()
+        if obj is None:
+            raise exceptions.NotFound()
+        return obj
+
+    async def paginate(self, queryset, serializer_class):
+        # Pagination limit/offset (même format que LimitOffsetPagination) : comptage et page
+        # lus par l'ORM asynchrone
+        paginator = LimitOffsetPagination()
+        paginator.request = self.drf_request
+        paginator.limit = paginator.get_limit(self.drf_request)
+        paginator.offset = paginator.get_offset(self.drf_request)
+        paginator.count = await queryset.acount()
+        page = []
+        if paginator.count and paginator.offset < paginator.count:
+            page = [obj async for obj in queryset[paginator.offset:paginator.offset + paginator.limit]]
+        return {
+            'count': paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': serializer_class(page, many=True, context=self.get_serializer_context()).data,
+        }
+
+    def get_serializer_context(self):
+        return {'request': self.drf_request, 'view': self}
+
+    def render(self, data, status=status.HTTP_200_OK, headers=None):
+        return HttpResponse(
+            FastJSONRenderer().render(data), status=status,
+            content_type='application/json', headers=headers,
+        )
@@ -0,0 +1,62 @@
+import uuid
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+
+
+def new_generation():
+    return uuid.uuid4().hex[:12]
+
+
+# Espace de clés d'un cache applicatif (appartenances, clichés d'authentification) dans un
+# alias de CACHES partagé avec d'autres usages. Les clés portent une génération stockée dans
+# le même cache : clear() en change au lieu de vider tout l'alias, les anciennes clés
+# expirent d'elles-mêmes. Une génération évincée est remplacée par une nouvelle, jamais réutilisée.
+class CacheNamespace:
+
+    def __init__(self, alias, prefix):
+        self.alias = alias
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def generation_key(self):
+        return f"{self.prefix}:generation"
+
+    def key(self, name):
+        generation = self.cache.get_or_set(self.generation_key, new_generation, None)
+        return f"{self.prefix}:{generation}:{name}"
+
+    async def akey(self, name):
+        generation = await self.cache.aget_or_set(self.generation_key, new_generation, None)
+        return f"{self.prefix}:{generation}:{name}"
+
+    def clear(self):
+        self.cache.set(self.generation_key, new_generation(), None)
+
+
+# Les caches applicatifs servent à éviter des requêtes : stockés dans la table de cache
+# de la base (DatabaseCache), chaque lecture coûterait au moins la requête évitée.
+@checks.register(checks.Tags.caches)
+def check_application_caches(app_configs, **kwargs):
+    from projects.membership import membership_cache
+    from users.authentication import user_snapshot_cache
+    aliases = [('USER_SNAPSHOT_CACHE', user_snapshot_cache.options['CACHE_ALIAS'])]
+    if membership_cache.options['BACKEND'] == 'django':
+        aliases.append(('MEMBERSHIP_CACHE', membership_cache.options['CACHE_ALIAS']))
+    errors = []
+    for setting, alias in aliases:
+        if alias not in settings.CACHES:
+            errors.append(checks.Error(f"{setting} : alias de cache inconnu '{alias}'", id='api.E001'))
+        elif isinstance(caches[alias], DatabaseCache):
+            errors.append(checks.Error(
+                f"{setting} : le cache '{alias}' est stocké en base et n'évite aucune requête",
+                hint="Utiliser Redis (CACHE_REDIS_URL) ou memcached, ou le cache local à TTL court.",
+                id='api.E002',
+            ))
+    return errors
@@ -0,0 +1,97 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Q
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def users_last_modified(*user_ids):
+    # Dernière modification des utilisateurs affichés par leur username dans une réponse.
+    # user_ids : listes ou querysets d'identifiants (sous-requêtes, sans jointure)
+    condition = Q()
+    for ids in user_ids:
+        condition |= Q(pk__in=ids)
+    return get_user_model().objects.filter(condition).aggregate(last_modified=Max('updated_time'))['last_modified']
+
+
+class NotModified(Exception):
+    # Interrompt la requête après les permissions : la réponse 304 est déjà construite
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+# Mixin de GET conditionnel : ETag faible et Last-Modified calculés à partir de
+# get_validator_state(), sans sérialiser la réponse. Une requête dont l'If-None-Match
+# correspond reçoit un 304 Not Modified. Les permissions sont vérifiées avant.
+# Une vue qui ne redéfinit pas get_validator_state() répond normalement, sans validateur.
+class ConditionalGetMixin:
+    # Pour une collection, une suppression peut faire reculer max(updated_time) :
+    # seul l'ETag (qui inclut le nombre de lignes) sert alors de validateur
+    last_modified_is_validator = False
+
+    def get_validator_state(self, request, *args, **kwargs):
+        # Renvoie (last_modified, token) ; token résume ce que last_modified ne couvre pas
+        # (nombre de lignes...). None : pas de validation (ex. ressource inexistante).
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = self.last_modified = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        state = self.get_validator_state(request, *args, **kwargs)
+        if state is None:
+            return
+        self.last_modified, token = state
+        self.etag = self.make_etag(request, token)
+        response = get_conditional_response(
+            request._request,
+            etag=self.etag,
+            last_modified=self.get_timestamp() if self.last_modified_is_validator else None,
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def make_etag(self, request, token):
+        # La réponse dépend aussi de l'URL (pagination, ?fields=), de l'utilisateur et du format
+        value = '|'.join(str(part) for part in (
+            request.get_full_path(), request.user.pk, request.accepted_renderer.format,
+            self.last_modified.isoformat() if self.last_modified else '', token,
+        ))
+        return f'W/"{hashlib.md5(value.encode(), usedforsecurity=False).hexdigest()}"'
+
+    def get_timestamp(self):
+        return int(self.last_modified.timestamp()) if self.last_modified else None
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'etag', None) and response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            if self.last_modified:
+                response['Last-Modified'] = http_date(self.get_timestamp())
+        return response
+
+
+# Variante pour les vues génériques de détail : l'objet chargé (et dont les permissions
+# sont vérifiées) pour calculer l'ETag est réutilisé par retrieve()
+class ConditionalObjectMixin(ConditionalGetMixin):
+    last_modified_is_validator = True
+    # Relations affichées par slug (titre, username) : leur modification change aussi la réponse
+    validator_relations = ()
+
+    def get_validator_state(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        related = (getattr(self.object, name) for name in self.validator_relations)
+        return max([self.object.updated_time, *(obj.updated_time for obj in related if obj is not None)]), ''
+
+    def get_object(self):
+        if getattr(self, 'object', None) is not None:
+            return self.object
+        return super().get_object()
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Pragmas appliqués à chaque nouvelle connexion SQLite, selon settings.SQLITE_PROFILE.
+# production : journal WAL (les lectures ne bloquent plus l'écriture ni l'inverse),
+# fsync aux checkpoints seulement (synchronous=NORMAL, sans risque de corruption en WAL),
+# lectures par mmap, cache de pages de 64 Mo et attente des verrous au lieu d'une erreur
+# immédiate "database is locked".
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'busy_timeout': 5000,
+    },
+}
+
+
+def sqlite_pragmas(profile):
+    return [f"PRAGMA {name} = {value}" for name, value in SQLITE_PROFILES[profile].items()]
+
+
+@receiver(connection_created)
+def apply_sqlite_profile(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(getattr(settings, 'SQLITE_PROFILE', 'default'))
+    if pragmas:
+        with connection.cursor() as cursor:
+            for pragma in pragmas:
+                cursor.execute(pragma)
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from api.db import SQLITE_PROFILES, sqlite_pragmas
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare les profils SQLite (settings.SQLITE_PROFILE) sous écritures concurrentes : "
+        "chaque écrivain enchaîne des transactions lecture puis écriture, comme une vue de création, "
+        "pendant que des lecteurs parcourent la table. Base temporaire, la base configurée n'est pas touchée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help="Écrivains simultanés (un par worker)")
+        parser.add_argument('--readers', type=int, default=4, help="Lecteurs simultanés")
+        parser.add_argument('--duration', type=float, default=5, help="Durée de chaque mesure (s)")
+        parser.add_argument('--profiles', nargs='+', default=list(SQLITE_PROFILES), choices=list(SQLITE_PROFILES))
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'profil':<12}{'écritures/s':>13}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+            f"{'verrouillées':>14}{'lectures/s':>12}"
+        )
+        for profile in options['profiles']:
+            with tempfile.TemporaryDirectory() as directory:
+                result = run(
+                    os.path.join(directory, 'bench.sqlite3'), profile,
+                    options['writers'], options['readers'], options['duration'],
+                )
+            self.write_result(profile, result)
+
+    def write_result(self, profile, result):
+        latencies = sorted(result['latencies'])
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else (latencies or [0]) * 99
+        self.stdout.write(
+            f"{profile:<12}{len(latencies) / result['duration']:>13.0f}{quantiles[49]:>10.1f}"
+            f"{quantiles[94]:>10.1f}{quantiles[98]:>10.1f}{result['locked']:>14}"
+            f"{result['reads'] / result['duration']:>12.0f}"
+        )
+
+
+def connect(path, profile):
+    # Connexion ouverte comme celle de Django : délai d'attente de 5 s, transactions explicites
+    db = sqlite3.connect(path, timeout=5, isolation_level=None)
+    for pragma in sqlite_pragmas(profile):
+        db.execute(pragma)
+    return db
+
+
+def run(path, profile, writers, readers, duration):
+    db = connect(path, profile)
+    db.execute("CREATE TABLE entry (id INTEGER PRIMARY KEY, position INTEGER, payload TEXT)")
+    db.execute("INSERT INTO entry (position, payload) VALUES (0, '')")
+    db.close()
+    # Transactions IMMEDIATE du profil production (OPTIONS transaction_mode de DATABASES)
+    begin = 'BEGIN IMMEDIATE' if profile == 'production' else 'BEGIN'
+    result = {'latencies': [], 'locked': 0, 'reads': 0, 'duration': duration}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def write():
+        db = connect(path, profile)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                db.execute(begin)
+                position = db.execute("SELECT MAX(position) FROM entry").fetchone()[0]
+                db.execute("INSERT INTO entry (position, payload) VALUES (?, ?)", (position + 1, 'x' * 200))
+                db.execute("COMMIT")
+            except sqlite3.OperationalError as e:
+                if db.in_transaction:
+                    db.execute("ROLLBACK")
+                if 'locked' not in str(e) and 'busy' not in str(e):
+                    raise
+                with lock:
+                    result['locked'] += 1
+                continue
+            with lock:
+                result['latencies'].append((time.perf_counter() - start) * 1000)
+        db.close()
+
+    def read():
+        db = connect(path, profile)
+        while time.perf_counter() < deadline:
+            try:
+                db.execute("SELECT COUNT(*), MAX(position) FROM entry").fetchone()
+            except sqlite3.OperationalError:
+                continue
+            with lock:
+                result['reads'] += 1
+        db.close()
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    threads += [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return result
@@ -0,0 +1,58 @@
+from rest_framework.pagination import BasePagination, CursorPagination, LimitOffsetPagination
+
+
+# Pagination par curseur sur (created_time, id) : pas d'OFFSET côté base,
+# les insertions concurrentes ne décalent pas les pages déjà parcourues
+class CreatedTimeCursorPagination(CursorPagination):
+    ordering = ('-created_time', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+# Pagination par curseur si le client la demande (?pagination=cursor ou ?cursor=...),
+# sinon limit/offset comme avant pour rester rétrocompatible
+class CursorOrLimitOffsetPagination(BasePagination):
+    cursor_class = CreatedTimeCursorPagination
+    offset_class = LimitOffsetPagination
+    mode_query_param = 'pagination'
+
+    def __init__(self):
+        self.paginator = self.offset_class()
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.cursor_class() if self.use_cursor(request) else self.offset_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    # Documentation (Swagger) : expose les paramètres des deux modes
+    def get_schema_operation_parameters(self, view):
+        parameters = {}
+        for paginator in (self.offset_class(), self.cursor_class()):
+            for parameter in paginator.get_schema_operation_parameters(view):
+                parameters.setdefault(parameter['name'], parameter)
+        parameters[self.mode_query_param] = {
+            'name': self.mode_query_param,
+            'required': False,
+            'in': 'query',
+            'description': "Mettre 'cursor' pour une pagination par curseur.",
+            'schema': {'type': 'string', 'enum': ['cursor']},
+        }
+        return list(parameters.values())
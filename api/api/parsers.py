@@ -0,0 +1,20 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+
+# Lecture JSON via orjson quand il est installé, sinon parseur standard de DRF
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        # orjson ne lit que l'UTF-8 et refuse toujours NaN / Infinity
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8' or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,30 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Rendu JSON via orjson quand il est installé (pip install orjson),
+# sinon rendu standard de DRF : la sortie est la même dans les deux cas.
+class FastJSONRenderer(JSONRenderer):
+    options = 0
+    if orjson is not None:
+        # datetime en "Z" comme l'encodeur DRF, clés non-str pour les erreurs de ListSerializer
+        options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        # orjson ne gère ni l'indentation libre (API navigable, "; indent=4") ni ensure_ascii
+        if (orjson is None or self.ensure_ascii
+                or self.get_indent(accepted_media_type, renderer_context) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        # Decimal, chaînes traduites, QuerySet... : même conversion que l'encodeur DRF
+        ret = orjson.dumps(data, default=encoders.JSONEncoder().default, option=self.options)
+        # Comme DRF : U+2028 / U+2029 échappés pour rester un sous-ensemble de JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,110 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Mixin pour déclarer, à côté du serializer, les relations à charger en avance
+# afin d'éviter les requêtes N+1 lors de la sérialisation
+class EagerLoadingMixin:
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    # Champs du modèle toujours chargés quand la requête est réduite (ex. tri de la pagination)
+    required_model_fields = ()
+    # Attributs lus par les champs calculés (SerializerMethodField), par nom de champ
+    field_sources = {}
+
+    @classmethod
+    def get_prefetch_related_fields(cls):
+        # Surchargé quand les Prefetch dépendent des réglages (ex. querysets limités)
+        return cls.prefetch_related_fields
+
+    @classmethod
+    def get_annotations(cls):
+        # Annotations ajoutées au queryset, par nom d'attribut
+        return {}
+
+    @classmethod
+    def get_selected_fields(cls, request):
+        # Champs du serializer demandés par le client ; None : tous les champs
+        return None
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, request=None):
+        # Applique les select_related / prefetch_related déclarés par le serializer ;
+        # avec ?fields= / ?omit=, seules les relations et colonnes demandées sont chargées
+        select_related = cls.select_related_fields
+        prefetch_related = cls.get_prefetch_related_fields()
+        annotations = cls.get_annotations()
+        selected = cls.get_selected_fields(request)
+        if selected is not None:
+            sources = cls.get_sources(selected)
+            select_related = [name for name in select_related if name.split('__')[0] in sources]
+            prefetch_related = [
+                lookup for lookup in prefetch_related
+                if getattr(lookup, 'prefetch_to', lookup).split('__')[0] in sources
+            ]
+            annotations = {name: value for name, value in annotations.items() if name in sources}
+            queryset = queryset.only(*cls.get_model_fields(queryset.model, sources))
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    @classmethod
+    def get_sources(cls, selected):
+        # Attributs du modèle lus par les champs demandés
+        fields = cls().fields
+        sources = {fields[name].source.split('.')[0] for name in selected}
+        for name in selected:
+            sources.update(cls.field_sources.get(name, ()))
+        return sources
+
+    @classmethod
+    def get_model_fields(cls, model, sources):
+        # Colonnes à charger : clé primaire et clés étrangères (utilisées par les permissions),
+        # champs requis et champs demandés
+        return [
+            field.name for field in model._meta.concrete_fields
+            if field.primary_key or field.is_relation
+            or field.name in sources or field.name in cls.required_model_fields
+        ]
+
+
+# Mixin pour les réponses partielles : ?fields=id,title ne renvoie que ces champs,
+# ?omit=description les renvoie tous sauf ceux-là. Ne s'applique qu'en lecture,
+# pour ne pas ignorer silencieusement des champs envoyés en écriture.
+class DynamicFieldsMixin:
+    fields_param = 'fields'
+    omit_param = 'omit'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.get_selected_fields(self.context.get('request'))
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_selected_fields(cls, request):
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        params = getattr(request, 'query_params', request.GET)
+        fields = cls.parse_fields(params.get(cls.fields_param))
+        omit = cls.parse_fields(params.get(cls.omit_param))
+        if not fields and not omit:
+            return None
+
+        available = list(cls.Meta.fields)
+        unknown = sorted((fields | omit) - set(available))
+        if unknown:
+            raise ValidationError({
+                cls.fields_param if fields - set(available) else cls.omit_param:
+                    [f"Champ(s) inconnu(s) : {', '.join(unknown)}."]
+            })
+        return (fields or set(available)) - omit
+
+    @staticmethod
+    def parse_fields(value):
+        return {name.strip() for name in (value or '').split(',') if name.strip()}
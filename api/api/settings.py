@@ -10,9 +10,18 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
+# Pool de connexions PostgreSQL natif de Django s'il est installé (pip install "psycopg[pool]")
+try:
+    import psycopg_pool
+except ImportError:
+    psycopg_pool = None
+
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -33,11 +42,21 @@ AUTH_USER_MODEL = 'users.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # JSON via orjson s'il est installé (pip install orjson), sinon encodeur standard de DRF
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 5
 }
@@ -52,6 +71,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    'api',
     'users',
     'projects',
     'issues',
@@ -87,23 +107,168 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api.wsgi.application'
 
+# Caches Django. 'default' est propre à chaque processus ; 'shared', commun à tous les
+# processus et à tous les serveurs, n'existe qu'avec Redis (CACHE_REDIS_URL, pip install redis).
+# Les caches dont une invalidation protège des droits d'accès (appartenances, clichés
+# d'authentification) l'utilisent alors ; sans Redis, ils restent locaux avec un TTL court.
+# Un cache stocké en base n'éviterait aucune requête : refusé par `manage.py check` (api.caching).
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+if CACHE_REDIS_URL:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+    }
+
+# Cache des projets accessibles par utilisateur (projects.membership)
+# BACKEND : 'django' (cache CACHE_ALIAS de CACHES, partagé) ou 'local' (LRU en mémoire du
+# processus : un contributeur retiré garde l'accès jusqu'à TIMEOUT secondes sur les autres processus)
+MEMBERSHIP_CACHE = {
+    'BACKEND': 'django',
+    'CACHE_ALIAS': 'shared',
+    'TIMEOUT': 300,
+} if CACHE_REDIS_URL else {
+    'BACKEND': 'local',
+    'MAX_ENTRIES': 10000,
+    'TIMEOUT': 5,
+}
+
+# Cache du détail des projets (projects.detail_cache), stocké dans le cache CACHE_ALIAS de CACHES.
+# Le cache par défaut est propre à chaque processus : utiliser un cache partagé en production.
+PROJECT_DETAIL_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 3600,
+}
+
+# Journal des modifications (projects.changes) : les lignes de moins de SETTLE_SECONDS ne sont
+# pas encore servies (une transaction plus ancienne peut encore valider un identifiant plus
+# petit) ; prune_project_changes purge les tombstones de plus de RETENTION_DAYS jours.
+PROJECT_CHANGES = {
+    'SETTLE_SECONDS': 10,
+    'RETENTION_DAYS': 30,
+}
+
+# Cache des statistiques de projet (projects.stats) ; TIMEOUT à 0 : pas de cache
+PROJECT_STATS_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 30,
+}
+
+# Nombre maximal de contributeurs et d'issues imbriqués dans le détail d'un projet
+PROJECT_DETAIL_NESTED_LIMITS = {
+    'contributors': 20,
+    'issues': 20,
+}
+
+# Cliché de l'utilisateur authentifié (users.authentication), stocké dans le cache CACHE_ALIAS.
+# Avec un cache local, une désactivation ou une suppression faite par un autre processus est vue
+# au plus tard après TIMEOUT secondes. TIMEOUT à 0 : pas de cliché.
+USER_SNAPSHOT_CACHE = {
+    'CACHE_ALIAS': 'shared',
+    'TIMEOUT': 60,
+} if CACHE_REDIS_URL else {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 5,
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    # Liste noire compacte des refresh tokens utilisés (users.tokens, purge : prune_token_blacklist)
+    'TOKEN_REFRESH_SERIALIZER': 'users.tokens.BlacklistingTokenRefreshSerializer',
 }
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Base choisie par l'environnement : DB_ENGINE=sqlite (défaut, fichier DB_NAME ou db.sqlite3)
+# ou DB_ENGINE=postgresql (DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT).
+# Les tests (`manage.py test`) tournent sur l'une ou l'autre, dans une base de test créée à part.
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'softdesk'),
+            'USER': os.environ.get('DB_USER', ''),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', ''),
+            'PORT': os.environ.get('DB_PORT', ''),
+        }
+    }
+    if psycopg_pool is not None and os.environ.get('DB_POOL', '1') != '0':
+        # Pool par processus : les requêtes empruntent une connexion déjà ouverte
+        DATABASES['default']['OPTIONS'] = {'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }}
+    else:
+        # Sans pool : connexion conservée entre les requêtes, vérifiée avant d'être réutilisée
+        DATABASES['default'].update({
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+        })
+elif DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
     }
+else:
+    raise ImproperlyConfigured(f"DB_ENGINE inconnu : {DB_ENGINE} (sqlite ou postgresql)")
+
+# Profil SQLite (api.db) : 'production' active WAL et les pragmas associés à chaque connexion,
+# les transactions d'écriture IMMEDIATE (le verrou est pris au BEGIN et attendu, au lieu d'un
+# échec lors du passage de la lecture à l'écriture) et des connexions conservées entre les
+# requêtes. `manage.py benchmark_sqlite_writers` compare les deux profils.
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'default')
+if DB_ENGINE == 'sqlite' and SQLITE_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    })
+
+# Moteur de recherche plein texte (issues.search), selon la base
+SEARCH_BACKEND = {
+    'sqlite': 'issues.search.SQLiteFTS5Backend',
+    'postgresql': 'issues.search.PostgresSearchBackend',
+}[DB_ENGINE]
+
+
+# Hachage des mots de passe (users.hashers) : algorithme et coût par environnement.
+# Coût absent : valeur par défaut de Django. Un changement est appliqué à chaque
+# mot de passe lors de la connexion suivante. `manage.py benchmark_auth` mesure
+# le débit d'inscription et de connexion obtenu.
+PASSWORD_HASHING = {
+    'ALGORITHM': os.environ.get('PASSWORD_HASHER', 'pbkdf2_sha256'),
+    'PBKDF2_ITERATIONS': os.environ.get('PASSWORD_PBKDF2_ITERATIONS'),
+    'ARGON2_TIME_COST': os.environ.get('PASSWORD_ARGON2_TIME_COST'),
+    'ARGON2_MEMORY_COST': os.environ.get('PASSWORD_ARGON2_MEMORY_COST'),
+    'ARGON2_PARALLELISM': os.environ.get('PASSWORD_ARGON2_PARALLELISM'),
+    'BCRYPT_ROUNDS': os.environ.get('PASSWORD_BCRYPT_ROUNDS'),
+    'SCRYPT_WORK_FACTOR': os.environ.get('PASSWORD_SCRYPT_WORK_FACTOR'),
 }
 
+# Le hasheur choisi en premier (nouveaux mots de passe), les autres pour vérifier les anciens
+_PASSWORD_HASHERS = {
+    'pbkdf2_sha256': 'users.hashers.PBKDF2PasswordHasher',
+    'argon2': 'users.hashers.Argon2PasswordHasher',
+    'bcrypt_sha256': 'users.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'users.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHING['ALGORITHM']]] + [
+    path for algorithm, path in _PASSWORD_HASHERS.items() if algorithm != PASSWORD_HASHING['ALGORITHM']
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from issues.models import Issue
+from projects.membership import membership_cache
+from projects.models import Project, Contributor
+from users.authentication import user_snapshot_cache
+
+
+def create_user(username):
+    return get_user_model().objects.create_user(username=username, password="Pass1234", birth_date="1990-01-01")
+
+
+def create_project(author, *members, title="Projet"):
+    # Projet dont l'auteur et `members` sont contributeurs
+    project = Project.objects.create(title=title, description="Desc", type="BACKEND", author=author)
+    for user in (author, *members):
+        Contributor.objects.create(user=user, project=project)
+    return project
+
+
+def create_issue(project, author, **fields):
+    values = {"title": "Issue", "description": "Desc", "priority": "LOW", "balise": "BUG", **fields}
+    return Issue.objects.create(author=author, project=project, **values)
+
+
+# Base des tests d'API : les caches applicatifs survivent au rollback de la base entre deux
+# tests (et les identifiants y sont réutilisés), ils sont vidés avant chaque test
+class SoftDeskAPITestCase(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        membership_cache.clear()
+        user_snapshot_cache.clear()
+
+
+# Tests d'un projet : self.author, contributeur de son projet self.project, est authentifié.
+# Les classes ajoutent leurs propres données après super().setUp().
+class ProjectAPITestCase(SoftDeskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = create_user("author")
+        self.project = create_project(self.author)
+        self.client.force_authenticate(self.author)
+
+
+# Mixin de test pour vérifier que le nombre de requêtes ne dépend pas du nombre de lignes
+class QueryCountMixin:
+
+    def assertConstantQueries(self, url, add_rows, sizes=(1, 10)):
+        # add_rows(n) ajoute n lignes avant chaque appel de l'URL
+        # Un premier appel remplit les caches pour ne comparer que des appels identiques
+        self.client.get(url)
+        counts = []
+        for size in sizes:
+            add_rows(size)
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(
+            len(set(counts)), 1,
+            f"Le nombre de requêtes varie avec le nombre de lignes : {counts}"
+        )
+        return counts[0]
@@ -0,0 +1,187 @@
+import datetime
+import decimal
+import io
+import json
+import os
+import tempfile
+import uuid
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.conditional import ConditionalGetMixin
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from api.testing import SoftDeskAPITestCase, create_issue, create_project, create_user
+from issues.models import Comment
+
+
+class ConditionalGetTests(APITestCase):
+
+    # Sans get_validator_state(), la vue répond normalement, sans ETag ni 304
+    def test_view_without_validator_state(self):
+        class PlainView(ConditionalGetMixin, APIView):
+            permission_classes = [AllowAny]
+
+            def get(self, request):
+                return Response({"ok": True})
+
+        response = PlainView.as_view()(APIRequestFactory().get("/plain/", HTTP_IF_NONE_MATCH="*"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", response)
+
+
+class FastJSONTests(SimpleTestCase):
+
+    def setUp(self):
+        self.data = {
+            "id": 1,
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "created_time": datetime.datetime(2025, 9, 20, 10, 0, 0, 123456, tzinfo=datetime.timezone.utc),
+            "birth_date": datetime.date(1990, 1, 1),
+            "estimate": decimal.Decimal("1.50"),
+            "label": gettext_lazy("Hello"),
+            "description": "Crash sur la page d’accueil   « ok »",
+            "results": [{"title": "Bug"}],
+        }
+
+    # Même JSON que le rendu DRF : datetime en Z, UUID, Decimal, chaînes traduites, U+2028
+    def test_renderer_matches_drf_output(self):
+        self.assertIsNotNone(renderers.orjson)
+        fast = FastJSONRenderer().render(self.data)
+        self.assertEqual(JSONParser().parse(io.BytesIO(fast)), JSONParser().parse(io.BytesIO(JSONRenderer().render(self.data))))
+        self.assertIn(b'"2025-09-20T10:00:00.123456Z"', fast)
+        self.assertIn(b"\\u2028", fast)
+
+    # Sans orjson : rendu et lecture du DRF à l'identique
+    def test_fallback_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None), mock.patch.object(parsers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b'{"a": [1, 2]}')), {"a": [1, 2]})
+
+    # L'indentation (API navigable) passe par le rendu DRF
+    def test_indent_uses_drf_renderer(self):
+        rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=4")
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    def test_parser(self):
+        self.assertEqual(FastJSONParser().parse(io.BytesIO('{"title": "Crème"}'.encode())), {"title": "Crème"})
+        with self.assertRaises(Exception):
+            FastJSONParser().parse(io.BytesIO(b'{"a": NaN}'))
+
+
+# Authentification par JWT (et non force_authenticate) : les vues asynchrones lisent l'en-tête
+class AsyncReadViewTests(SoftDeskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = create_user("author")
+        self.outsider = create_user("outsider")
+        self.project = create_project(self.author)
+        for i in range(3):
+            self.issue = create_issue(
+                self.project, self.author, title=f"Issue {i}", progress="TODO" if i else "FINISHED", assignee=self.author
+            )
+        for i in range(2):
+            Comment.objects.create(title=f"Commentaire {i}", description="Desc", issue=self.issue, author=self.author)
+        self.authorize(self.author)
+
+    def authorize(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def pairs(self):
+        project, issue = self.project.id, self.issue.id
+        return [
+            ("user_me", "async_user_me", [], {}),
+            ("project_list_create", "async_project_list", [], {}),
+            ("project_view", "async_project_detail", [project], {}),
+            ("issues_list", "async_issue_list", [project], {"progress": "TODO", "limit": 1, "offset": 1}),
+            ("issue_detail", "async_issue_detail", [project, issue], {}),
+            ("comment_list", "async_comment_list", [project, issue], {}),
+        ]
+
+    # Mêmes réponses que les vues synchrones (aux liens de pagination près) ; les vues sont bien des coroutines
+    def test_async_views_match_sync_views(self):
+        for sync_name, async_name, args, params in self.pairs():
+            async_url = reverse(async_name, args=args)
+            self.assertTrue(iscoroutinefunction(resolve(async_url).func), async_name)
+            expected = self.client.get(reverse(sync_name, args=args), params)
+            response = self.client.get(async_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, async_name)
+            self.assertEqual(
+                json.loads(response.content.decode().replace("/api/async/", "/api/")), expected.json(), async_name
+            )
+
+    def test_async_views_errors(self):
+        project_url = reverse("async_project_detail", args=[self.project.id])
+        self.assertEqual(self.client.post(project_url).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(self.client.get(reverse("async_project_detail", args=[0])).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse("async_issue_list", args=[self.project.id]), {"progress": "DONE"}).status_code, 400)
+
+        self.authorize(self.outsider)
+        for name, args in (("async_project_detail", [self.project.id]), ("async_issue_list", [self.project.id])):
+            self.assertEqual(self.client.get(reverse(name, args=args)).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials()
+        response = self.client.get(reverse("async_user_me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalide")
+        self.assertEqual(self.client.get(reverse("async_user_me")).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    # Sous un vrai client asynchrone : aucun accès synchrone à la base pendant la requête
+    async def test_async_client(self):
+        response = await self.async_client.get(
+            reverse("async_project_detail", args=[self.project.id]),
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.author)}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["issues"]), 3)
+
+
+class SQLiteProfileTests(SimpleTestCase):
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Profil propre à SQLite")
+
+    def pragmas(self, profile):
+        # Nouvelle connexion Django sur une base temporaire : le signal connection_created s'applique
+        with tempfile.TemporaryDirectory() as directory, override_settings(SQLITE_PROFILE=profile):
+            wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': os.path.join(directory, 'db.sqlite3')}, 'profile')
+            try:
+                with wrapper.cursor() as cursor:
+                    return {
+                        name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                        for name in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size')
+                    }
+            finally:
+                wrapper.close()
+
+    def test_production_profile_pragmas(self):
+        self.assertEqual(
+            self.pragmas('production'),
+            {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 5000, 'cache_size': -65536},
+        )
+        self.assertEqual(self.pragmas('default')['journal_mode'], 'delete')
+
+    def test_benchmark_sqlite_writers(self):
+        out = io.StringIO()
+        call_command("benchmark_sqlite_writers", writers=2, readers=1, duration=0.2, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines[1:]], ['default', 'production'])
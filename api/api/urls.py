@@ -7,6 +7,10 @@ from rest_framework_simplejwt.views import (
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from issues.async_views import AsyncIssueListView, AsyncIssueDetailView, AsyncCommentListView
+from projects.async_views import AsyncProjectListView, AsyncProjectDetailView
+from users.async_views import AsyncUserMeView
+from users.views import TokenMetricsView
 
 
 schema_view = get_schema_view(
@@ -23,14 +27,27 @@ schema_view = get_schema_view(
             "- Ajout de commentaires sur les issues\n\n"
             "### Authentification :\n"
             "- Obtenir un token : **POST /api/token/**\n"
-            "- Rafraîchir un token : **POST /api/token/refresh**\n\n"
+            "- Rafraîchir un token : **POST /api/token/refresh** (le refresh token présenté est révoqué)\n\n"
+            "### Cache HTTP :\n"
+            "- Les GET de projets, issues et commentaires renvoient un `ETag` (et `Last-Modified`)\n"
+            "- Renvoyer l'ETag dans `If-None-Match` : **304 Not Modified** si rien n'a changé\n\n"
             "### Endpoints principaux :\n"
             "- **/api/signup/** → Créer un utilisateur\n"
+            "- **/api/users/me/issues/** → Issues assignées à l’utilisateur, tous projets confondus\n"
             "- **/api/projects/** → Lister & créer des projets\n"
             "- **/api/projects/<id>/** → Détails d’un projet\n"
             "- **/api/projects/<id>/contributors/** → Gérer les contributeurs\n"
+            "- **/api/projects/<id>/export/** → Exporter un projet (NDJSON ou CSV)\n"
+            "- **/api/projects/<id>/import/** → Importer des issues (NDJSON)\n"
+            "- **/api/projects/<id>/changes/?since=<curseur>** → Modifications depuis le curseur\n"
+            "- **/api/projects/<id>/stats/** → Statistiques des issues du projet\n"
+            "- **/api/projects/<id>/search/?q=<mots>** → Recherche plein texte (issues et commentaires)\n"
             "- **/api/projects/<id>/issues/** → Gérer les issues d’un projet\n"
-            "- **/api/projects/<id>/issues/<id>/comments/** → Gérer les commentaires"
+            "- **/api/projects/<id>/issues/bulk/** → Créer, modifier ou supprimer des issues par lot\n"
+            "- **/api/projects/<id>/issues/<id>/comments/** → Gérer les commentaires\n\n"
+            "### Lecture asynchrone (ASGI) :\n"
+            "- **/api/async/...** → Variantes asynchrones des GET de projets, issues, commentaires "
+            "et de /api/users/me/ (mêmes réponses, pagination limit/offset)"
         ),
         contact=openapi.Contact(email="elvis.degeitere1@gmail.com"),
         license=openapi.License(name="MIT License"),
@@ -47,12 +64,29 @@ urlpatterns = [
     # Auth JWT
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/metrics/', TokenMetricsView.as_view(), name='token_metrics'),
 
     # Apps principales
     path('api/', include('users.urls')),
     path('api/projects/', include('projects.urls')),
     path('api/projects/<int:project_id>/issues/', include('issues.urls')),
 
+    # Lectures asynchrones, à servir sous ASGI (api.asgi)
+    path('api/async/', include([
+        path('users/me/', AsyncUserMeView.as_view(), name='async_user_me'),
+        path('projects/', AsyncProjectListView.as_view(), name='async_project_list'),
+        path('projects/<int:project_id>/', AsyncProjectDetailView.as_view(), name='async_project_detail'),
+        path('projects/<int:project_id>/issues/', AsyncIssueListView.as_view(), name='async_issue_list'),
+        path(
+            'projects/<int:project_id>/issues/<int:issue_id>/',
+            AsyncIssueDetailView.as_view(), name='async_issue_detail'
+        ),
+        path(
+            'projects/<int:project_id>/issues/<int:issue_id>/comments/',
+            AsyncCommentListView.as_view(), name='async_comment_list'
+        ),
+    ])),
+
     # Documentation Swagger & Redoc
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
     re_path(r'^swagger/$', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class IssuesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'issues'
+
+    def ready(self):
+        # Branche les signaux des compteurs dénormalisés
+        from . import signals  # noqa: F401
@@ -0,0 +1,68 @@
+from rest_framework.exceptions import PermissionDenied
+from api.async_views import AsyncAPIView
+from api.filters import IndexedFilterBackend
+from projects.membership import membership_cache
+from .models import Issue, Comment
+from .serializers import IssueSerializer, CommentSerializer
+from .views import IssuesListCreateView
+
+
+# Mêmes permissions que les vues synchrones : contributeur du projet pour les listes,
+# auteur de l'issue pour le détail (IsAuthor)
+class AsyncContributorMixin:
+
+    async def check_contributor(self, project_id):
+        if int(project_id) not in await membership_cache.aget_project_ids(self.drf_request.user.id):
+            raise PermissionDenied()
+
+
+class AsyncIssueListView(AsyncContributorMixin, AsyncAPIView):
+    """
+    GET /api/async/projects/{project-id}/issues/
+
+    Variante asynchrone (ASGI) de GET /api/projects/{project-id}/issues/ : mêmes filtres
+    et tris, pagination limit/offset uniquement.
+    """
+    filter_fields = IssuesListCreateView.filter_fields
+    range_fields = IssuesListCreateView.range_fields
+    ordering_fields = IssuesListCreateView.ordering_fields
+    index_prefix = IssuesListCreateView.index_prefix
+
+    async def get(self, request, project_id):
+        await self.check_contributor(project_id)
+        issues = Issue.objects.filter(project__id=project_id).order_by('created_time', 'id')
+        # Le filtre ne fait que construire la requête : aucun accès à la base ici
+        issues = IndexedFilterBackend().filter_queryset(self.drf_request, issues, self)
+        issues = IssueSerializer.setup_eager_loading(issues, self.drf_request)
+        return self.render(await self.paginate(issues, IssueSerializer))
+
+
+class AsyncIssueDetailView(AsyncAPIView):
+    """
+    GET /api/async/projects/{project-id}/issues/{issue-id}/
+
+    Variante asynchrone (ASGI) de GET /api/projects/{project-id}/issues/{issue-id}/.
+    """
+
+    async def get(self, request, project_id, issue_id):
+        issues = IssueSerializer.setup_eager_loading(Issue.objects.filter(project__id=project_id), self.drf_request)
+        issue = await self.get_object_or_404(issues, id=issue_id)
+        if issue.author_id != self.drf_request.user.id:
+            raise PermissionDenied()
+        return self.render(IssueSerializer(issue, context=self.get_serializer_context()).data)
+
+
+class AsyncCommentListView(AsyncContributorMixin, AsyncAPIView):
+    """
+    GET /api/async/projects/{project-id}/issues/{issue-id}/comments/
+
+    Variante asynchrone (ASGI) de GET /api/projects/{project-id}/issues/{issue-id}/comments/,
+    pagination limit/offset.
+    """
+
+    async def get(self, request, project_id, issue_id):
+        await self.check_contributor(project_id)
+        comments = CommentSerializer.setup_eager_loading(
+            Comment.objects.filter(issue__id=issue_id).order_by('created_time', 'id'), self.drf_request
+        )
+        return self.render(await self.paginate(comments, CommentSerializer))
@@ -0,0 +1,63 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from projects.models import Project
+from .models import Issue, Comment
+
+# Compteurs dénormalisés : Project.issue_count / open_issue_count et Issue.comment_count.
+# Ils sont ajustés par des UPDATE ... SET x = x + n (F()) dans la même transaction
+# que l'écriture : par les signaux pour les créations et suppressions unitaires (signals.py),
+# explicitement pour les écritures en masse et les changements d'avancement.
+# `manage.py repair_counters` corrige les écarts éventuels (SQL brut, anciens bugs).
+
+
+def is_open(progress):
+    return progress != 'FINISHED'
+
+
+def shifted(field, delta):
+    # Un compteur ayant dérivé ne passe pas sous zéro (colonne positive)
+    return Greatest(F(field) + delta, 0)
+
+
+def adjust_project_counters(project_id, issues=0, open_issues=0):
+    # Un changement de compteur est une modification du projet (ETag, cache du détail)
+    if issues or open_issues:
+        Project.objects.filter(pk=project_id).update(
+            issue_count=shifted('issue_count', issues),
+            open_issue_count=shifted('open_issue_count', open_issues),
+            updated_time=timezone.now(),
+        )
+
+
+def adjust_comment_count(issue_id, comments):
+    Issue.objects.filter(pk=issue_id).update(
+        comment_count=shifted('comment_count', comments),
+        updated_time=timezone.now(),
+    )
+
+
+def count_subquery(queryset, field):
+    # Nombre de lignes de queryset rattachées à la ligne courante par `field`
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(count=Count('pk'))
+    return Coalesce(Subquery(counts.values('count'), output_field=IntegerField()), 0)
+
+
+def project_counter_expressions():
+    return {
+        'issue_count': count_subquery(Issue.objects.all(), 'project'),
+        'open_issue_count': count_subquery(Issue.objects.exclude(progress='FINISHED'), 'project'),
+    }
+
+
+def issue_counter_expressions():
+    return {'comment_count': count_subquery(Comment.objects.all(), 'issue')}
+
+
+def drifted(queryset, expressions):
+    # Lignes dont au moins un compteur diffère de la valeur recalculée
+    annotated = queryset.annotate(**{f'actual_{name}': value for name, value in expressions.items()})
+    condition = Q()
+    for name in expressions:
+        condition |= ~Q(**{name: F(f'actual_{name}')})
+    return annotated.filter(condition)
@@ -0,0 +1,142 @@
+import statistics
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from issues.models import Issue, Comment
+from projects.models import Project
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure les requêtes des vues d'issues et de commentaires avec puis sans "
+        "les index composites, sur des données générées pour l'occasion. "
+        "Tout est fait dans une transaction annulée à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--issues', type=int, default=1_000_000)
+        parser.add_argument('--projects', type=int, default=1_000)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            sample = self.seed(options)
+            queries = self.get_queries(sample)
+            with_indexes = self.measure(queries, options['repeat'])
+            self.drop_indexes()
+            without_indexes = self.measure(queries, options['repeat'])
+            # Rien n'est conservé : index et données de test disparaissent
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'requête':<24}{'sans index (ms)':>18}{'avec index (ms)':>18}{'gain':>10}")
+        for name in queries:
+            before, after = without_indexes[name], with_indexes[name]
+            speedup = before / after if after else float('inf')
+            self.stdout.write(f"{name:<24}{before:>18.3f}{after:>18.3f}{speedup:>9.1f}x")
+
+    def seed(self, options):
+        batch_size = options['batch_size']
+        self.stdout.write("Création des utilisateurs et des projets...")
+        users = User.objects.bulk_create([
+            User(username=f"bench-user-{i}", birth_date=date(1990, 1, 1), password='!')
+            for i in range(options['users'])
+        ])
+        projects = Project.objects.bulk_create([
+            Project(title=f"Bench {i}", description="Benchmark", type='BACKEND', author=users[i % len(users)])
+            for i in range(options['projects'])
+        ], batch_size=batch_size)
+
+        self.stdout.write(f"Création de {options['issues']} issues...")
+        progress = [choice for choice, _ in Issue.PROGRESS_CHOICES]
+        first_issue = None
+        for start in range(0, options['issues'], batch_size):
+            created = Issue.objects.bulk_create([
+                Issue(
+                    title=f"Issue {i}",
+                    description="Benchmark",
+                    priority='LOW',
+                    balise='TASK',
+                    progress=progress[i % len(progress)],
+                    author=users[i % len(users)],
+                    assignee=users[(i * 7) % len(users)],
+                    project=projects[i % len(projects)],
+                )
+                for i in range(start, min(start + batch_size, options['issues']))
+            ])
+            if first_issue is None:
+                first_issue = created[0]
+
+        # Les commentaires se concentrent sur 1 % des issues, comme sur un vrai tracker
+        self.stdout.write(f"Création de {options['comments']} commentaires...")
+        commented = max(1, options['issues'] // 100)
+        for start in range(0, options['comments'], batch_size):
+            Comment.objects.bulk_create([
+                Comment(
+                    title=f"Comment {i}",
+                    description="Benchmark",
+                    issue_id=first_issue.id + (i * 97) % commented,
+                    author=users[i % len(users)],
+                )
+                for i in range(start, min(start + batch_size, options['comments']))
+            ])
+
+        project = projects[len(projects) // 2]
+        middle = Issue.objects.filter(project=project).order_by('created_time', 'id')[
+            options['issues'] // len(projects) // 2
+        ]
+        return {
+            'project': project,
+            'created_time': middle.created_time,
+            'issue_id': first_issue.id,
+            'user': users[len(users) // 2],
+        }
+
+    def get_queries(self, sample):
+        # Les requêtes exécutées par les vues (première page, page suivante, comptage)
+        ordering = ('-created_time', '-id')
+        return {
+            'issues_first_page': lambda: list(
+                Issue.objects.filter(project=sample['project']).order_by(*ordering)[:5]
+            ),
+            'issues_cursor_page': lambda: list(
+                Issue.objects.filter(
+                    project=sample['project'], created_time__lt=sample['created_time']
+                ).order_by(*ordering)[:5]
+            ),
+            'issues_count': lambda: Issue.objects.filter(project=sample['project']).count(),
+            'issues_progress_filter': lambda: list(
+                Issue.objects.filter(project=sample['project'], progress='TODO').order_by(*ordering)[:5]
+            ),
+            'comments_first_page': lambda: list(
+                Comment.objects.filter(issue_id=sample['issue_id']).order_by(*ordering)[:5]
+            ),
+            'issues_assigned_todo': lambda: sample['user'].issues_assigned.filter(progress='TODO').count(),
+        }
+
+    def measure(self, queries, repeat):
+        results = {}
+        for name, query in queries.items():
+            query()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                query()
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = statistics.median(timings)
+        return results
+
+    def drop_indexes(self):
+        # DROP INDEX direct : l'éditeur de schéma SQLite refuse de tourner dans une transaction
+        with connection.cursor() as cursor:
+            for model in (Issue, Comment):
+                for index in model._meta.indexes:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
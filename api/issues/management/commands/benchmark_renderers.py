@@ -0,0 +1,103 @@
+import time
+import uuid
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from issues.models import Issue, Comment
+from issues.serializers import IssueSerializer, CommentSerializer
+from projects.models import Project
+
+User = get_user_model()
+
+DESCRIPTION = (
+    "Impossible de se connecter après la mise à jour : l'écran reste bloqué sur « Chargement… ». "
+    "Étapes : ouvrir l'application, saisir ses identifiants, valider. Résultat attendu : accès au tableau de bord. "
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le JSONRenderer/JSONParser de DRF et FastJSONRenderer/FastJSONParser "
+        "sur des pages d'issues et de commentaires réalistes (aucun accès à la base)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--issues', type=int, default=100, help="Issues par page")
+        parser.add_argument('--description-size', type=int, default=4000, help="Taille des descriptions")
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson n'est pas installé : FastJSONRenderer utilise le rendu DRF."))
+
+        payloads = self.build_payloads(options['issues'], options['description_size'])
+        self.stdout.write(f"{'charge':<18}{'taille (ko)':>12}{'DRF (ms)':>12}{'rapide (ms)':>14}{'gain':>8}")
+        for name, data in payloads.items():
+            body = JSONRenderer().render(data)
+            renders = [
+                self.measure(lambda: renderer.render(data), options['repeat'])
+                for renderer in (JSONRenderer(), FastJSONRenderer())
+            ]
+            parses = [
+                self.measure(lambda: parser.parse(_Stream(body)), options['repeat'])
+                for parser in (JSONParser(), FastJSONParser())
+            ]
+            for step, (drf, fast) in (('rendu', renders), ('lecture', parses)):
+                self.stdout.write(
+                    f"{name + ' ' + step:<18}{len(body) / 1024:>12.1f}{drf:>12.3f}{fast:>14.3f}{drf / fast:>7.1f}x"
+                )
+
+    def build_payloads(self, count, description_size):
+        # Objets non enregistrés : les serializers n'ont besoin que des attributs
+        author = User(id=1, username="author", birth_date=date(1990, 1, 1))
+        assignee = User(id=2, username="assignee", birth_date=date(1990, 1, 1))
+        project = Project(id=1, title="Projet", author=author)
+        description = (DESCRIPTION * (description_size // len(DESCRIPTION) + 1))[:description_size]
+        now = timezone.now()
+        issues = [
+            Issue(
+                id=i, title=f"Issue {i}", description=description, priority='HIGH', balise='BUG',
+                progress='INPROGRESS', author=author, assignee=assignee, project=project, created_time=now,
+            )
+            for i in range(count)
+        ]
+        comments = [
+            Comment(id=i, title=f"Commentaire {i}", description=description, author=author,
+                    uuid=uuid.uuid4(), created_time=now)
+            for i in range(count)
+        ]
+        return {
+            'issues': {'count': count, 'next': None, 'previous': None,
+                       'results': IssueSerializer(issues, many=True).data},
+            'comments': {'count': count, 'next': None, 'previous': None,
+                         'results': CommentSerializer(comments, many=True).data},
+        }
+
+    def measure(self, func, repeat):
+        func()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) * 1000 / repeat
+
+
+class _Stream:
+    # Flux minimal lu par les parseurs
+    def __init__(self, body):
+        self.body = body
+        self.position = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunk, self.position = self.body[self.position:], len(self.body)
+        else:
+            chunk = self.body[self.position:self.position + size]
+            self.position += len(chunk)
+        return chunk
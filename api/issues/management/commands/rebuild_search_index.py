@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from issues.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruit l'index de recherche plein texte des issues et commentaires "
+        "(settings.SEARCH_BACKEND), par lots, dans une seule transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = get_search_backend().rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Index reconstruit : {counts['issues']} issues, {counts['comments']} commentaires."
+        ))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from issues.counters import drifted, issue_counter_expressions, project_counter_expressions
+from issues.models import Issue
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule les compteurs dénormalisés (Project.issue_count, Project.open_issue_count, "
+        "Issue.comment_count) et corrige, par lots, les lignes dont la valeur a dérivé."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Affiche les écarts sans les corriger")
+
+    def handle(self, *args, **options):
+        for model, expressions in (
+            (Project, project_counter_expressions()),
+            (Issue, issue_counter_expressions()),
+        ):
+            repaired = self.repair(model, expressions, options['batch_size'], options['dry_run'])
+            verb = "à corriger" if options['dry_run'] else "corrigé(s)"
+            self.stdout.write(f"{model._meta.verbose_name_plural} : {repaired} {verb}")
+
+    def repair(self, model, expressions, batch_size, dry_run):
+        # Lots de lignes en écart, parcourus par clé primaire ; chaque lot est corrigé par un seul
+        # UPDATE ... SET x = (sous-requête) : le comptage se fait dans l'écriture même, un
+        # incrément concurrent (F() + 1 des signaux) s'applique après au lieu d'être écrasé
+        rows = drifted(model.objects.all(), expressions).order_by('pk').values_list('pk', flat=True)
+        repaired = 0
+        last_pk = 0
+        while True:
+            batch = list(rows.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return repaired
+            last_pk = batch[-1]
+            if dry_run:
+                repaired += len(batch)
+            else:
+                # Compteurs modifiés : modification de la ligne (ETag, cache du détail)
+                repaired += model.objects.filter(pk__in=batch).update(**expressions, updated_time=timezone.now())
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_updated_time(apps, schema_editor):
+    # Les lignes existantes n'ont jamais été modifiées depuis leur création connue
+    for model_name in ('Issue', 'Comment'):
+        model = apps.get_model('issues', model_name)
+        model.objects.update(updated_time=models.F('created_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0006_issue_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_time, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['issue', 'updated_time'], name='comment_issue_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'updated_time'], name='issue_project_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:52
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    Issue = apps.get_model('issues', 'Issue')
+    Comment = apps.get_model('issues', 'Comment')
+    counts = Comment.objects.filter(issue=OuterRef('pk')).order_by().values('issue').annotate(count=Count('pk'))
+    Issue.objects.update(comment_count=Coalesce(Subquery(counts.values('count'), output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0007_issue_comment_updated_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
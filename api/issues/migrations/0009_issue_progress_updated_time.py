@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_progress_updated_time(apps, schema_editor):
+    # Meilleure approximation disponible : la dernière modification de l'issue
+    Issue = apps.get_model('issues', 'Issue')
+    Issue.objects.update(progress_updated_time=models.F('updated_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0008_issue_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='progress_updated_time',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunPython(backfill_progress_updated_time, migrations.RunPython.noop),
+    ]
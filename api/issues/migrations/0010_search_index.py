@@ -0,0 +1,48 @@
+from django.db import migrations
+
+# Index plein texte SQLite (issues.search.SQLiteFTS5Backend) ; les autres moteurs
+# n'ont pas de table à créer. remove_diacritics : "echec" trouve "échec".
+TOKENIZE = "tokenize = 'unicode61 remove_diacritics 2'"
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE issues_issue_fts USING fts5("
+        f"title, description, project_id UNINDEXED, {TOKENIZE})"
+    )
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE issues_comment_fts USING fts5("
+        f"title, description, project_id UNINDEXED, issue_id UNINDEXED, uuid UNINDEXED, {TOKENIZE})"
+    )
+    schema_editor.execute(
+        "INSERT INTO issues_issue_fts (rowid, title, description, project_id) "
+        "SELECT id, title, description, project_id FROM issues_issue"
+    )
+    # uuid est stocké en hexadécimal sans tirets par SQLite : remis au format de l'API
+    schema_editor.execute(
+        "INSERT INTO issues_comment_fts (rowid, title, description, project_id, issue_id, uuid) "
+        "SELECT c.id, c.title, c.description, i.project_id, c.issue_id, "
+        "lower(substr(c.uuid, 1, 8) || '-' || substr(c.uuid, 9, 4) || '-' || substr(c.uuid, 13, 4) || '-' "
+        "|| substr(c.uuid, 17, 4) || '-' || substr(c.uuid, 21)) "
+        "FROM issues_comment c JOIN issues_issue i ON i.id = c.issue_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE issues_issue_fts")
+    schema_editor.execute("DROP TABLE issues_comment_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0009_issue_progress_updated_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0010_search_index'),
+        ('projects', '0005_project_issue_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'progress', 'created_time'], name='issue_project_progress_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'priority', 'created_time'], name='issue_project_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'balise', 'created_time'], name='issue_project_balise_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'assignee', 'created_time'], name='issue_project_assignee_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0011_issue_filter_indexes'),
+        ('projects', '0005_project_issue_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_assignee_progress_idx',
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['assignee', 'created_time', 'id'], name='issue_assignee_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['assignee', 'progress', 'created_time'], name='issue_assignee_progress_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:00
+
+from django.db import migrations
+
+# Index GIN de la recherche PostgreSQL (issues.search.PostgresSearchBackend) sur l'expression
+# même des requêtes, figée ici telle que postgres_search_vector() la produisait à cette
+# migration ; SQLite utilise les tables FTS5 de la migration 0010.
+ACCENTED = (
+    'ÀÁÂÃÄÅÇÈÉÊËÌÍÎÏÑÒÓÔÕÖÙÚÛÜÝàáâãäåçèéêëìíîïñòóôõöùúûüýÿĀāĂăĄąĆćĈĉĊċČčĎďĒēĔĕĖėĘęĚěĜĝĞğĠġĢģĤĥ'
+    'ĨĩĪīĬĭĮįİĲĳĴĵĶķĹĺĻļĽľĿŀŃńŅņŇňŌōŎŏŐőŔŕŖŗŘřŚśŜŝŞşŠšŢţŤťŨũŪūŬŭŮůŰűŲųŴŵŶŷŸŹźŻżŽžſ'
+)
+UNACCENTED = (
+    'AAAAAACEEEEIIIINOOOOOUUUUYaaaaaaceeeeiiiinooooouuuuyyAaAaAaCcCcCcCcDdEeEeEeEeEeGgGgGgGgHh'
+    'IiIiIiIiIIiJjKkLlLlLlLlNnNnNnOoOoOoRrRrRrSsSsSsSsTtTtUuUuUuUuUuUuWwYyYZzZzZzs'
+)
+
+
+def weighted(column, weight):
+    return (
+        f"setweight(to_tsvector('simple'::regconfig, translate(coalesce({column}, ''), "
+        f"'{ACCENTED}', '{UNACCENTED}')), '{weight}')"
+    )
+
+
+SEARCH_VECTOR = f"({weighted('title', 'A')} || {weighted('description', 'B')})"
+
+INDEXES = {
+    'issue_search_vector_idx': 'issues_issue',
+    'comment_search_vector_idx': 'issues_comment',
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in INDEXES.items():
+        schema_editor.execute(f"CREATE INDEX {name} ON {table} USING gin ({SEARCH_VECTOR})")
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in INDEXES:
+        schema_editor.execute(f"DROP INDEX {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0012_issue_assignee_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
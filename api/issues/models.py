@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from projects.models import Project
 import uuid
 from django.conf import settings
@@ -45,6 +46,29 @@ class Issue(models.Model):
     progress = models.CharField(max_length=10, choices=PROGRESS_CHOICES, default='TODO')
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='issues')
     created_time = models.DateTimeField(auto_now_add=True)
+    # Mis à jour à chaque save() ; les mises à jour en masse le renseignent explicitement
+    updated_time = models.DateTimeField(auto_now=True)
+    # Date du dernier changement d'avancement (statistiques : temps passé dans chaque état)
+    progress_updated_time = models.DateTimeField(default=timezone.now, editable=False)
+    # Compteur dénormalisé, maintenu par issues.counters
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Liste des issues d'un projet triée par (created_time, id)
+            models.Index(fields=['project', 'created_time', 'id'], name='issue_project_created_idx'),
+            # ETag de la liste : max(updated_time) et nombre d'issues lus dans l'index seul
+            models.Index(fields=['project', 'updated_time'], name='issue_project_updated_idx'),
+            # Filtres de la liste (api.filters.IndexedFilterBackend), triés par created_time
+            models.Index(fields=['project', 'progress', 'created_time'], name='issue_project_progress_idx'),
+            models.Index(fields=['project', 'priority', 'created_time'], name='issue_project_priority_idx'),
+            models.Index(fields=['project', 'balise', 'created_time'], name='issue_project_balise_idx'),
+            models.Index(fields=['project', 'assignee', 'created_time'], name='issue_project_assignee_idx'),
+            # Issues assignées à un utilisateur (issues_assigned, /api/users/me/issues/),
+            # éventuellement filtrées par avancement, triées par (created_time, id)
+            models.Index(fields=['assignee', 'created_time', 'id'], name='issue_assignee_created_idx'),
+            models.Index(fields=['assignee', 'progress', 'created_time'], name='issue_assignee_progress_idx'),
+        ]
 
 
 class Comment(models.Model):
@@ -58,4 +82,12 @@ class Comment(models.Model):
     )
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Liste des commentaires d'une issue triée par (created_time, id)
+            models.Index(fields=['issue', 'created_time', 'id'], name='comment_issue_created_idx'),
+            models.Index(fields=['issue', 'updated_time'], name='comment_issue_updated_idx'),
+        ]
 
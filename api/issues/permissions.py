@@ -1,15 +1,18 @@
 from rest_framework.permissions import BasePermission
-from projects.models import Contributor, Project
+from projects.membership import get_membership
 
 
 class IsContributor(BasePermission):
-    def has_object_permission(self, request, view, obj):
+    def has_permission(self, request, view):
         project_id = view.kwargs.get('project_id')
         if not project_id:
             return False
-        return Contributor.objects.filter(project__id=project_id, user=request.user).exists()
+        return get_membership(request, project_id).is_contributor
+
+    def has_object_permission(self, request, view, obj):
+        return self.has_permission(request, view)
 
 
 class IsAuthor(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user
+        return obj.author_id == request.user.id
@@ -0,0 +1,298 @@
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core import checks
+from django.db import connection
+from django.db.models import CharField, F, FloatField, TextField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Concat
+from django.utils.module_loading import import_string
+from .models import Issue, Comment
+
+# Recherche plein texte dans les issues et commentaires d'un projet.
+# Le backend est choisi par settings.SEARCH_BACKEND ; l'index est tenu à jour
+# par les signaux (signals.py) et explicitement par les écritures en masse.
+# `manage.py rebuild_search_index` le reconstruit entièrement.
+
+DEFAULT_BACKEND = 'issues.search.SQLiteFTS5Backend'
+
+
+def search_terms(query):
+    # Mots de la recherche, sans la syntaxe propre à chaque moteur (opérateurs, guillemets...)
+    return re.findall(r'\w+', query or '')
+
+
+def get_search_backend():
+    return import_string(getattr(settings, 'SEARCH_BACKEND', DEFAULT_BACKEND))()
+
+
+# SEARCH_BACKEND introuvable ou incomplet : erreur au démarrage plutôt qu'à la première recherche
+@checks.register()
+def check_search_backend(app_configs, **kwargs):
+    try:
+        get_search_backend()
+    except (ImportError, TypeError) as e:
+        return [checks.Error(f"SEARCH_BACKEND invalide : {e}", id='issues.E001')]
+    return []
+
+
+class SearchBackend(ABC):
+    # Résultats : dicts {'type', 'id', 'issue', 'title', 'snippet', 'score'}, meilleur score d'abord
+
+    def index_issues(self, issues):
+        pass
+
+    def index_comments(self, comments):
+        # Les commentaires doivent avoir leur issue chargée (project_id)
+        pass
+
+    def remove_issues(self, issue_ids):
+        pass
+
+    def remove_comments(self, comment_ids):
+        pass
+
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def count(self, project_id, terms):
+        pass
+
+    @abstractmethod
+    def search(self, project_id, terms, offset, limit):
+        pass
+
+    def rebuild(self, batch_size=1000):
+        self.clear()
+        issues = Issue.objects.only('id', 'project_id', 'title', 'description').order_by('id')
+        comments = (
+            Comment.objects.select_related('issue').order_by('id')
+            .only('id', 'uuid', 'title', 'description', 'issue__id', 'issue__project_id')
+        )
+        counts = {}
+        for name, queryset, index in (
+            ('issues', issues, self.index_issues),
+            ('comments', comments, self.index_comments),
+        ):
+            counts[name] = 0
+            batch = []
+            for obj in queryset.iterator(chunk_size=batch_size):
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    index(batch)
+                    counts[name] += len(batch)
+                    batch = []
+            index(batch)
+            counts[name] += len(batch)
+        return counts
+
+
+# SQLite : deux tables virtuelles FTS5 (migration 0010) dont le rowid est celui de l'issue
+# ou du commentaire, ce qui permet de remplacer ou supprimer une entrée sans parcourir l'index.
+# Classement bm25, le titre comptant double.
+class SQLiteFTS5Backend(SearchBackend):
+    issue_table = 'issues_issue_fts'
+    comment_table = 'issues_comment_fts'
+
+    def index_issues(self, issues):
+        issues = list(issues)
+        if not issues:
+            return
+        self.remove_issues([issue.id for issue in issues])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.issue_table} (rowid, title, description, project_id) VALUES (%s, %s, %s, %s)",
+                [(issue.id, issue.title, issue.description, issue.project_id) for issue in issues],
+            )
+
+    def index_comments(self, comments):
+        comments = list(comments)
+        if not comments:
+            return
+        self.remove_comments([comment.id for comment in comments])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.comment_table} (rowid, title, description, project_id, issue_id, uuid) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                [
+                    (comment.id, comment.title, comment.description,
+                     comment.issue.project_id, comment.issue_id, str(comment.uuid))
+                    for comment in comments
+                ],
+            )
+
+    def remove_issues(self, issue_ids):
+        self._remove(self.issue_table, issue_ids)
+
+    def remove_comments(self, comment_ids):
+        self._remove(self.comment_table, comment_ids)
+
+    def _remove(self, table, rowids):
+        rowids = list(rowids)
+        # Lots bornés par la limite de paramètres de SQLite
+        for start in range(0, len(rowids), 500):
+            chunk = rowids[start:start + 500]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE rowid IN ({', '.join(['%s'] * len(chunk))})", chunk
+                )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.issue_table}")
+            cursor.execute(f"DELETE FROM {self.comment_table}")
+
+    def match(self, terms):
+        # Mots entre guillemets (pas de syntaxe FTS5), le dernier en préfixe
+        quoted = ['"%s"' % term.replace('"', '""') for term in terms]
+        return ' '.join(quoted) + '*'
+
+    def count(self, project_id, terms):
+        match = self.match(terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT (SELECT COUNT(*) FROM {self.issue_table} WHERE {self.issue_table} MATCH %s AND project_id = %s)"
+                f" + (SELECT COUNT(*) FROM {self.comment_table} WHERE {self.comment_table} MATCH %s AND project_id = %s)",
+                [match, project_id, match, project_id],
+            )
+            return cursor.fetchone()[0]
+
+    def search(self, project_id, terms, offset, limit):
+        match = self.match(terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT 'issue', CAST(rowid AS TEXT), rowid, title, "
+                f"snippet({self.issue_table}, -1, '[', ']', '…', 12), bm25({self.issue_table}, 2.0, 1.0) AS rank "
+                f"FROM {self.issue_table} WHERE {self.issue_table} MATCH %s AND project_id = %s "
+                f"UNION ALL "
+                f"SELECT 'comment', uuid, issue_id, title, "
+                f"snippet({self.comment_table}, -1, '[', ']', '…', 12), bm25({self.comment_table}, 2.0, 1.0) AS rank "
+                f"FROM {self.comment_table} WHERE {self.comment_table} MATCH %s AND project_id = %s "
+                f"ORDER BY rank LIMIT %s OFFSET %s",
+                [match, project_id, match, project_id, limit, offset],
+            )
+            return [
+                {
+                    'type': kind,
+                    'id': int(object_id) if kind == 'issue' else object_id,
+                    'issue': issue_id,
+                    'title': title,
+                    'snippet': snippet,
+                    # bm25 est négatif, plus petit = plus pertinent
+                    'score': round(-rank, 4),
+                }
+                for kind, object_id, issue_id, title, snippet, rank in cursor.fetchall()
+            ]
+
+
+def accent_table():
+    # Lettres latines accentuées et leur lettre de base (É -> E), pour translate() de PostgreSQL
+    accented, plain = [], []
+    for code in range(0xC0, 0x180):
+        char = chr(code)
+        base = unicodedata.normalize('NFKD', char)[0]
+        if base != char and base.isascii() and base.isalpha():
+            accented.append(char)
+            plain.append(base)
+    return ''.join(accented), ''.join(plain)
+
+
+ACCENTED, UNACCENTED = accent_table()
+POSTGRES_CONFIG = 'simple'
+
+
+def postgres_search_vector(table=''):
+    # tsvector d'une issue ou d'un commentaire (titre en poids A, description en B), sans accents
+    # (translate() est IMMUTABLE, contrairement à unaccent). C'est l'expression des index GIN
+    # de la migration 0013 : les requêtes doivent employer exactement la même pour les utiliser.
+    # La migration en garde une copie figée : une modification demande une migration qui recrée les index.
+    def weighted(column, weight):
+        return (
+            f"setweight(to_tsvector('{POSTGRES_CONFIG}'::regconfig, translate(coalesce({table}{column}, ''), "
+            f"'{ACCENTED}', '{UNACCENTED}')), '{weight}')"
+        )
+    return f"({weighted('title', 'A')} || {weighted('description', 'B')})"
+
+
+# PostgreSQL : tsvector calculé par l'expression des index GIN (migration 0013),
+# rien à maintenir hors des tables ; "echec" trouve "échec" comme avec FTS5.
+class PostgresSearchBackend(SearchBackend):
+    config = POSTGRES_CONFIG
+
+    def query(self, terms):
+        from django.contrib.postgres.search import SearchQuery
+        accents = str.maketrans(ACCENTED, UNACCENTED)
+        raw = ' & '.join("'%s'" % term.translate(accents) for term in terms) + ':*'
+        return SearchQuery(raw, search_type='raw', config=self.config)
+
+    def matching(self, queryset, query):
+        # Issues ou commentaires du queryset qui correspondent à la recherche (index GIN)
+        from django.contrib.postgres.search import SearchVectorField
+        vector = RawSQL(
+            postgres_search_vector(f'"{queryset.model._meta.db_table}".'), [], output_field=SearchVectorField()
+        )
+        return queryset.annotate(search=vector).filter(search=query)
+
+    def querysets(self, project_id, terms):
+        from django.contrib.postgres.search import SearchHeadline, SearchRank
+        query = self.query(terms)
+
+        def results(queryset, kind, object_id, issue):
+            return (
+                self.matching(queryset, query)
+                .annotate(
+                    result_type=Value(kind, output_field=CharField()),
+                    result_id=Cast(object_id, CharField()),
+                    result_issue=F(issue),
+                    result_title=F('title'),
+                    snippet=SearchHeadline(
+                        Concat('title', Value(' : '), 'description', output_field=TextField()), query, config=self.config,
+                        start_sel='[', stop_sel=']', max_words=12, min_words=6,
+                    ),
+                    score=Cast(SearchRank(F('search'), query), FloatField()),
+                )
+                .values('result_type', 'result_id', 'result_issue', 'result_title', 'snippet', 'score')
+                .order_by()
+            )
+
+        return (
+            results(Issue.objects.filter(project_id=project_id), 'issue', 'id', 'id'),
+            results(Comment.objects.filter(issue__project_id=project_id), 'comment', 'uuid', 'issue_id'),
+        )
+
+    def count(self, project_id, terms):
+        return sum(queryset.count() for queryset in self.querysets(project_id, terms))
+
+    def search(self, project_id, terms, offset, limit):
+        issues, comments = self.querysets(project_id, terms)
+        rows = issues.union(comments, all=True).order_by('-score')[offset:offset + limit]
+        return [
+            {
+                'type': row['result_type'],
+                'id': int(row['result_id']) if row['result_type'] == 'issue' else row['result_id'],
+                'issue': row['result_issue'],
+                'title': row['result_title'],
+                'snippet': row['snippet'],
+                'score': round(row['score'], 4),
+            }
+            for row in rows
+        ]
+
+
+# Résultats paginables par LimitOffsetPagination (count() et découpage) : seule la page est lue
+class SearchResults:
+
+    def __init__(self, project_id, query, backend=None):
+        self.project_id = project_id
+        self.terms = search_terms(query)
+        self.backend = backend or get_search_backend()
+
+    def count(self):
+        return self.backend.count(self.project_id, self.terms) if self.terms else 0
+
+    def __getitem__(self, item):
+        start = item.start or 0
+        return self.backend.search(self.project_id, self.terms, start, item.stop - start)
@@ -1,26 +1,122 @@
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 from .models import Issue, Comment
 from projects.models import Project, Contributor
+from projects.membership import get_membership
+from projects.changes import record_changes
+from .counters import adjust_project_counters, is_open
+from .search import get_search_backend
+from api.serializers import EagerLoadingMixin, DynamicFieldsMixin
 
 User = get_user_model()
 
 
-class IssueSerializer(serializers.ModelSerializer):
-    assignee = serializers.SlugRelatedField(
+# Slug username résolu depuis context['users_by_username'] quand la vue l'a préchargé
+# (endpoint bulk : une seule requête pour tous les utilisateurs du lot)
+class UsernameRelatedField(serializers.SlugRelatedField):
+    def __init__(self, **kwargs):
+        kwargs.setdefault('slug_field', 'username')
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        users = self.context.get('users_by_username')
+        if users is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, str):
+            self.fail('invalid')
+        try:
+            return users[data]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+
+
+# Serializer de liste pour la création et la mise à jour d'issues en masse
+class IssueListSerializer(serializers.ListSerializer):
+
+    def run_child_validation(self, data):
+        # En mise à jour, self.instance est un dict {id: issue} chargé en une requête
+        if self.instance is None:
+            return super().run_child_validation(data)
+        issue = self.instance.get(data.get('id')) if isinstance(data, dict) else None
+        if issue is None:
+            raise ValidationError({'id': ["Issue introuvable dans ce projet."]})
+        if issue.author_id != self.context['request'].user.id:
+            raise ValidationError({'id': ["Seul l'auteur de l'issue peut la modifier."]})
+        self.child.instance = issue
+        validated_data = super().run_child_validation(data)
+        validated_data['id'] = issue.id
+        return validated_data
+
+    def create(self, validated_data):
+        request = self.context['request']
+        issues = []
+        for attrs in validated_data:
+            attrs.pop('comment', None)
+            if not attrs.get('assignee'):
+                attrs['assignee'] = request.user
+            issues.append(Issue(**attrs))
+        with transaction.atomic():
+            issues = Issue.objects.bulk_create(issues)
+            if issues:
+                record_changes(issues[0].project_id, 'issue', [issue.id for issue in issues], 'created')
+                adjust_project_counters(
+                    issues[0].project_id, issues=len(issues),
+                    open_issues=sum(is_open(issue.progress) for issue in issues),
+                )
+                get_search_backend().index_issues(issues)
+        return issues
+
+    def update(self, instance, validated_data):
+        # bulk_update ne déclenche pas auto_now : updated_time est renseigné ici
+        now = timezone.now()
+        issues = []
+        fields = set()
+        open_issues = 0
+        for attrs in validated_data:
+            issue = instance[attrs.pop('id')]
+            attrs.pop('comment', None)
+            open_issues -= is_open(issue.progress)
+            if attrs.get('progress', issue.progress) != issue.progress:
+                issue.progress_updated_time = now
+                fields.add('progress_updated_time')
+            for attr, value in attrs.items():
+                setattr(issue, attr, value)
+            fields.update(attrs)
+            issue.updated_time = now
+            open_issues += is_open(issue.progress)
+            issues.append(issue)
+        if fields:
+            fields.add('updated_time')
+            with transaction.atomic():
+                Issue.objects.bulk_update(issues, fields)
+                record_changes(issues[0].project_id, 'issue', [issue.id for issue in issues], 'updated')
+                adjust_project_counters(issues[0].project_id, open_issues=open_issues)
+                if fields & {'title', 'description'}:
+                    get_search_backend().index_issues(issues)
+        return issues
+
+
+class IssueSerializer(DynamicFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    # Relations affichées en slug : chargées avec la même requête que l'issue
+    select_related_fields = ('assignee', 'author', 'project')
+    # Tri de la pagination par curseur
+    required_model_fields = ('created_time',)
+
+    assignee = UsernameRelatedField(
         queryset=User.objects.all(),
-        slug_field='username',
         required=False,
         allow_null=True
     )
     author = serializers.SlugRelatedField(
         slug_field='username',
-        queryset=User.objects.all()
+        read_only=True
     )
     project = serializers.SlugRelatedField(
         slug_field='title',
-        queryset=Project.objects.all()
+        read_only=True
     )
     comment = serializers.CharField(required=False, allow_blank=True, allow_null=True)
 
@@ -28,13 +124,15 @@ class IssueSerializer(serializers.ModelSerializer):
         model = Issue
         fields = [
             'id', 'title', 'description', 'priority',
-            'balise', 'progress', 'assignee', 'project', 'comment', 'author', 'created_time'
+            'balise', 'progress', 'assignee', 'project', 'comment', 'author', 'comment_count', 'created_time'
         ]
-        read_only_fields = ['id', 'created_time', 'project', 'author']
+        read_only_fields = ['id', 'created_time', 'project', 'author', 'comment_count']
+        list_serializer_class = IssueListSerializer
 
     def validate_assignee(self, value):
         project = self.context.get('project') or getattr(self.instance, 'project', None)
-        if value and not project.contributors.filter(user=value).exists() and project.author != value:
+        # Réutilise l'appartenance déjà chargée par les permissions de la requête
+        if value and not get_membership(self.context['request'], project).has_member(value):
             raise serializers.ValidationError(f"{value.username} n'est pas contributeur de ce projet")
         return value
 
@@ -45,8 +143,15 @@ class IssueSerializer(serializers.ModelSerializer):
             validated_data['assignee'] = request.user
         return super().create(validated_data)
 
+    def update(self, instance, validated_data):
+        if validated_data.get('progress', instance.progress) != instance.progress:
+            validated_data['progress_updated_time'] = timezone.now()
+        return super().update(instance, validated_data)
+
+
+class CommentSerializer(DynamicFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    required_model_fields = ('created_time',)
 
-class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ['title', 'description', 'uuid']
@@ -57,7 +162,9 @@ class CommentSerializer(serializers.ModelSerializer):
         return comment
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    select_related_fields = ('user',)
+
     user = serializers.SlugRelatedField(
         queryset=User.objects.all(),
         slug_field='username'
@@ -0,0 +1,66 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from projects.models import Project
+from projects.signals import deleted_with
+from .models import Issue, Comment
+from .counters import adjust_project_counters, adjust_comment_count, is_open
+from .search import get_search_backend
+
+
+# Compteurs dénormalisés (counters.py) : créations et suppressions unitaires,
+# y compris celles des vues (IssuesListCreateView, IssueDetailView, CommentListCreateView...)
+@receiver(post_save, sender=Issue)
+def count_created_issue(sender, instance, created, **kwargs):
+    if created:
+        adjust_project_counters(instance.project_id, issues=1, open_issues=int(is_open(instance.progress)))
+
+
+# Les compteurs d'un projet supprimé disparaissent avec lui
+@receiver(post_delete, sender=Issue)
+def count_deleted_issue(sender, instance, origin=None, **kwargs):
+    if origin is not None and deleted_with(origin, Project):
+        return
+    adjust_project_counters(instance.project_id, issues=-1, open_issues=-int(is_open(instance.progress)))
+
+
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, instance, created, **kwargs):
+    if created:
+        adjust_comment_count(instance.issue_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):
+    if origin is not None and (deleted_with(origin, Project) or deleted_with(origin, Issue)):
+        return
+    adjust_comment_count(instance.issue_id, -1)
+
+
+# Index de recherche (search.py) : seules les écritures touchant le texte sont réindexées
+SEARCHED_FIELDS = {'title', 'description'}
+
+
+def text_changed(update_fields):
+    return update_fields is None or bool(SEARCHED_FIELDS & set(update_fields))
+
+
+@receiver(post_save, sender=Issue)
+def index_issue(sender, instance, update_fields=None, **kwargs):
+    if text_changed(update_fields):
+        get_search_backend().index_issues([instance])
+
+
+@receiver(post_delete, sender=Issue)
+def unindex_issue(sender, instance, **kwargs):
+    get_search_backend().remove_issues([instance.id])
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, update_fields=None, **kwargs):
+    if text_changed(update_fields):
+        get_search_backend().index_comments([instance])
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, **kwargs):
+    get_search_backend().remove_comments([instance.id])
@@ -1,3 +1,8 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
@@ -5,12 +10,17 @@ from django.contrib.auth import get_user_model
 from projects.models import Project, Contributor
 from issues.models import Issue, Comment
 from rest_framework.exceptions import ValidationError
+from api.testing import ProjectAPITestCase, QueryCountMixin, create_issue, create_user
+from projects.membership import membership_cache
 
 User = get_user_model()
 
 
-class IssueFlowTests(APITestCase):
+class IssueFlowTests(QueryCountMixin, APITestCase):
     def setUp(self):
+        # Le cache d'appartenance survit au rollback de la base entre deux tests
+        membership_cache.clear()
+
         # Création d'utilisateurs
         self.user1_data = {
             "username": "user1",
@@ -136,5 +146,338 @@ class IssueFlowTests(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("supprimée", response.data["message"])
 
+    # Le nombre de requêtes de la liste des issues ne dépend pas du nombre d'issues
+    def test_issue_list_query_count_is_constant(self):
+        self.authenticate(self.user1_data)
+        user1 = User.objects.get(username="user1")
+        user2 = User.objects.get(username="user2")
+        project = Project.objects.get(id=self.project_id)
+
+        def add_issues(count):
+            Issue.objects.bulk_create([
+                Issue(title=f"Issue {i}", description="Desc", author=user1, assignee=user2, project=project)
+                for i in range(count)
+            ])
+
+        self.assertConstantQueries(f"{self.issues_url}?limit=50", add_issues)
+
+    # ?fields= réduit la réponse et la requête SQL (pas de jointure, colonnes demandées seulement)
+    def test_issue_list_sparse_fields(self):
+        self.authenticate(self.user1_data)
+        self.client.post(self.issues_url, {"title": "Bug", "description": "Crash", "priority": "LOW", "balise": "BUG"}, format="json")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"{self.issues_url}?fields=id,title,progress&pagination=cursor")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0]), {"id", "title", "progress"})
+        issue_query = next(q["sql"] for q in context.captured_queries if 'FROM "issues_issue"' in q["sql"])
+        self.assertNotIn("JOIN", issue_query)
+        self.assertNotIn('"description"', issue_query)
+
+        response = self.client.get(f"{self.issues_url}?omit=description,comment")
+        self.assertNotIn("description", response.data["results"][0])
+        self.assertEqual(response.data["results"][0]["author"], "user1")
+
+        response = self.client.get(f"{self.issues_url}?fields=id,password")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+
+    # GET conditionnel : 304 tant que la liste et l'issue n'ont pas changé
+    def test_issue_conditional_get(self):
+        self.authenticate(self.user1_data)
+        data = {"title": "Bug", "description": "Crash", "priority": "LOW", "balise": "BUG"}
+        issue_id = self.client.post(self.issues_url, data, format="json").data["issue"]["id"]
+        self.client.post(self.issues_url, {**data, "title": "Autre"}, format="json")
+
+        response = self.client.get(self.issues_url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(any("JOIN" in query["sql"] for query in context.captured_queries))
+
+        # Autre URL (pagination, ?fields=) : autre ETag
+        self.assertNotEqual(self.client.get(f"{self.issues_url}?limit=1")["ETag"], etag)
+
+        # Username de l'auteur ou titre du projet modifié : la liste affichée change
+        author = User.objects.get(username=self.user1_data["username"])
+        author.username = "auteur-renomme"
+        author.save()
+        response = self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["author"], "auteur-renomme")
+        etag = response["ETag"]
+        Project.objects.get(id=self.project_id).save()
+        response = self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        detail_url = reverse("issue_detail", args=[self.project_id, issue_id])
+        response = self.client.get(detail_url)
+        self.assertEqual(response.data["id"], issue_id)
+        detail_etag, last_modified = response["ETag"], response["Last-Modified"]
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, 304)
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        # Modification (y compris en masse) puis suppression : l'ETag de la liste change
+        self.client.patch(reverse("issues_bulk", args=[self.project_id]), [{"id": issue_id, "progress": "FINISHED"}], format="json")
+        response = self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, 200)
+        etag = response["ETag"]
+        self.client.delete(detail_url)
+        self.assertEqual(self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # Un non-contributeur reçoit 403 même avec un ETag valide
+        self.authenticate(self.user3_data)
+        self.assertEqual(self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag).status_code, 403)
+
+    # Projet et appartenance chargés une seule fois pour permissions, serializer et vue
+    def test_issue_create_resolves_membership_once(self):
+        self.authenticate(self.user1_data)
+        data = {"title": "Bug", "description": "Desc", "priority": "LOW", "balise": "BUG", "assignee": "user1"}
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.issues_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        queries = [query["sql"] for query in context.captured_queries]
+        self.assertEqual(len([sql for sql in queries if 'FROM "projects_project"' in sql]), 1)
+        self.assertEqual(len([sql for sql in queries if 'FROM "projects_contributor"' in sql]), 1)
+
+    # Un non contributeur ne peut ni lister ni créer d'issues
+    def test_non_contributor_cannot_list_issues(self):
+        self.authenticate(self.user3_data)
+        response = self.client.get(self.issues_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        data = {"title": "Bug", "description": "Desc", "priority": "LOW", "balise": "BUG"}
+        response = self.client.post(self.issues_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    # Création en masse : nombre de requêtes fixe quelle que soit la taille du lot
+    def test_bulk_create_issues(self):
+        self.authenticate(self.user1_data)
+        bulk_url = reverse("issues_bulk", args=[self.project_id])
+
+        def batch(count):
+            return [
+                {"title": f"Bulk {i}", "description": "Desc", "priority": "LOW", "balise": "BUG",
+                 "assignee": "user2" if i % 2 else "user1"}
+                for i in range(count)
+            ]
+
+        # Le premier lot remplit le cache d'appartenance
+        self.client.post(bulk_url, batch(1), format="json")
+        counts = []
+        for size in (2, 20):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(bulk_url, batch(size), format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(response.data["issues"]), size)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(Issue.objects.filter(project_id=self.project_id, assignee__username="user2").count(), 11)
+
+    # Un élément invalide : erreurs par élément et aucune écriture
+    def test_bulk_create_reports_item_errors(self):
+        self.authenticate(self.user1_data)
+        bulk_url = reverse("issues_bulk", args=[self.project_id])
+        data = [
+            {"title": "Ok", "description": "Desc", "priority": "LOW", "balise": "BUG"},
+            {"title": "Ko", "description": "Desc", "priority": "LOW", "balise": "BUG", "assignee": "user3"},
+            {"title": "Ko", "description": "Desc", "priority": "LOW", "balise": "BUG", "assignee": "inconnu"},
+        ]
+        response = self.client.post(bulk_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2])
+        self.assertIn("n'est pas contributeur", str(response.data["errors"][0]))
+        self.assertEqual(Issue.objects.count(), 0)
+
+    # Mise à jour et suppression en masse réservées à l'auteur des issues
+    def test_bulk_update_and_delete_issues(self):
+        user1 = User.objects.get(username="user1")
+        user2 = User.objects.get(username="user2")
+        project = Project.objects.get(id=self.project_id)
+        own = [Issue.objects.create(title=f"Own {i}", description="Desc", author=user1, project=project) for i in range(2)]
+        other = Issue.objects.create(title="Other", description="Desc", author=user2, project=project)
+        bulk_url = reverse("issues_bulk", args=[self.project_id])
+        self.authenticate(self.user1_data)
+
+        data = [{"id": issue.id, "progress": "FINISHED", "assignee": "user2"} for issue in own]
+        response = self.client.patch(bulk_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Issue.objects.filter(progress="FINISHED", assignee=user2).count(), 2)
+
+        response = self.client.patch(bulk_url, [{"id": other.id, "title": "Pris"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Issue.objects.get(id=other.id).title, "Other")
+
+        response = self.client.delete(bulk_url, {"ids": [own[0].id, other.id]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertEqual(Issue.objects.count(), 3)
+
+        response = self.client.delete(bulk_url, {"ids": [issue.id for issue in own]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(Issue.objects.values_list("id", flat=True)), [other.id])
+
+    # Pagination par curseur : pages disjointes, ordre stable malgré une insertion
+    def test_issue_list_cursor_pagination(self):
+        self.authenticate(self.user1_data)
+        user1 = User.objects.get(username="user1")
+        project = Project.objects.get(id=self.project_id)
+        for i in range(5):
+            Issue.objects.create(title=f"Issue {i}", description="Desc", author=user1, project=project)
+
+        response = self.client.get(f"{self.issues_url}?pagination=cursor&page_size=3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        first_page = [issue["title"] for issue in response.data["results"]]
+        self.assertEqual(first_page, ["Issue 4", "Issue 3", "Issue 2"])
+
+        # Une issue créée entre deux pages ne décale pas la suite
+        Issue.objects.create(title="Nouvelle", description="Desc", author=user1, project=project)
+        response = self.client.get(response.data["next"])
+        second_page = [issue["title"] for issue in response.data["results"]]
+        self.assertEqual(second_page, ["Issue 1", "Issue 0"])
+        self.assertIsNone(response.data["next"])
+
+        # Le mode limit/offset reste le comportement par défaut
+        response = self.client.get(self.issues_url)
+        self.assertEqual(response.data["count"], 6)
+
+    # Compteurs dénormalisés ajustés par les créations, modifications et suppressions
+    def test_counters_follow_writes(self):
+        self.authenticate(self.user1_data)
+        project = Project.objects.get(id=self.project_id)
+        data = {"description": "Desc", "priority": "LOW", "balise": "BUG"}
+        issue_id = self.client.post(self.issues_url, {**data, "title": "A"}, format="json").data["issue"]["id"]
+        bulk_url = reverse("issues_bulk", args=[self.project_id])
+        created = self.client.post(bulk_url, [{**data, "title": "B"}, {**data, "title": "C"}], format="json").data["issues"]
+        project.refresh_from_db()
+        self.assertEqual((project.issue_count, project.open_issue_count), (3, 3))
+
+        detail_url = reverse("issue_detail", args=[self.project_id, issue_id])
+        self.client.patch(detail_url, {"progress": "FINISHED"}, format="json")
+        self.client.patch(bulk_url, [{"id": created[0]["id"], "progress": "FINISHED"}], format="json")
+        project.refresh_from_db()
+        self.assertEqual((project.issue_count, project.open_issue_count), (3, 1))
+
+        comments_url = reverse("comment_list", args=[self.project_id, issue_id])
+        uuid = self.client.post(comments_url, {"title": "Com", "description": "Desc"}, format="json").data["uuid"]
+        self.client.post(comments_url, {"title": "Com", "description": "Desc"}, format="json")
+        self.assertEqual(self.client.get(detail_url).data["comment_count"], 2)
+        self.client.delete(reverse("comment_detail", args=[self.project_id, issue_id, uuid]))
+        self.assertEqual(Issue.objects.get(id=issue_id).comment_count, 1)
+
+        self.client.delete(detail_url)
+        self.client.delete(bulk_url, {"ids": [created[1]["id"]]}, format="json")
+        project.refresh_from_db()
+        self.assertEqual((project.issue_count, project.open_issue_count), (1, 0))
+        self.assertEqual(self.client.get(self.projects_url).data["results"][0]["issue_count"], 1)
+
+
+class RepairCountersCommandTests(TestCase):
+
+    # Les compteurs dérivés sont recalculés ; --dry-run ne modifie rien
+    def test_repair_counters(self):
+        user = User.objects.create_user(username="author", password="Pass1234", birth_date="1990-01-01")
+        project = Project.objects.create(title="Projet", description="Desc", type="BACKEND", author=user)
+        issue = Issue.objects.create(title="A", description="Desc", priority="LOW", balise="BUG", author=user, project=project)
+        Issue.objects.create(title="B", description="Desc", priority="LOW", balise="BUG", progress="FINISHED", author=user, project=project)
+        Comment.objects.create(title="Com", description="Desc", issue=issue, author=user)
+        # Écarts introduits hors des chemins qui maintiennent les compteurs
+        Project.objects.update(issue_count=5, open_issue_count=0)
+        Issue.objects.update(comment_count=0)
+
+        out = StringIO()
+        call_command("repair_counters", dry_run=True, stdout=out)
+        self.assertIn("projects : 1 à corriger", out.getvalue())
+        self.assertIn("issues : 1 à corriger", out.getvalue())
+        self.assertEqual(Project.objects.get(id=project.id).issue_count, 5)
+
+        # Le recomptage se fait dans l'UPDATE même : un incrément concurrent n'est pas écrasé
+        with CaptureQueriesContext(connection) as context:
+            call_command("repair_counters", batch_size=1, stdout=StringIO())
+        updates = [query["sql"] for query in context.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertTrue(all("COUNT(" in sql for sql in updates))
+        project.refresh_from_db()
+        issue.refresh_from_db()
+        self.assertEqual((project.issue_count, project.open_issue_count, issue.comment_count), (2, 1, 1))
+
+        out = StringIO()
+        call_command("repair_counters", stdout=out)
+        self.assertIn("projects : 0 corrigé(s)", out.getvalue())
+
+
+class BenchmarkIndexesCommandTests(TestCase):
+
+    # Le benchmark tourne sur un petit jeu de données et ne laisse rien en base
+    def test_benchmark_indexes_rolls_back(self):
+        out = StringIO()
+        call_command("benchmark_indexes", issues=50, projects=5, users=3, comments=20, repeat=1, stdout=out)
+        self.assertIn("issues_first_page", out.getvalue())
+        self.assertEqual(Issue.objects.count(), 0)
+        self.assertEqual(User.objects.count(), 0)
+
+
+class IssueFilterTests(ProjectAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.member = create_user("member")
+        Contributor.objects.create(user=self.member, project=self.project)
+        for progress, priority, assignee in (
+            ("TODO", "LOW", self.author), ("TODO", "HIGH", self.member), ("FINISHED", "HIGH", self.member),
+        ):
+            create_issue(
+                self.project, self.author, title=f"{progress} {priority}", priority=priority,
+                progress=progress, assignee=assignee,
+            )
+        self.url = reverse("issues_list", args=[self.project.id])
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [issue["title"] for issue in response.data["results"]]
+
+    def test_filters_and_ordering(self):
+        self.assertEqual(self.titles(progress="TODO"), ["TODO LOW", "TODO HIGH"])
+        self.assertEqual(self.titles(assignee="member"), ["TODO HIGH", "FINISHED HIGH"])
+        self.assertEqual(self.titles(assignee="nobody"), [])
+        self.assertEqual(self.titles(priority="HIGH", ordering="-created_time"), ["FINISHED HIGH", "TODO HIGH"])
+        self.assertEqual(self.titles(created_after="2000-01-01", created_before="2000-01-02"), [])
+        self.assertEqual(len(self.titles(updated_after="2000-01-01")), 3)
+        self.assertEqual(self.titles(priority="HIGH", pagination="cursor"), ["FINISHED HIGH", "TODO HIGH"])
 
+        # Valeurs inconnues et combinaisons sans index
+        for params in (
+            {"progress": "DONE"},
+            {"ordering": "title"},
+            {"created_after": "hier"},
+            {"progress": "TODO", "priority": "HIGH"},
+            {"progress": "TODO", "ordering": "updated_time"},
+            {"created_after": "2000-01-01", "updated_after": "2000-01-01"},
+        ):
+            self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST, params)
 
+    # Plan d'exécution SQLite : chaque combinaison autorisée lit un index (SEARCH),
+    # sans parcours complet de la table (SCAN) ni tri temporaire
+    def test_filters_use_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN est propre à SQLite")
+        combinations = [{}, {"ordering": "-updated_time"}, {"updated_after": "2000-01-01"}]
+        for param, value in (("progress", "TODO"), ("priority", "HIGH"), ("balise", "BUG"), ("assignee", "member")):
+            combinations += [{param: value}, {param: value, "ordering": "-created_time", "created_after": "2000-01-01"}]
+        for params in combinations:
+            for pagination in ({}, {"pagination": "cursor"}):
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(self.url, {**params, **pagination})
+                queries = [query["sql"] for query in context.captured_queries if 'FROM "issues_issue"' in query["sql"]]
+                self.assertTrue(queries)
+                with connection.cursor() as cursor:
+                    for sql in queries:
+                        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                        plan = " | ".join(row[-1] for row in cursor.fetchall())
+                        self.assertNotIn("SCAN issues_issue", plan, (params, pagination, sql))
+                        self.assertNotIn("TEMP B-TREE", plan, (params, pagination, sql))
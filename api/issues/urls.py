@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path('', views.IssuesListCreateView.as_view(), name='issues_list'),
+    path('bulk/', views.IssueBulkView.as_view(), name='issues_bulk'),
     path('<int:issue_id>/', views.IssueDetailView.as_view(), name='issue_detail'),
     path('<int:issue_id>/comments/', views.CommentListCreateView.as_view(), name='comment_list'),
     path('<int:issue_id>/comments/<uuid:comment_id>/', views.CommentDetailView.as_view(), name='comment_detail'),
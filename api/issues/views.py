@@ -1,18 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Max
 from rest_framework import generics, serializers, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
 from .models import Issue, Comment
 from .serializers import IssueSerializer, CommentSerializer, ContributorSerializer
 from .permissions import IsContributor, IsAuthor
+from .counters import adjust_project_counters, is_open
 from projects.models import Contributor, Project
+from projects.membership import get_membership
+from api.pagination import CursorOrLimitOffsetPagination
+from api.conditional import ConditionalGetMixin, ConditionalObjectMixin, users_last_modified
+from api.filters import IndexedFilterBackend
 
+User = get_user_model()
 
-class IssuesListCreateView(generics.ListCreateAPIView):
+
+class IssuesListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET /api/projects/{project-id}/issues/
 
     Récupère la liste des issues (tickets) d’un projet.
+    Pagination limit/offset par défaut, ou par curseur avec `?pagination=cursor&page_size=20`.
+    Réponse partielle avec `?fields=id,title` ou `?omit=description`.
+    Filtres : `?progress=`, `?priority=`, `?balise=`, `?assignee=<username>` (un seul à la fois),
+    `?created_after=` / `?created_before=` ou `?updated_after=` / `?updated_before=` (ISO 8601).
+    Tri : `?ordering=created_time`, `-created_time`, `updated_time` ou `-updated_time`
+    (sans filtre d'égalité pour updated_time). Une combinaison non couverte par un index renvoie 400.
 
     ---
     POST /api/projects/{project-id}/issues/
@@ -52,18 +69,40 @@ class IssuesListCreateView(generics.ListCreateAPIView):
     serializer_class = IssueSerializer
     # L’utilisateur doit être authentifié et contributeur du projet
     permission_classes = [IsAuthenticated, IsContributor]
+    # ?pagination=cursor pour paginer par curseur, limit/offset sinon
+    pagination_class = CursorOrLimitOffsetPagination
+    # Filtres et tris autorisés, chaque combinaison servie par un index de Issue.Meta
+    filter_backends = [IndexedFilterBackend]
+    filter_fields = {
+        'progress': 'progress',
+        'priority': 'priority',
+        'balise': 'balise',
+        'assignee': 'assignee__username',
+    }
+    range_fields = {'created': 'created_time', 'updated': 'updated_time'}
+    ordering_fields = ('created_time', 'updated_time')
+    index_prefix = ('project',)
 
     def get_queryset(self):
-        # Récupère toutes les issues liées au projet donné
+        # Récupère toutes les issues liées au projet donné, dans l'ordre de l'index (limit/offset stable)
         project_id = self.kwargs['project_id']
-        return Issue.objects.filter(project__id=project_id)
+        issues = Issue.objects.filter(project__id=project_id).order_by('created_time', 'id')
+        return IssueSerializer.setup_eager_loading(issues, self.request)
+
+    def get_validator_state(self, request, project_id):
+        # ETag : dernière modification et nombre d'issues du projet (lus dans l'index),
+        # et versions du projet et des utilisateurs affichés par titre et username
+        issues = Issue.objects.filter(project_id=project_id)
+        state = issues.aggregate(last_modified=Max('updated_time'), count=Count('id'))
+        project = get_membership(request, project_id).project
+        users = users_last_modified(issues.values('author_id'), issues.values('assignee_id'))
+        return max(filter(None, (state['last_modified'], project.updated_time, users))), state['count']
 
     def get_serializer_context(self):
-        # Passe l’objet projet et la requête au serializer
+        # Passe l’objet projet (déjà chargé par les permissions) et la requête au serializer
         context = super().get_serializer_context()
         project_id = self.kwargs['project_id']
-        project = Project.objects.get(id=project_id)
-        context['project'] = project
+        context['project'] = get_membership(self.request, project_id).project
         context['request'] = self.request
         return context
 
@@ -94,7 +133,140 @@ class IssuesListCreateView(generics.ListCreateAPIView):
             )
 
 
-class IssueDetailView(generics.RetrieveUpdateDestroyAPIView):
+class IssueBulkView(APIView):
+    """
+    POST /api/projects/{project-id}/issues/bulk/
+    Crée plusieurs issues du projet en une seule requête.
+
+    PATCH /api/projects/{project-id}/issues/bulk/
+    Met à jour plusieurs issues, chaque élément indique son "id" (réservé à l’auteur).
+
+    DELETE /api/projects/{project-id}/issues/bulk/
+    Supprime plusieurs issues (réservé à l’auteur).
+
+    Le lot est validé en entier puis écrit dans une seule transaction :
+    si un élément est invalide, rien n’est écrit.
+
+    ### Exemple de corps de requête (POST)
+    ```json
+    [
+        {"title": "Bug 1", "description": "...", "priority": "LOW", "balise": "BUG", "assignee": "user2"},
+        {"title": "Bug 2", "description": "...", "priority": "HIGH", "balise": "BUG"}
+    ]
+    ```
+
+    ### Exemple de corps de requête (DELETE)
+    ```json
+    {"ids": [1, 2, 3]}
+    ```
+
+    ### Exemple de réponse en erreur
+    ```json
+    {
+        "message": "Aucune issue n'a été enregistrée.",
+        "errors": [
+            {"index": 1, "errors": {"assignee": ["user3 n'est pas contributeur de ce projet"]}}
+        ]
+    }
+    ```
+    tags:
+      - Issues
+    """
+    permission_classes = [IsAuthenticated, IsContributor]
+    # Nombre maximal d’éléments par lot
+    max_items = 1000
+
+    def get_serializer_context(self, items):
+        # Résout tous les usernames et leur appartenance au projet en deux requêtes
+        membership = get_membership(self.request, self.kwargs['project_id'])
+        usernames = set()
+        if isinstance(items, list):
+            usernames = {
+                item['assignee'] for item in items
+                if isinstance(item, dict) and isinstance(item.get('assignee'), str)
+            }
+        users = {}
+        if usernames:
+            users = {user.username: user for user in User.objects.filter(username__in=usernames)}
+            membership.prime(user.id for user in users.values())
+        return {
+            'request': self.request,
+            'view': self,
+            'project': membership.project,
+            'users_by_username': users,
+        }
+
+    def error_response(self, errors):
+        # Erreurs par élément, repérées par leur position dans le lot
+        # (liste ou dict {position: erreurs} selon la version de DRF)
+        if isinstance(errors, list):
+            errors = dict(enumerate(errors))
+        if errors and all(isinstance(index, int) for index in errors):
+            errors = [{"index": index, "errors": error} for index, error in sorted(errors.items()) if error]
+        return Response(
+            {"message": "Aucune issue n'a été enregistrée.", "errors": errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    def post(self, request, project_id):
+        context = self.get_serializer_context(request.data)
+        serializer = IssueSerializer(data=request.data, many=True, max_length=self.max_items, context=context)
+        if not serializer.is_valid():
+            return self.error_response(serializer.errors)
+        serializer.save(author=request.user, project=context['project'])
+        return Response(
+            {
+                "message": f"{len(serializer.data)} issue(s) créée(s).",
+                "issues": serializer.data
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+    def patch(self, request, project_id):
+        context = self.get_serializer_context(request.data)
+        ids = []
+        if isinstance(request.data, list):
+            ids = [item['id'] for item in request.data if isinstance(item, dict) and isinstance(item.get('id'), int)]
+        issues = IssueSerializer.setup_eager_loading(Issue.objects.filter(project_id=project_id, id__in=ids))
+        serializer = IssueSerializer(
+            {issue.id: issue for issue in issues}, data=request.data, many=True,
+            partial=True, max_length=self.max_items, context=context
+        )
+        if not serializer.is_valid():
+            return self.error_response(serializer.errors)
+        serializer.save()
+        return Response({
+            "message": f"{len(serializer.data)} issue(s) mise(s) à jour.",
+            "issues": serializer.data
+        })
+
+    def delete(self, request, project_id):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else request.data
+        if (not isinstance(ids, list) or len(ids) > self.max_items
+                or not all(isinstance(issue_id, int) for issue_id in ids)):
+            raise ValidationError({"ids": [f"Une liste d'au plus {self.max_items} identifiants est attendue."]})
+
+        authors = dict(Issue.objects.filter(project_id=project_id, id__in=ids).values_list('id', 'author_id'))
+        errors = []
+        for issue_id in ids:
+            if issue_id not in authors:
+                errors.append({'id': ["Issue introuvable dans ce projet."]})
+            elif authors[issue_id] != request.user.id:
+                errors.append({'id': ["Seul l'auteur de l'issue peut la supprimer."]})
+            else:
+                errors.append({})
+        if any(errors):
+            return self.error_response(errors)
+
+        with transaction.atomic():
+            Issue.objects.filter(id__in=authors).delete()
+        return Response(
+            {"message": f"{len(authors)} issue(s) supprimée(s)."},
+            status=status.HTTP_200_OK
+        )
+
+
+class IssueDetailView(ConditionalObjectMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET /api/projects/{project-id}/issues/{issue-id}/
     Récupère les détails d’une issue.
@@ -122,13 +294,13 @@ class IssueDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = IssueSerializer
     # Seul l’auteur d’une issue peut la modifier ou supprimer
     permission_classes = [IsAuthenticated, IsAuthor]
-    lookup_field = "project_id"
-    lookup_url_kwargs = "issue_id"
+    lookup_url_kwarg = "issue_id"
+    validator_relations = ('project', 'author', 'assignee')
 
     def get_queryset(self):
         # Retourne uniquement les issues du projet concerné
         project_id = self.kwargs['project_id']
-        return Issue.objects.filter(project__id=project_id)
+        return IssueSerializer.setup_eager_loading(Issue.objects.filter(project__id=project_id), self.request)
 
     def update(self, request, *args, **kwargs):
         # Mise à jour partielle d’une issue
@@ -141,6 +313,13 @@ class IssueDetailView(generics.RetrieveUpdateDestroyAPIView):
             "issue": serializer.data
         })
 
+    def perform_update(self, serializer):
+        # Passage à FINISHED (ou retour) : ajuste le nombre d'issues ouvertes du projet
+        was_open = is_open(serializer.instance.progress)
+        with transaction.atomic():
+            issue = serializer.save()
+            adjust_project_counters(issue.project_id, open_issues=int(is_open(issue.progress)) - int(was_open))
+
     def destroy(self, request, *args, **kwargs):
         # Suppression d’une issue
         instance = self.get_object()
@@ -152,10 +331,12 @@ class IssueDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
 
 
-class CommentListCreateView(generics.ListCreateAPIView):
+class CommentListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET /api/projects/{project-id}/issues/{issue-id}/comments/
     Récupère la liste des commentaires liés à une issue.
+    Pagination limit/offset par défaut, ou par curseur avec `?pagination=cursor&page_size=20`.
+    Réponse partielle avec `?fields=uuid,title` ou `?omit=description`.
 
     POST /api/projects/{project-id}/issues/{issue-id}/comments/
     Crée un nouveau commentaire sur une issue.
@@ -181,12 +362,19 @@ class CommentListCreateView(generics.ListCreateAPIView):
     serializer_class = CommentSerializer
     # Seuls les contributeurs peuvent commenter
     permission_classes = [IsAuthenticated, IsContributor]
+    pagination_class = CursorOrLimitOffsetPagination
     lookup_url_kwarg = 'issue_id'
 
     def get_queryset(self):
         # Retourne les commentaires d’une issue spécifique
         issue_id = self.kwargs['issue_id']
-        return Comment.objects.filter(issue__id=issue_id)
+        return CommentSerializer.setup_eager_loading(Comment.objects.filter(issue__id=issue_id), self.request)
+
+    def get_validator_state(self, request, project_id, issue_id):
+        state = Comment.objects.filter(issue_id=issue_id).aggregate(
+            last_modified=Max('updated_time'), count=Count('id')
+        )
+        return state['last_modified'], state['count']
 
     def perform_create(self, serializer):
         # Lors de la création, on associe l’utilisateur et l’issue
@@ -195,7 +383,7 @@ class CommentListCreateView(generics.ListCreateAPIView):
         serializer.save(author=self.request.user, issue=issue)
 
 
-class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CommentDetailView(ConditionalObjectMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET /api/projects/{project-id}/issues/{issue-id}/comments/{comment-id}/
     Récupère un commentaire spécifique.
@@ -210,15 +398,15 @@ class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
       - Issues
     """
     serializer_class = CommentSerializer
-    lookup_field = "issue_id"
-    lookup_url_kwargs = "comment_id"
+    lookup_field = "uuid"
+    lookup_url_kwarg = "comment_id"
     # Seul l’auteur d’un commentaire peut le modifier ou le supprimer
     permission_classes = [IsAuthenticated, IsAuthor]
 
     def get_queryset(self):
         # On récupère les commentaires liés à l’issue concernée
         issue_id = self.kwargs['issue_id']
-        return Comment.objects.filter(issue__id=issue_id)
+        return CommentSerializer.setup_eager_loading(Comment.objects.filter(issue__id=issue_id), self.request)
 
 
 class ContributorListCreateView(generics.ListCreateAPIView):
@@ -252,7 +440,7 @@ class ContributorListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         # Retourne les contributeurs liés à un projet
-        return Contributor.objects.filter(project_id=self.kwargs['project_pk'])
+        return ContributorSerializer.setup_eager_loading(Contributor.objects.filter(project_id=self.kwargs['project_pk']))
 
     def perform_create(self, serializer):
         # Ajout d’un contributeur à un projet
@@ -310,7 +498,7 @@ class ContributorDeleteView(generics.DestroyAPIView):
 
     def get_queryset(self):
         # Récupère les contributeurs liés au projet
-        return Contributor.objects.filter(project_id=self.kwargs['project_pk'])
+        return ContributorSerializer.setup_eager_loading(Contributor.objects.filter(project_id=self.kwargs['project_pk']))
 
     def perform_destroy(self, instance):
         # L’auteur ne peut pas se retirer lui-même
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        # Branche les signaux du cache d'appartenance et du journal des modifications
+        from . import signals  # noqa: F401
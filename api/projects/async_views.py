@@ -0,0 +1,34 @@
+from rest_framework.exceptions import PermissionDenied
+from api.async_views import AsyncAPIView
+from .models import Project
+from .membership import membership_cache
+from .serializers import ProjectSerializer, ProjectSerializerDetail
+
+
+class AsyncProjectListView(AsyncAPIView):
+    """
+    GET /api/async/projects/
+
+    Variante asynchrone (ASGI) de GET /api/projects/ : même réponse, pagination limit/offset.
+    """
+
+    async def get(self, request):
+        project_ids = await membership_cache.aget_project_ids(self.drf_request.user.id)
+        projects = ProjectSerializer.setup_eager_loading(Project.objects.filter(id__in=project_ids), self.drf_request)
+        return self.render(await self.paginate(projects, ProjectSerializer))
+
+
+class AsyncProjectDetailView(AsyncAPIView):
+    """
+    GET /api/async/projects/{project-id}/
+
+    Variante asynchrone (ASGI) de GET /api/projects/{project-id}/ (sans le cache de rendu).
+    """
+
+    async def get(self, request, project_id):
+        user = self.drf_request.user
+        projects = ProjectSerializerDetail.setup_eager_loading(Project.objects.all(), self.drf_request)
+        project = await self.get_object_or_404(projects, id=project_id)
+        if project.author_id != user.id and project.id not in await membership_cache.aget_project_ids(user.id):
+            raise PermissionDenied()
+        return self.render(ProjectSerializerDetail(project, context=self.get_serializer_context()).data)
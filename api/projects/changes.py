@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from .models import Change
+
+# Nombre maximal de lignes du journal lues par appel de /changes/
+MAX_CHANGES = 1000
+
+DEFAULT_OPTIONS = {
+    'SETTLE_SECONDS': 10,
+    'RETENTION_DAYS': 30,
+}
+
+
+def changes_options():
+    return {**DEFAULT_OPTIONS, **getattr(settings, 'PROJECT_CHANGES', {})}
+
+
+def record_changes(project_id, model, object_ids, action):
+    # Écritures en masse (bulk_create / bulk_update) : aucun signal n'est envoyé
+    Change.objects.bulk_create([
+        Change(project_id=project_id, model=model, object_id=str(object_id), action=action)
+        for object_id in object_ids
+    ])
+
+
+def collect_changes(project_id, since, limit=MAX_CHANGES):
+    # Lit au plus `limit` lignes après le curseur et ne garde que le dernier état de chaque objet :
+    # la réponse dépend du nombre d'objets modifiés, pas de la taille du projet.
+    rows = list(
+        Change.objects.filter(project_id=project_id, id__gt=since)
+        .order_by('id')
+        .values_list('id', 'model', 'object_id', 'action', 'created_time')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Les identifiants sont attribués à l'insertion, pas à la validation : une transaction
+    # encore en cours peut rendre visible plus tard un identifiant inférieur à une ligne déjà lue.
+    # Le curseur s'arrête donc avant la première ligne de moins de SETTLE_SECONDS, servie à un
+    # appel suivant (les transactions qui écrivent le journal durent bien moins longtemps).
+    settled = timezone.now() - timedelta(seconds=changes_options()['SETTLE_SECONDS'])
+    for position, row in enumerate(rows):
+        if row[4] > settled:
+            rows, has_more = rows[:position], False
+            break
+
+    latest = {}
+    for _, model, object_id, action, _ in rows:
+        latest.pop((model, object_id), None)
+        latest[(model, object_id)] = action
+
+    changed = {model: [] for model, _ in Change.MODEL_CHOICES}
+    deleted = {model: [] for model, _ in Change.MODEL_CHOICES}
+    for (model, object_id), action in latest.items():
+        (deleted if action == 'deleted' else changed)[model].append(object_id)
+    return {
+        'cursor': rows[-1][0] if rows else since,
+        'has_more': has_more,
+        'changed': changed,
+        'deleted': deleted,
+    }
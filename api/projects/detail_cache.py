@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import caches
+from .models import Change
+
+
+# Cache de la représentation détaillée d'un projet (ProjectSerializerDetail).
+# La clé inclut une version : le dernier identifiant du journal des modifications
+# du projet (changes.py), qui avance à chaque issue, commentaire ou contributeur
+# créé, modifié ou supprimé, y compris par les écritures en masse, et la date de
+# modification du projet (et celle des utilisateurs affichés, fournie par la vue).
+# Une entrée n'est donc jamais invalidée : elle n'est plus lue.
+class ProjectDetailCache:
+    defaults = {
+        'CACHE_ALIAS': 'default',
+        'TIMEOUT': 3600,
+        'KEY_PREFIX': 'project_detail',
+    }
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def options(self):
+        return {**self.defaults, **getattr(settings, 'PROJECT_DETAIL_CACHE', {})}
+
+    @property
+    def cache(self):
+        return caches[self.options['CACHE_ALIAS']]
+
+    def version(self, project):
+        # Une lecture dans l'index (project, id) du journal
+        last_change = (
+            Change.objects.filter(project_id=project.pk).order_by('-id').values_list('id', flat=True).first()
+        )
+        return f"{last_change or 0}.{project.updated_time.timestamp()}"
+
+    def key(self, project, request, users_last_modified=None):
+        # Les liens "next" de la représentation sont absolus : l'hôte fait partie de la clé
+        origin = f"{request.scheme}://{request.get_host()}"
+        users = users_last_modified.timestamp() if users_last_modified else 0
+        return f"{self.options['KEY_PREFIX']}:{origin}:{project.pk}:{self.version(project)}.{users}"
+
+    def get(self, key):
+        data = self.cache.get(key)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data, self.options['TIMEOUT'])
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+project_detail_cache = ProjectDetailCache()
@@ -0,0 +1,96 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from issues.models import Issue, Comment
+
+# Nombre d'issues lues par requête : la mémoire reste constante quelle que soit la taille du projet
+CHUNK_SIZE = 500
+
+CSV_COLUMNS = [
+    'record', 'issue_id', 'comment_uuid', 'title', 'description', 'priority',
+    'balise', 'progress', 'author', 'assignee', 'created_time',
+]
+
+
+def project_record(project):
+    # En-tête de l'export : le projet et ses contributeurs
+    return {
+        'record': 'project',
+        'id': project.id,
+        'title': project.title,
+        'description': project.description,
+        'type': project.type,
+        'author': project.author.username,
+        'contributors': list(project.contributors.values_list('user__username', flat=True)),
+        'created_time': project.created_time,
+    }
+
+
+def issue_records(project):
+    # Issues du projet avec leurs commentaires, lues par paquets de CHUNK_SIZE
+    comments = Comment.objects.select_related('author').order_by('created_time', 'id')
+    issues = (
+        Issue.objects.filter(project=project)
+        .select_related('author', 'assignee')
+        .prefetch_related(Prefetch('comment', queryset=comments))
+        .order_by('created_time', 'id')
+    )
+    for issue in issues.iterator(chunk_size=CHUNK_SIZE):
+        yield {
+            'record': 'issue',
+            'id': issue.id,
+            'title': issue.title,
+            'description': issue.description,
+            'priority': issue.priority,
+            'balise': issue.balise,
+            'progress': issue.progress,
+            'author': issue.author.username,
+            'assignee': issue.assignee.username if issue.assignee else None,
+            'created_time': issue.created_time,
+            'comments': [
+                {
+                    'uuid': comment.uuid,
+                    'title': comment.title,
+                    'description': comment.description,
+                    'author': comment.author.username,
+                    'created_time': comment.created_time,
+                }
+                for comment in issue.comment.all()
+            ],
+        }
+
+
+def export_ndjson(project):
+    # Une ligne JSON par enregistrement
+    yield json.dumps(project_record(project), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+    for record in issue_records(project):
+        yield json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+class Echo:
+    # Pseudo-fichier : csv.writer renvoie directement la ligne écrite
+    def write(self, value):
+        return value
+
+
+def export_csv(project):
+    # Une ligne par issue suivie d'une ligne par commentaire
+    writer = csv.DictWriter(Echo(), fieldnames=CSV_COLUMNS, extrasaction='ignore')
+    yield writer.writerow(dict(zip(CSV_COLUMNS, CSV_COLUMNS)))
+    for record in issue_records(project):
+        yield writer.writerow({**record, 'issue_id': record['id']})
+        for comment in record['comments']:
+            yield writer.writerow({
+                **comment,
+                'record': 'comment',
+                'issue_id': record['id'],
+                'comment_uuid': comment['uuid'],
+            })
+
+
+EXPORT_FORMATS = {
+    'ndjson': (export_ndjson, 'application/x-ndjson'),
+    'csv': (export_csv, 'text/csv'),
+}
@@ -0,0 +1,224 @@
+import json
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from issues.models import Issue, Comment
+from .models import Project, Contributor
+from .membership import membership_cache
+from .changes import record_changes
+from issues.counters import adjust_project_counters, is_open
+from issues.search import get_search_backend
+
+User = get_user_model()
+
+
+class ImportFormatError(ValueError):
+    def __init__(self, line, message):
+        super().__init__(f"Ligne {line} : {message}")
+        self.line = line
+
+
+# Correspondance username -> id bornée (LRU) : les gros imports ne chargent pas tous les utilisateurs
+class UsernameMap:
+
+    def __init__(self, max_size=100_000):
+        self.max_size = max_size
+        self._ids = OrderedDict()
+
+    def resolve(self, usernames):
+        # Charge en une requête les usernames absents de la correspondance
+        missing = {username for username in usernames if username not in self._ids}
+        if missing:
+            for username, user_id in User.objects.filter(username__in=missing).values_list('username', 'id'):
+                self._ids[username] = user_id
+        resolved = {}
+        for username in usernames:
+            if username in self._ids:
+                self._ids.move_to_end(username)
+                resolved[username] = self._ids[username]
+        while len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+        return resolved
+
+
+# Import en flux d'un fichier NDJSON au format de l'export (projects.exports) :
+# une ligne "project" (avec ses contributeurs) suivie des lignes "issue" (avec leurs commentaires).
+# Les enregistrements sont écrits par lots (bulk_create), un lot par transaction ;
+# on_checkpoint est appelé après chaque lot validé pour permettre la reprise.
+class SoftDeskImporter:
+    PRIORITIES = {choice for choice, _ in Issue.PRIORITY_CHOICES}
+    BALISES = {choice for choice, _ in Issue.BALISE_CHOICES}
+    PROGRESSES = {choice for choice, _ in Issue.PROGRESS_CHOICES}
+    TYPES = {choice for choice, _ in Project.TYPE_CHOICES}
+
+    def __init__(self, project=None, batch_size=1000, user_map_size=100_000, on_checkpoint=None):
+        # project : projet cible imposé (upload), les lignes "project" sont alors refusées
+        self.target = project
+        self.project = project
+        self.batch_size = batch_size
+        self.users = UsernameMap(user_map_size)
+        self.on_checkpoint = on_checkpoint
+        self.allowed_user_ids = None
+        if project is not None:
+            self.allowed_user_ids = set(project.contributors.values_list('user_id', flat=True))
+        self.counts = {'projects': 0, 'contributors': 0, 'issues': 0, 'comments': 0}
+        self.line = 0
+        self.offset = 0
+
+    def run(self, lines, line=0, offset=0):
+        # lines : itérable de lignes (bytes ou str) ; line/offset : position de reprise
+        self.line, self.offset = line, offset
+        pending = []
+        size = 0
+        for raw in lines:
+            self.line += 1
+            self.offset += len(raw) if isinstance(raw, bytes) else len(raw.encode())
+            if not raw.strip():
+                continue
+            record = self.parse(raw)
+            if record is None:
+                continue
+            pending.append((self.line, record))
+            size += 1 + len(record.get('comments') or []) + len(record.get('contributors') or [])
+            if size >= self.batch_size:
+                self.flush(pending)
+                pending, size = [], 0
+        self.flush(pending)
+        return self.counts
+
+    def parse(self, raw):
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            raise ImportFormatError(self.line, "JSON invalide.")
+        if not isinstance(record, dict) or record.get('record') not in ('project', 'issue'):
+            raise ImportFormatError(self.line, "'record' doit valoir 'project' ou 'issue'.")
+        if record['record'] == 'project':
+            # Import dans un projet existant : l'en-tête d'un export est ignoré
+            if self.target is not None:
+                return None
+            self.check(record, ('title', 'type', 'author'), {'type': self.TYPES})
+        else:
+            self.check(record, ('title', 'author', 'priority', 'balise'), {
+                'priority': self.PRIORITIES, 'balise': self.BALISES, 'progress': self.PROGRESSES,
+            })
+            for comment in record.get('comments') or []:
+                self.check(comment, ('author',), {})
+        return record
+
+    def check(self, record, required, choices):
+        for field in required:
+            if not record.get(field):
+                raise ImportFormatError(self.line, f"Le champ '{field}' est obligatoire.")
+        for field, allowed in choices.items():
+            if field in record and record[field] not in allowed:
+                raise ImportFormatError(self.line, f"Valeur invalide pour '{field}' : {record[field]}.")
+
+    def usernames(self, pending):
+        names = set()
+        for _, record in pending:
+            names.add(record['author'])
+            names.update(record.get('contributors') or [])
+            if record.get('assignee'):
+                names.add(record['assignee'])
+            names.update(comment['author'] for comment in record.get('comments') or [])
+        return names
+
+    def user_id(self, users, line, username):
+        user_id = users.get(username)
+        if user_id is None:
+            raise ImportFormatError(line, f"Utilisateur inconnu : {username}.")
+        if self.allowed_user_ids is not None and user_id not in self.allowed_user_ids:
+            raise ImportFormatError(line, f"{username} n'est pas contributeur de ce projet.")
+        return user_id
+
+    def record_changes(self, projects, issues, comments):
+        # bulk_create n'envoie pas de signal : le journal des modifications est écrit ici.
+        # bulk_create(ignore_conflicts=True) ne renseigne pas les id des contributeurs,
+        # relus pour les projets créés (seuls projets auxquels l'import en ajoute).
+        rows = [
+            *(('contributor', project_id, contributor_id) for project_id, contributor_id in
+              Contributor.objects.filter(project__in=projects).values_list('project_id', 'id')),
+            *(('issue', issue.project_id, issue.id) for issue in issues),
+            *(('comment', comment.issue.project_id, comment.uuid) for comment in comments),
+        ]
+        by_project = {}
+        for model, project_id, object_id in rows:
+            by_project.setdefault((project_id, model), []).append(object_id)
+        for (project_id, model), object_ids in by_project.items():
+            record_changes(project_id, model, object_ids, 'created')
+
+    def adjust_counters(self, issues):
+        # Compteurs des projets touchés par le lot (les issues ont leur comment_count dès la création)
+        deltas = {}
+        for issue in issues:
+            total, open_issues = deltas.get(issue.project_id, (0, 0))
+            deltas[issue.project_id] = (total + 1, open_issues + is_open(issue.progress))
+        for project_id, (total, open_issues) in deltas.items():
+            adjust_project_counters(project_id, issues=total, open_issues=open_issues)
+
+    def flush(self, pending):
+        if not pending:
+            return
+        users = self.users.resolve(self.usernames(pending))
+
+        # Prépare les objets du lot ; chaque issue appartient au dernier projet rencontré
+        projects, contributors, issues, comments = [], [], [], []
+        project = self.project
+        for line, record in pending:
+            if record['record'] == 'project':
+                author_id = self.user_id(users, line, record['author'])
+                project = Project(
+                    title=record['title'], description=record.get('description', ''),
+                    type=record['type'], author_id=author_id,
+                )
+                projects.append(project)
+                member_ids = {author_id} | {
+                    self.user_id(users, line, username) for username in record.get('contributors') or []
+                }
+                contributors.extend(Contributor(project=project, user_id=user_id) for user_id in member_ids)
+                continue
+            if project is None:
+                raise ImportFormatError(line, "Aucun projet ne précède cette issue.")
+            issue = Issue(
+                title=record['title'], description=record.get('description', ''),
+                priority=record['priority'], balise=record['balise'],
+                progress=record.get('progress', 'TODO'), project=project,
+                author_id=self.user_id(users, line, record['author']),
+                assignee_id=self.user_id(users, line, record['assignee']) if record.get('assignee') else None,
+                comment_count=len(record.get('comments') or []),
+            )
+            issues.append(issue)
+            comments.extend(
+                Comment(
+                    title=comment.get('title', ''), description=comment.get('description', ''),
+                    issue=issue, author_id=self.user_id(users, line, comment['author']),
+                )
+                for comment in record.get('comments') or []
+            )
+
+        # bulk_create renseigne les clés des projets et issues créés avant les objets qui les référencent
+        with transaction.atomic():
+            Project.objects.bulk_create(projects, batch_size=self.batch_size)
+            Contributor.objects.bulk_create(contributors, batch_size=self.batch_size, ignore_conflicts=True)
+            Issue.objects.bulk_create(issues, batch_size=self.batch_size)
+            Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+            self.record_changes(projects, issues, comments)
+            self.adjust_counters(issues)
+            search_backend = get_search_backend()
+            search_backend.index_issues(issues)
+            search_backend.index_comments(comments)
+
+        for contributor in contributors:
+            membership_cache.invalidate(contributor.user_id)
+        self.project = project
+        self.counts['projects'] += len(projects)
+        self.counts['contributors'] += len(contributors)
+        self.counts['issues'] += len(issues)
+        self.counts['comments'] += len(comments)
+        if self.on_checkpoint:
+            self.on_checkpoint({
+                'line': self.line, 'offset': self.offset,
+                'project_id': project.id, 'counts': dict(self.counts),
+            })
@@ -0,0 +1,157 @@
+import asyncio
+import shlex
+import shutil
+import socket
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare, à forte concurrence, les lectures servies par gunicorn (WSGI) "
+        "et par un serveur ASGI (uvicorn par défaut) : vues synchrones puis vues /api/async/. "
+        "Chaque serveur est lancé puis arrêté par la commande ; les requêtes utilisent "
+        "un token JWT de --username sur la base configurée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help="Utilisateur dont le token est utilisé")
+        parser.add_argument('--path', default='/api/projects/', help="Endpoint synchrone mesuré")
+        parser.add_argument('--concurrency', type=int, default=200, help="Connexions simultanées")
+        parser.add_argument('--duration', type=float, default=10, help="Durée de chaque mesure (s)")
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--wsgi', default='gunicorn api.wsgi:application --workers {workers} --threads 4 --bind 127.0.0.1:{port}'
+        )
+        parser.add_argument(
+            '--asgi', default='uvicorn api.asgi:application --workers {workers} --port {port} --no-access-log'
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(f"Utilisateur inconnu : {options['username']}")
+        token = str(AccessToken.for_user(user))
+        sync_path = options['path']
+        async_path = sync_path.replace('/api/', '/api/async/', 1)
+
+        self.stdout.write(
+            f"{'serveur':<8}{'endpoint':<30}{'req/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+            f"{'p99 (ms)':>10}{'erreurs':>9}"
+        )
+        for server, command, paths in (
+            ('wsgi', options['wsgi'], (sync_path,)),
+            ('asgi', options['asgi'], (sync_path, async_path)),
+        ):
+            argv = shlex.split(command.format(workers=options['workers'], port=options['port']))
+            if shutil.which(argv[0]) is None:
+                self.stdout.write(self.style.WARNING(f"{server:<8}{argv[0]} introuvable, mesure ignorée"))
+                continue
+            process = subprocess.Popen(
+                argv, cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                self.wait_for_port(options['port'], process)
+                for path in paths:
+                    result = asyncio.run(load(
+                        '127.0.0.1', options['port'], path, token,
+                        options['concurrency'], options['duration'],
+                    ))
+                    self.write_result(server, path, result)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+    def wait_for_port(self, port, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"Le serveur s'est arrêté au démarrage (code {process.returncode})")
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"Le serveur n'écoute pas sur le port {port} après {timeout} s")
+
+    def write_result(self, server, path, result):
+        latencies = sorted(result['latencies'])
+        if not latencies:
+            self.stdout.write(f"{server:<8}{path:<30}{'-':>10}{'-':>10}{'-':>10}{'-':>10}{result['errors']:>9}")
+            return
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(
+            f"{server:<8}{path:<30}{len(latencies) / result['duration']:>10.0f}"
+            f"{quantiles[49]:>10.1f}{quantiles[94]:>10.1f}{quantiles[98]:>10.1f}{result['errors']:>9}"
+        )
+
+
+async def load(host, port, path, token, concurrency, duration):
+    # Générateur de charge HTTP/1.1 minimal (keep-alive) : `concurrency` connexions
+    # qui enchaînent les GET jusqu'à l'échéance. Latences en ms des réponses 2xx.
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+        f"Authorization: Bearer {token}\r\nConnection: keep-alive\r\n\r\n"
+    ).encode()
+    result = {'latencies': [], 'errors': 0, 'duration': duration}
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        connection = None
+        while time.perf_counter() < deadline:
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(host, port)
+                reader, writer = connection
+                start = time.perf_counter()
+                writer.write(request)
+                await writer.drain()
+                status, keep_alive = await read_response(reader)
+                if 200 <= status < 300:
+                    result['latencies'].append((time.perf_counter() - start) * 1000)
+                else:
+                    result['errors'] += 1
+                if not keep_alive:
+                    writer.close()
+                    connection = None
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                result['errors'] += 1
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return result
+
+
+async def read_response(reader):
+    # Renvoie (code HTTP, connexion réutilisable) après avoir lu tout le corps
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get('connection') != 'close'
@@ -0,0 +1,66 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from projects.imports import SoftDeskImporter, ImportFormatError
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        "Importe en flux un fichier NDJSON de projets, issues et commentaires "
+        "(format de /api/projects/<id>/export/). Les écritures sont faites par lots ; "
+        "avec --checkpoint, la position est enregistrée après chaque lot et "
+        "l'import reprend à cette position lorsqu'on le relance."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fichier NDJSON à importer")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--user-map-size', type=int, default=100_000,
+                            help="Nombre maximal de usernames gardés en mémoire")
+        parser.add_argument('--checkpoint', help="Fichier de reprise (créé ou relu)")
+
+    def handle(self, *args, **options):
+        checkpoint_path = options['checkpoint']
+        checkpoint = self.read_checkpoint(checkpoint_path)
+
+        def save_checkpoint(state):
+            # Écriture atomique : un arrêt brutal laisse l'ancien point de reprise intact
+            tmp_path = f"{checkpoint_path}.tmp"
+            with open(tmp_path, 'w') as tmp:
+                json.dump(state, tmp)
+            os.replace(tmp_path, checkpoint_path)
+            self.stdout.write(f"Ligne {state['line']} : {state['counts']}")
+
+        importer = SoftDeskImporter(
+            batch_size=options['batch_size'],
+            user_map_size=options['user_map_size'],
+            on_checkpoint=save_checkpoint if checkpoint_path else None,
+        )
+        if checkpoint:
+            importer.project = Project.objects.filter(pk=checkpoint['project_id']).first()
+            importer.counts = checkpoint['counts']
+            self.stdout.write(f"Reprise à la ligne {checkpoint['line'] + 1}")
+
+        with open(options['path'], 'rb') as source:
+            source.seek(checkpoint['offset'] if checkpoint else 0)
+            try:
+                counts = importer.run(
+                    source,
+                    line=checkpoint['line'] if checkpoint else 0,
+                    offset=checkpoint['offset'] if checkpoint else 0,
+                )
+            except ImportFormatError as e:
+                raise CommandError(f"{e} (les lots précédents sont conservés)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Import terminé : {counts['projects']} projets, {counts['contributors']} contributeurs, "
+            f"{counts['issues']} issues, {counts['comments']} commentaires."
+        ))
+
+    def read_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return None
+        with open(path) as checkpoint:
+            return json.load(checkpoint)
@@ -0,0 +1,81 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from projects.changes import changes_options
+from projects.models import Change, Project
+
+
+class Command(BaseCommand):
+    help = (
+        "Compacte le journal des modifications des projets : supprime les lignes remplacées par "
+        "une ligne plus récente du même objet (sans effet pour les clients, qui ne lisent que le "
+        "dernier état), puis les tombstones de plus de --days jours. Les curseurs antérieurs à un "
+        "tombstone purgé reçoivent ensuite 410. Petits lots, une courte transaction par lot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Rétention des tombstones (PROJECT_CHANGES)")
+        parser.add_argument('--batch-size', type=int, default=200, help="Objets ou lignes par lot")
+        parser.add_argument('--pause', type=float, default=0, help="Pause entre deux lots (secondes)")
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else changes_options()['RETENTION_DAYS']
+        superseded = self.prune_superseded(options['batch_size'], options['pause'])
+        tombstones = self.prune_tombstones(timezone.now() - timedelta(days=days), options['batch_size'], options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{superseded} ligne(s) remplacée(s) et {tombstones} tombstone(s) supprimé(s) ; "
+            f"{Change.objects.count()} ligne(s) restante(s)."
+        ))
+
+    def prune_superseded(self, batch_size, pause):
+        # Objets modifiés plusieurs fois : seule leur dernière ligne est conservée
+        groups = (
+            Change.objects.values('project_id', 'model', 'object_id')
+            .annotate(last_id=Max('id'), rows=Count('id')).filter(rows__gt=1).order_by()
+        )
+        deleted = 0
+        batch = []
+        for group in groups.iterator():
+            batch.append(group)
+            if len(batch) >= batch_size:
+                deleted += self.delete_superseded(batch)
+                batch = []
+                if pause:
+                    time.sleep(pause)
+        return deleted + self.delete_superseded(batch)
+
+    def delete_superseded(self, groups):
+        if not groups:
+            return 0
+        condition = Q()
+        for group in groups:
+            condition |= Q(
+                project_id=group['project_id'], model=group['model'],
+                object_id=group['object_id'], id__lt=group['last_id'],
+            )
+        with transaction.atomic():
+            return Change.objects.filter(condition).delete()[0]
+
+    def prune_tombstones(self, before, batch_size, pause):
+        expired = Change.objects.filter(action='deleted', created_time__lt=before).order_by('id')
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                rows = list(expired.values_list('id', 'project_id')[:batch_size])
+                if not rows:
+                    break
+                # L'horizon du projet avance avant que le tombstone disparaisse
+                horizons = {}
+                for change_id, project_id in rows:
+                    horizons[project_id] = max(horizons.get(project_id, 0), change_id)
+                for project_id, horizon in horizons.items():
+                    Project.objects.filter(pk=project_id).update(changes_horizon=Greatest('changes_horizon', Value(horizon)))
+                deleted += Change.objects.filter(pk__in=[change_id for change_id, _ in rows]).delete()[0]
+            if pause:
+                time.sleep(pause)
+        return deleted
@@ -0,0 +1,190 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from api.caching import CacheNamespace
+from .models import Project, Contributor
+
+
+# Cache inter-requêtes : user_id -> identifiants des projets dont il est contributeur.
+# Backend 'local' : LRU borné propre au processus, à TTL court (les signaux n'invalident que
+# le processus qui a fait l'écriture : un retrait est vu par les autres après TIMEOUT secondes) ;
+# backend 'django' : un cache de CACHES partagé par tous les processus (Redis, memcached),
+# avec un TTL plus long. Invalidé par les signaux de Contributor et Project (voir signals.py).
+class MembershipCache:
+    defaults = {
+        'BACKEND': 'local',
+        'CACHE_ALIAS': 'default',
+        'MAX_ENTRIES': 10000,
+        'TIMEOUT': 5,
+        'KEY_PREFIX': 'membership',
+    }
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def options(self):
+        return {**self.defaults, **getattr(settings, 'MEMBERSHIP_CACHE', {})}
+
+    def get_project_ids(self, user_id):
+        project_ids = self._get(user_id)
+        if project_ids is not None:
+            self.hits += 1
+            return project_ids
+        self.misses += 1
+        project_ids = frozenset(
+            Contributor.objects.filter(user_id=user_id).values_list('project_id', flat=True)
+        )
+        self._set(user_id, project_ids)
+        return project_ids
+
+    async def aget_project_ids(self, user_id):
+        # Variante pour les vues asynchrones : cache et ORM asynchrones
+        project_ids = await self._aget(user_id)
+        if project_ids is not None:
+            self.hits += 1
+            return project_ids
+        self.misses += 1
+        project_ids = frozenset([
+            project_id async for project_id in
+            Contributor.objects.filter(user_id=user_id).values_list('project_id', flat=True)
+        ])
+        await self._aset(user_id, project_ids)
+        return project_ids
+
+    def invalidate(self, user_id):
+        self._delete(user_id)
+        # Une requête concurrente a pu recharger l'ancienne valeur avant le commit
+        transaction.on_commit(lambda: self._delete(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self.hits = self.misses = 0
+        if self.options['BACKEND'] == 'django':
+            self._namespace().clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def _namespace(self):
+        options = self.options
+        return CacheNamespace(options['CACHE_ALIAS'], options['KEY_PREFIX'])
+
+    def _get(self, user_id):
+        options = self.options
+        if options['BACKEND'] == 'django':
+            namespace = self._namespace()
+            project_ids = namespace.cache.get(namespace.key(user_id))
+            return frozenset(project_ids) if project_ids is not None else None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, project_ids = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return project_ids
+
+    async def _aget(self, user_id):
+        options = self.options
+        if options['BACKEND'] == 'django':
+            namespace = self._namespace()
+            project_ids = await namespace.cache.aget(await namespace.akey(user_id))
+            return frozenset(project_ids) if project_ids is not None else None
+        return self._get(user_id)
+
+    async def _aset(self, user_id, project_ids):
+        options = self.options
+        if options['BACKEND'] == 'django':
+            namespace = self._namespace()
+            await namespace.cache.aset(await namespace.akey(user_id), list(project_ids), options['TIMEOUT'])
+            return
+        self._set(user_id, project_ids)
+
+    def _set(self, user_id, project_ids):
+        options = self.options
+        if options['BACKEND'] == 'django':
+            namespace = self._namespace()
+            namespace.cache.set(namespace.key(user_id), list(project_ids), options['TIMEOUT'])
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + options['TIMEOUT'], project_ids)
+            self._entries.move_to_end(user_id)
+            # Éviction des entrées les moins récemment utilisées
+            while len(self._entries) > options['MAX_ENTRIES']:
+                self._entries.popitem(last=False)
+
+    def _delete(self, user_id):
+        options = self.options
+        if options['BACKEND'] == 'django':
+            namespace = self._namespace()
+            namespace.cache.delete(namespace.key(user_id))
+            return
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+membership_cache = MembershipCache()
+
+
+# Appartenance d'utilisateurs à un projet, chargée une seule fois par requête
+class Membership:
+
+    def __init__(self, project, user):
+        self.project = project
+        self.user = user
+        # user_id -> contributeur ou non, mémorisé pour la durée de la requête
+        self._contributors = {}
+
+    @property
+    def is_author(self):
+        return self.project.author_id == self.user.id
+
+    @property
+    def is_contributor(self):
+        return self.is_contributor_user(self.user)
+
+    def is_contributor_user(self, user):
+        if user.id not in self._contributors:
+            self._contributors[user.id] = self.project.id in membership_cache.get_project_ids(user.id)
+        return self._contributors[user.id]
+
+    def has_member(self, user):
+        # Auteur ou contributeur : peut se voir assigner une issue
+        return user.id == self.project.author_id or self.is_contributor_user(user)
+
+    def prime(self, user_ids):
+        # Charge en une requête l'appartenance de plusieurs utilisateurs
+        missing = {user_id for user_id in user_ids if user_id not in self._contributors}
+        if not missing:
+            return
+        found = set(
+            Contributor.objects.filter(project_id=self.project.id, user_id__in=missing)
+            .values_list('user_id', flat=True)
+        )
+        for user_id in missing:
+            self._contributors[user_id] = user_id in found
+
+
+def get_membership(request, project):
+    # project : instance ou identifiant ; le résultat est mémorisé sur la requête
+    # pour être partagé entre permissions, serializers et vues
+    memberships = getattr(request, '_memberships', None)
+    if memberships is None:
+        memberships = request._memberships = {}
+    project_id = int(project.pk if isinstance(project, Project) else project)
+    if project_id not in memberships:
+        if not isinstance(project, Project):
+            project = get_object_or_404(Project, pk=project_id)
+        memberships[project_id] = Membership(project, request.user)
+    return memberships[project_id]
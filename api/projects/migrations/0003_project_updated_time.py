@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_updated_time(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Project.objects.update(updated_time=models.F('created_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_time, migrations.RunPython.noop),
+    ]
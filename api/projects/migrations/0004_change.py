@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:41
+
+from itertools import islice
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_changes(apps, schema_editor):
+    # Les données existantes entrent dans le journal : ?since=0 équivaut à une synchronisation complète
+    Change = apps.get_model('projects', 'Change')
+    sources = [
+        ('contributor', apps.get_model('projects', 'Contributor').objects.values_list('project_id', 'id')),
+        ('issue', apps.get_model('issues', 'Issue').objects.values_list('project_id', 'id')),
+        ('comment', apps.get_model('issues', 'Comment').objects.values_list('issue__project_id', 'uuid')),
+    ]
+    for model, rows in sources:
+        rows = rows.order_by('id').iterator(chunk_size=2000)
+        while batch := list(islice(rows, 2000)):
+            Change.objects.bulk_create([
+                Change(project_id=project_id, model=model, object_id=str(object_id), action='created')
+                for project_id, object_id in batch
+            ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_updated_time'),
+        ('issues', '0007_issue_comment_updated_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('issue', 'Issue'), ('comment', 'Commentaire'), ('contributor', 'Contributeur')], max_length=12)),
+                ('object_id', models.CharField(max_length=36)),
+                ('action', models.CharField(choices=[('created', 'Créé'), ('updated', 'Modifié'), ('deleted', 'Supprimé')], max_length=8)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'id'], name='change_project_cursor_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:52
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_issue_counters(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Issue = apps.get_model('issues', 'Issue')
+
+    def count(issues):
+        counts = issues.filter(project=OuterRef('pk')).order_by().values('project').annotate(count=Count('pk'))
+        return Coalesce(Subquery(counts.values('count'), output_field=IntegerField()), 0)
+
+    Project.objects.update(
+        issue_count=count(Issue.objects.all()),
+        open_issue_count=count(Issue.objects.exclude(progress='FINISHED')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_issue_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_issue_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='created_time',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='changes_horizon',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
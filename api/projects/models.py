@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class Project(models.Model):
@@ -19,6 +20,13 @@ class Project(models.Model):
         related_name='projects'
     )
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    # Compteurs dénormalisés, maintenus par issues.counters
+    issue_count = models.PositiveIntegerField(default=0, editable=False)
+    open_issue_count = models.PositiveIntegerField(default=0, editable=False)
+    # Plus grand identifiant de tombstone purgé du journal (prune_project_changes) :
+    # un curseur /changes/ inférieur a pu manquer une suppression
+    changes_horizon = models.BigIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.title
@@ -34,3 +42,35 @@ class Contributor(models.Model):
 
     class Meta:
         unique_together = ('user', 'project')
+
+
+# Journal compact des modifications d'un projet (issues, commentaires, contributeurs),
+# lu par /api/projects/<id>/changes/?since=<curseur>. L'identifiant auto-incrémenté
+# sert de curseur (retenu tant que des lignes récentes peuvent encore être validées,
+# voir changes.py) ; les suppressions sont conservées comme tombstones.
+# `manage.py prune_project_changes` compacte le journal et purge les vieux tombstones.
+class Change(models.Model):
+    MODEL_CHOICES = [
+        ('issue', 'Issue'),
+        ('comment', 'Commentaire'),
+        ('contributor', 'Contributeur'),
+    ]
+    ACTION_CHOICES = [
+        ('created', 'Créé'),
+        ('updated', 'Modifié'),
+        ('deleted', 'Supprimé'),
+    ]
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='changes')
+    model = models.CharField(max_length=12, choices=MODEL_CHOICES)
+    # id de l'issue ou du contributeur, uuid du commentaire
+    object_id = models.CharField(max_length=36)
+    action = models.CharField(max_length=8, choices=ACTION_CHOICES)
+    # Date d'insertion (et non de validation de la transaction)
+    created_time = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Lecture du journal d'un projet après un curseur
+            models.Index(fields=['project', 'id'], name='change_project_cursor_idx'),
+        ]
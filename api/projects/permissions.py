@@ -1,22 +1,24 @@
 from rest_framework.permissions import BasePermission
 from .models import Project
+from .membership import get_membership
 
 
 class IsContributor(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.contributors.filter(user=request.user).exists()
+        return get_membership(request, obj).is_contributor
 
 
 class IsAuthor(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user
+        return obj.author_id == request.user.id
 
 
 class IsAuthorOrContributor(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user or obj.contributors.filter(user=request.user).exists()
+        membership = get_membership(request, obj)
+        return membership.is_author or membership.is_contributor
 
 
 class IsProjectAuthor(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.project.author == request.user
+        return get_membership(request, obj.project_id).is_author
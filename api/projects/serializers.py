@@ -1,14 +1,22 @@
+from django.conf import settings
+from django.db.models import Prefetch
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Project, Contributor
 from rest_framework.exceptions import ValidationError
 from issues.models import Issue
+from issues.serializers import CommentSerializer
+from issues.counters import count_subquery
 from django.contrib.auth import get_user_model
+from api.serializers import EagerLoadingMixin, DynamicFieldsMixin
 
 User = get_user_model()
 
 
 # Serializer pour gérer les contributeurs
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    select_related_fields = ('user',)
+
     user = serializers.SlugRelatedField(
         queryset=User.objects.all(),
         slug_field='username'
@@ -32,11 +40,13 @@ class ContributorSerializer(serializers.ModelSerializer):
 
 
 # Serializer simple pour un projet (liste ou création)
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(DynamicFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    required_model_fields = ('created_time',)
+
     class Meta:
         model = Project
-        fields = ['id', 'title', 'description', 'type', 'created_time']
-        read_only_fields = ['id', 'author', 'created_time']  # ces champs ne peuvent pas être modifiés par l'utilisateur
+        fields = ['id', 'title', 'description', 'type', 'issue_count', 'open_issue_count', 'created_time']
+        read_only_fields = ['id', 'author', 'issue_count', 'open_issue_count', 'created_time']  # ces champs ne peuvent pas être modifiés par l'utilisateur
 
     def create(self, validated_data):
         # Crée le projet et ajoute automatiquement l'auteur comme contributeur
@@ -52,19 +62,91 @@ class NestedIssueSerializer(serializers.ModelSerializer):
         fields = ['id', 'title']
 
 
+# Nombre maximal de contributeurs et d'issues inclus dans le détail d'un projet
+def nested_limits():
+    return {'contributors': 20, 'issues': 20, **getattr(settings, 'PROJECT_DETAIL_NESTED_LIMITS', {})}
+
+
 # Serializer détaillé pour un projet (détails + contributeurs + issues)
-class ProjectSerializerDetail(serializers.ModelSerializer):
+# Les listes imbriquées sont limitées (nested_limits) ; *_count donne le total
+# et *_next le lien vers la page suivante de la sous-ressource paginée.
+class ProjectSerializerDetail(DynamicFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    # Auteur joint, contributeurs et issues chargés en une requête limitée chacun
+    select_related_fields = ('author',)
+    field_sources = {
+        'contributors_next': ('contributors_count',),
+        'issues_next': ('issue_count',),
+    }
+
     author = serializers.SlugRelatedField(read_only=True, slug_field='username')
-    contributors = ContributorSerializer(many=True, read_only=True)
-    issues = NestedIssueSerializer(many=True, read_only=True)
+    contributors = ContributorSerializer(many=True, read_only=True, source='nested_contributors')
+    contributors_count = serializers.IntegerField(read_only=True)
+    contributors_next = serializers.SerializerMethodField()
+    issues = NestedIssueSerializer(many=True, read_only=True, source='nested_issues')
+    # Compteur dénormalisé du projet (issues.counters)
+    issues_count = serializers.IntegerField(read_only=True, source='issue_count')
+    issues_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
-        fields = ['id', 'title', 'description', 'type', 'author', 'contributors', 'issues', 'created_time']
-        read_only_fields = ['id', 'author', 'created_time']
+        fields = [
+            'id', 'title', 'description', 'type', 'author',
+            'contributors', 'contributors_count', 'contributors_next',
+            'issues', 'issues_count', 'issues_next', 'open_issue_count', 'created_time',
+        ]
+        read_only_fields = ['id', 'author', 'open_issue_count', 'created_time']
+
+    @classmethod
+    def get_prefetch_related_fields(cls):
+        # Prefetch limités : la base ne renvoie que les premières lignes de chaque projet
+        # (ROW_NUMBER() par projet), dans l'ordre des sous-ressources paginées
+        limits = nested_limits()
+        contributors = Contributor.objects.select_related('user').order_by('id')
+        issues = Issue.objects.only('id', 'title', 'project').order_by('created_time', 'id')
+        return (
+            Prefetch('contributors', queryset=contributors[:limits['contributors']], to_attr='nested_contributors'),
+            Prefetch('issues', queryset=issues[:limits['issues']], to_attr='nested_issues'),
+        )
+
+    @classmethod
+    def get_annotations(cls):
+        # Sous-requête : pas de jointure multipliant les lignes du projet
+        return {'contributors_count': count_subquery(Contributor.objects.all(), 'project')}
+
+    def get_contributors_next(self, project):
+        return self.get_next_link(project, 'contributors', 'contributor_list_create', project.contributors_count)
+
+    def get_issues_next(self, project):
+        return self.get_next_link(project, 'issues', 'issues_list', project.issue_count)
+
+    def get_next_link(self, project, name, url_name, count):
+        limit = nested_limits()[name]
+        if count <= limit:
+            return None
+        url = f"{reverse(url_name, args=[project.pk])}?limit={limit}&offset={limit}"
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
     # Lors de la création, ajoute l'auteur comme contributeur
     def create(self, validated_data):
         project = Project.objects.create(**validated_data)
         Contributor.objects.create(user=project.author, project=project)
         return project
+
+
+# Représentations du flux de modifications (/changes/) : chaque objet porte
+# l'identifiant utilisé par les tombstones, et les commentaires leur issue
+class ChangeCommentSerializer(CommentSerializer):
+    select_related_fields = ('author',)
+
+    issue = serializers.PrimaryKeyRelatedField(read_only=True)
+    author = serializers.SlugRelatedField(read_only=True, slug_field='username')
+
+    class Meta(CommentSerializer.Meta):
+        fields = ['uuid', 'issue', 'title', 'description', 'author', 'created_time']
+
+
+class ChangeContributorSerializer(ContributorSerializer):
+    class Meta(ContributorSerializer.Meta):
+        fields = ['id', 'user']
+        read_only_fields = ['id', 'user']
@@ -0,0 +1,65 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from issues.models import Issue, Comment
+from .models import Project, Contributor, Change
+from .membership import membership_cache
+
+
+# Un contributeur ajouté ou retiré change les projets accessibles à l'utilisateur
+@receiver([post_save, post_delete], sender=Contributor)
+def invalidate_contributor_membership(sender, instance, **kwargs):
+    membership_cache.invalidate(instance.user_id)
+
+
+# La suppression d'un projet supprime aussi ses contributeurs (signal ci-dessus)
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_project_membership(sender, instance, **kwargs):
+    membership_cache.invalidate(instance.author_id)
+
+
+def deleted_with(origin, model):
+    # origin : instance ou queryset à l'origine d'une suppression en cascade
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(origin_model, model)
+
+
+# Journal des modifications (voir changes.py) ; les écritures en masse l'alimentent explicitement
+@receiver(post_save, sender=Issue)
+@receiver(post_save, sender=Contributor)
+def record_saved_change(sender, instance, created, **kwargs):
+    Change.objects.create(
+        project_id=instance.project_id, model=sender._meta.model_name, object_id=str(instance.pk),
+        action='created' if created else 'updated',
+    )
+
+
+@receiver(post_save, sender=Comment)
+def record_saved_comment(sender, instance, created, **kwargs):
+    Change.objects.create(
+        project_id=instance.issue.project_id, model='comment', object_id=str(instance.uuid),
+        action='created' if created else 'updated',
+    )
+
+
+# Les suppressions en cascade d'un projet effacent son journal ; celles d'une issue
+# n'ont pas besoin d'un tombstone par commentaire
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Contributor)
+def record_deleted_change(sender, instance, origin=None, **kwargs):
+    if origin is not None and deleted_with(origin, Project):
+        return
+    Change.objects.create(
+        project_id=instance.project_id, model=sender._meta.model_name, object_id=str(instance.pk),
+        action='deleted',
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def record_deleted_comment(sender, instance, origin=None, **kwargs):
+    if origin is not None and (deleted_with(origin, Project) or deleted_with(origin, Issue)):
+        return
+    Change.objects.create(
+        project_id=instance.issue.project_id, model='comment', object_id=str(instance.uuid),
+        action='deleted',
+    )
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.db.models.functions import Now
+from issues.models import Issue
+
+# Statistiques d'un projet calculées en base : une requête values().annotate() par regroupement
+
+
+def seconds(duration):
+    return round(duration.total_seconds(), 1) if duration is not None else None
+
+
+def project_stats(project):
+    issues = Issue.objects.filter(project=project).order_by()
+
+    def count_by(field):
+        rows = issues.values(field).annotate(count=Count('id')).order_by(field)
+        return {row[field]: row['count'] for row in rows}
+
+    # Temps passé dans l'état courant (depuis le dernier changement d'avancement)
+    # et, pour les issues terminées, délai entre création et passage à FINISHED
+    time_in_state = ExpressionWrapper(Now() - F('progress_updated_time'), output_field=DurationField())
+    resolution_time = ExpressionWrapper(F('progress_updated_time') - F('created_time'), output_field=DurationField())
+    progress = {}
+    average_resolution_time = None
+    for row in issues.values('progress').annotate(
+        count=Count('id'),
+        average_time_in_state=Avg(time_in_state),
+        average_resolution_time=Avg(resolution_time, filter=Q(progress='FINISHED')),
+    ).order_by('progress'):
+        progress[row['progress']] = {
+            'count': row['count'],
+            'average_time_in_state': seconds(row['average_time_in_state']),
+        }
+        if row['progress'] == 'FINISHED':
+            average_resolution_time = seconds(row['average_resolution_time'])
+
+    workload = [
+        {'assignee': row['assignee__username'], 'total': row['total'], 'open': row['open']}
+        for row in issues.values('assignee__username').annotate(
+            total=Count('id'),
+            open=Count('id', filter=~Q(progress='FINISHED')),
+        ).order_by('-open', 'assignee__username')
+    ]
+
+    return {
+        'project': project.id,
+        'total': sum(group['count'] for group in progress.values()),
+        'priority': count_by('priority'),
+        'balise': count_by('balise'),
+        'progress': progress,
+        'average_resolution_time': average_resolution_time,
+        'workload': workload,
+    }
+
+
+# Cache court optionnel (PROJECT_STATS_CACHE) ; la clé inclut updated_time du projet,
+# avancé par les créations, suppressions et changements d'avancement des issues
+def cached_project_stats(project):
+    options = {'CACHE_ALIAS': 'default', 'TIMEOUT': 0, **getattr(settings, 'PROJECT_STATS_CACHE', {})}
+    if not options['TIMEOUT']:
+        return project_stats(project)
+    cache = caches[options['CACHE_ALIAS']]
+    key = f"project_stats:{project.pk}:{project.updated_time.timestamp()}"
+    stats = cache.get(key)
+    if stats is None:
+        stats = project_stats(project)
+        cache.set(key, stats, options['TIMEOUT'])
+    return stats
@@ -1,15 +1,61 @@
-from rest_framework.test import APITestCase
-from rest_framework import status
-from django.urls import reverse
-from .models import Project, Contributor
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.caching import check_application_caches
+from api.testing import (
+    ProjectAPITestCase, QueryCountMixin, SoftDeskAPITestCase, create_issue, create_project, create_user,
+)
+from issues.models import Issue, Comment
+from issues.search import PostgresSearchBackend, SearchBackend, check_search_backend
+from .changes import collect_changes
+from .detail_cache import project_detail_cache
+from .management.commands.benchmark_servers import load
+from .membership import membership_cache, MembershipCache
+from .models import Project, Contributor, Change
 
 User = get_user_model()
 
+# Configuration avec Redis (CACHE_REDIS_URL), le cache partagé simulé par un LocMemCache
+# commun à toutes les instances du processus
+LOCMEM_SHARED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "shared"},
+}
+SHARED_MEMBERSHIP_CACHE = {"BACKEND": "django", "CACHE_ALIAS": "shared", "TIMEOUT": 300}
+
 
-class ProjectContributorTests(APITestCase):
+# Backend de recherche sans count() ni search(), refusé par la vérification au démarrage
+class IncompleteSearchBackend(SearchBackend):
+    pass
+
+
+class ProjectContributorTests(QueryCountMixin, APITestCase):
 
     def setUp(self):
+        # Le cache d'appartenance survit au rollback de la base entre deux tests
+        membership_cache.clear()
+
         # Création d'utilisateurs
         self.user1_data = {
             "username": "user1",
@@ -110,3 +156,662 @@ class ProjectContributorTests(APITestCase):
         response = self.client.delete(contributor_delete_url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertTrue(any("Vous ne pouvez pas supprimer l'auteur" in msg for msg in response.data))
+
+    # Le détail d'un projet charge contributeurs et issues sans requête par ligne
+    def test_project_detail_query_count_is_constant(self):
+        self.authenticate(self.user1_data)
+        response = self.client.post(reverse("project_list_create"), {"title": "Projet", "description": "Desc", "type": "BACKEND"}, format="json")
+        project = Project.objects.get(id=response.data["id"])
+        users = iter(User.objects.exclude(id=project.author_id))
+
+        def add_rows(count):
+            Contributor.objects.create(user=next(users), project=project)
+            Issue.objects.bulk_create([
+                Issue(title=f"Issue {i}", description="Desc", author=project.author, project=project)
+                for i in range(count)
+            ])
+
+        self.assertConstantQueries(reverse("project_view", args=[project.id]), add_rows)
+
+    @override_settings(PROJECT_DETAIL_CACHE={'TIMEOUT': 0})
+    # Sans contributeurs ni issues demandés, leurs trois prefetch (contributeurs, utilisateurs, issues) sont évités
+    def test_project_detail_sparse_fields(self):
+        self.authenticate(self.user1_data)
+        response = self.client.post(reverse("project_list_create"), {"title": "Projet", "description": "Desc", "type": "BACKEND"}, format="json")
+        url = reverse("project_view", args=[response.data["id"]])
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get(f"{url}?fields=id,title,author")
+        self.assertEqual(set(response.data), {"id", "title", "author"})
+        # Deux prefetch (contributeurs avec leur utilisateur, issues) et la version du cache en moins
+        self.assertEqual(len(sparse.captured_queries), len(full.captured_queries) - 3)
+
+    # Le détail d'un projet change d'ETag quand ses contributeurs ou ses issues changent
+    def test_project_detail_conditional_get(self):
+        self.authenticate(self.user1_data)
+        response = self.client.post(reverse("project_list_create"), {"title": "Projet", "description": "Desc", "type": "BACKEND"}, format="json")
+        project = Project.objects.get(id=response.data["id"])
+        url = reverse("project_view", args=[project.id])
+
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Contributor.objects.create(user=User.objects.get(username="user2"), project=project)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        Issue.objects.create(title="Bug", description="Desc", priority="LOW", balise="BUG", author=project.author, project=project)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        # Un contributeur renommé : nouvel ETag et réponse à jour (pas celle du cache)
+        contributor = User.objects.get(username="user2")
+        contributor.username = "user2-renamed"
+        contributor.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn({"user": "user2-renamed"}, response.data["contributors"])
+
+        list_etag = self.client.get(reverse("project_list_create"))["ETag"]
+        self.assertEqual(self.client.get(reverse("project_list_create"), HTTP_IF_NONE_MATCH=list_etag).status_code, 304)
+
+
+class MembershipCacheTests(SoftDeskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = create_user("author")
+        self.user = create_user("user")
+        self.project = create_project(self.author)
+
+    # Deuxième lecture servie par le cache, invalidée par l'ajout et le retrait d'un contributeur
+    @override_settings(CACHES=LOCMEM_SHARED_CACHES, MEMBERSHIP_CACHE=SHARED_MEMBERSHIP_CACHE)
+    def test_cache_hits_and_signal_invalidation(self):
+        membership_cache.clear()
+        self.assertEqual(membership_cache.get_project_ids(self.user.id), frozenset())
+        with self.assertNumQueries(0):
+            membership_cache.get_project_ids(self.user.id)
+        self.assertEqual(membership_cache.stats()["hits"], 1)
+        self.assertEqual(membership_cache.stats()["misses"], 1)
+
+        contributor = Contributor.objects.create(user=self.user, project=self.project)
+        self.assertEqual(membership_cache.get_project_ids(self.user.id), {self.project.id})
+
+        contributor.delete()
+        self.assertEqual(membership_cache.get_project_ids(self.user.id), frozenset())
+
+    # Retrait traité par un autre processus (autre instance du cache) : avec le cache partagé,
+    # l'accès est refusé ici aussi
+    @override_settings(CACHES=LOCMEM_SHARED_CACHES, MEMBERSHIP_CACHE=SHARED_MEMBERSHIP_CACHE)
+    def test_revocation_by_another_process(self):
+        membership_cache.clear()
+        contributor = Contributor.objects.create(user=self.user, project=self.project)
+        self.client.force_authenticate(self.user)
+        url = reverse("issues_list", args=[self.project.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with mock.patch("projects.signals.membership_cache", MembershipCache()):
+            contributor.delete()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    # La suppression du projet retire l'accès de ses contributeurs
+    def test_project_delete_invalidates_contributors(self):
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.assertEqual(membership_cache.get_project_ids(self.user.id), {self.project.id})
+        self.project.delete()
+        self.assertEqual(membership_cache.get_project_ids(self.user.id), frozenset())
+
+    # Le backend local évince l'entrée la moins récemment utilisée
+    @override_settings(MEMBERSHIP_CACHE={"BACKEND": "local", "MAX_ENTRIES": 1, "TIMEOUT": 300})
+    def test_local_backend_lru_eviction(self):
+        membership_cache.get_project_ids(self.author.id)
+        membership_cache.get_project_ids(self.user.id)
+        self.assertEqual(membership_cache.stats()["size"], 1)
+        with self.assertNumQueries(1):
+            membership_cache.get_project_ids(self.author.id)
+
+    # Le backend Django stocke les appartenances dans CACHES
+    @override_settings(
+        MEMBERSHIP_CACHE={"BACKEND": "django", "CACHE_ALIAS": "default", "TIMEOUT": 300},
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    )
+    def test_django_cache_backend(self):
+        membership_cache.clear()
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.assertEqual(membership_cache.get_project_ids(self.user.id), {self.project.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(membership_cache.get_project_ids(self.user.id), {self.project.id})
+
+    # clear() change de génération : les autres clés de l'alias (clichés...) sont conservées
+    @override_settings(CACHES=LOCMEM_SHARED_CACHES, MEMBERSHIP_CACHE=SHARED_MEMBERSHIP_CACHE)
+    def test_clear_keeps_other_keys(self):
+        caches["shared"].set("other", 1)
+        membership_cache.get_project_ids(self.user.id)
+        membership_cache.clear()
+        self.assertEqual(caches["shared"].get("other"), 1)
+        with self.assertNumQueries(1):
+            membership_cache.get_project_ids(self.user.id)
+
+    # Réglages livrés (sans Redis) : ni l'utilisateur ni ses projets ne sont relus en base
+    # d'une requête à l'autre (deux requêtes de moins que sans cache)
+    def test_shipped_settings_save_queries(self):
+        Contributor.objects.create(user=self.user, project=self.project)
+        client = self.client
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        url = reverse("issues_list", args=[self.project.id])
+
+        def second_request_queries():
+            self.assertEqual(client.get(url).status_code, status.HTTP_200_OK)
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(client.get(url).status_code, status.HTTP_200_OK)
+            return [query["sql"] for query in context.captured_queries]
+
+        cached = second_request_queries()
+        with override_settings(MEMBERSHIP_CACHE={"BACKEND": "local", "TIMEOUT": 0}, USER_SNAPSHOT_CACHE={"TIMEOUT": 0}):
+            membership_cache.clear()
+            uncached = second_request_queries()
+        self.assertEqual(len(cached), len(uncached) - 2)
+        self.assertFalse([sql for sql in cached if '"projects_contributor"' in sql])
+
+    # Un cache stocké en base est refusé au démarrage (manage.py check)
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "softdesk_cache"},
+        },
+        MEMBERSHIP_CACHE=SHARED_MEMBERSHIP_CACHE,
+    )
+    def test_database_cache_is_rejected(self):
+        errors = check_application_caches(None)
+        self.assertEqual([error.id for error in errors], ["api.E002"])
+
+
+class ProjectExportTests(ProjectAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.outsider = create_user("outsider")
+        for i in range(3):
+            issue = create_issue(self.project, self.author, title=f"Issue {i}", assignee=self.author)
+            Comment.objects.create(title="Com", description=f"Commentaire {i}", issue=issue, author=self.author)
+        self.export_url = reverse("project_export", args=[self.project.id])
+
+    # Export NDJSON : en-tête projet puis une ligne par issue avec ses commentaires
+    def test_export_ndjson(self):
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        records = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(records[0]["record"], "project")
+        self.assertEqual(records[0]["contributors"], ["author"])
+        self.assertEqual([record["title"] for record in records[1:]], ["Issue 0", "Issue 1", "Issue 2"])
+        self.assertEqual(records[1]["comments"][0]["description"], "Commentaire 0")
+
+    # Export CSV : une ligne par issue et par commentaire
+    def test_export_csv(self):
+        response = self.client.get(self.export_url, {"output": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["record"] for row in rows], ["issue", "comment"] * 3)
+        self.assertEqual(rows[1]["issue_id"], rows[0]["issue_id"])
+
+    # Même contrôle d'accès que le détail du projet
+    def test_export_forbidden_for_non_contributor(self):
+        self.client.force_authenticate(self.outsider)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SoftDeskImportTests(SoftDeskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = create_user("author")
+        self.member = create_user("member")
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_ndjson(self, records):
+        path = os.path.join(self.directory.name, "import.ndjson")
+        with open(path, "w") as source:
+            for record in records:
+                source.write((record if isinstance(record, str) else json.dumps(record)) + "\n")
+        return path
+
+    def issue(self, title, **extra):
+        return {"record": "issue", "title": title, "description": "Desc", "priority": "LOW",
+                "balise": "BUG", "author": "author", **extra}
+
+    # Import par lots : projet, contributeurs, issues et commentaires
+    def test_import_command(self):
+        path = self.write_ndjson([
+            {"record": "project", "title": "Legacy", "type": "BACKEND", "author": "author", "contributors": ["member"]},
+            self.issue("A", assignee="member", comments=[{"title": "C", "description": "D", "author": "member"}]),
+            self.issue("B"),
+            self.issue("C", progress="FINISHED"),
+        ])
+        call_command("import_softdesk", path, batch_size=2, stdout=io.StringIO())
+        project = Project.objects.get(title="Legacy")
+        self.assertEqual(set(project.contributors.values_list("user__username", flat=True)), {"author", "member"})
+        self.assertEqual(list(project.issues.order_by("id").values_list("title", flat=True)), ["A", "B", "C"])
+        self.assertEqual(Comment.objects.get().issue.title, "A")
+        self.assertEqual(membership_cache.get_project_ids(self.member.id), {project.id})
+
+    # Une erreur conserve les lots validés ; la relance repart du point de reprise
+    def test_import_command_resumes_from_checkpoint(self):
+        checkpoint = os.path.join(self.directory.name, "import.checkpoint")
+        records = [
+            {"record": "project", "title": "Legacy", "type": "BACKEND", "author": "author"},
+            self.issue("A"),
+            self.issue("B", assignee="inconnu"),
+            self.issue("C"),
+        ]
+        path = self.write_ndjson(records)
+        with self.assertRaises(CommandError):
+            call_command("import_softdesk", path, batch_size=2, checkpoint=checkpoint, stdout=io.StringIO())
+        self.assertEqual(list(Issue.objects.values_list("title", flat=True)), ["A"])
+
+        # Corrige la ligne fautive puis relance : seules les lignes suivantes sont importées
+        records[2] = self.issue("B")
+        self.write_ndjson(records)
+        call_command("import_softdesk", path, batch_size=2, checkpoint=checkpoint, stdout=io.StringIO())
+        self.assertEqual(list(Issue.objects.order_by("id").values_list("title", flat=True)), ["A", "B", "C"])
+        self.assertEqual(Project.objects.count(), 1)
+        self.assertEqual(set(Issue.objects.values_list("project__title", flat=True)), {"Legacy"})
+
+    # Upload NDJSON dans un projet existant, réservé à son auteur
+    def test_import_endpoint(self):
+        project = Project.objects.create(title="Projet", description="Desc", type="BACKEND", author=self.author)
+        Contributor.objects.create(user=self.author, project=project)
+        url = reverse("project_import", args=[project.id])
+        body = "\n".join(json.dumps(record) for record in [
+            {"record": "project", "title": "Ignoré", "type": "BACKEND", "author": "author"},
+            self.issue("A", comments=[{"title": "C", "description": "D", "author": "author"}]),
+            self.issue("B"),
+        ])
+
+        self.client.force_authenticate(self.member)
+        response = self.client.post(url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.author)
+        response = self.client.post(url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["counts"]["issues"], 2)
+        self.assertEqual(project.issues.count(), 2)
+
+        # member n'est pas contributeur du projet
+        response = self.client.post(url, json.dumps(self.issue("C", assignee="member")), content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("n'est pas contributeur", response.data["message"])
+
+
+# Journal servi sans délai de garde, sauf dans les tests qui le vérifient
+@override_settings(PROJECT_CHANGES={"SETTLE_SECONDS": 0, "RETENTION_DAYS": 30})
+class ProjectChangesTests(ProjectAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.member = create_user("member")
+        self.issue = create_issue(self.project, self.author)
+        self.comment = Comment.objects.create(title="Com", description="Desc", issue=self.issue, author=self.author)
+        self.changes_url = reverse("project_changes", args=[self.project.id])
+
+    # Depuis le début : tout le projet ; ensuite seulement le delta, tombstones compris
+    def test_changes_since_cursor(self):
+        response = self.client.get(self.changes_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([issue["id"] for issue in response.data["issues"]], [self.issue.id])
+        self.assertEqual(response.data["comments"][0]["issue"], self.issue.id)
+        self.assertEqual(len(response.data["contributors"]), 1)
+        cursor = response.data["cursor"]
+
+        response = self.client.get(self.changes_url, {"since": cursor})
+        self.assertEqual(response.data["issues"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+
+        other = Issue.objects.create(
+            title="Autre", description="Desc", priority="LOW", balise="BUG", author=self.author, project=self.project
+        )
+        self.issue.progress = "FINISHED"
+        self.issue.save()
+        issue_id = self.issue.id
+        self.issue.delete()
+        Contributor.objects.create(user=self.member, project=self.project)
+
+        response = self.client.get(self.changes_url, {"since": cursor})
+        self.assertEqual([issue["id"] for issue in response.data["issues"]], [other.id])
+        self.assertEqual(response.data["deleted"]["issues"], [issue_id])
+        # Commentaire supprimé avec son issue : pas de tombstone séparé
+        self.assertEqual(response.data["deleted"]["comments"], [])
+        self.assertEqual([c["user"] for c in response.data["contributors"]], ["member"])
+
+    # Les écritures en masse (bulk) alimentent aussi le journal
+    def test_bulk_writes_are_logged(self):
+        cursor = self.client.get(self.changes_url).data["cursor"]
+        bulk_url = reverse("issues_bulk", args=[self.project.id])
+        item = {"description": "Desc", "priority": "LOW", "balise": "BUG"}
+        created = self.client.post(bulk_url, [{**item, "title": "A"}, {**item, "title": "B"}], format="json").data["issues"]
+        self.client.patch(bulk_url, [{"id": created[0]["id"], "progress": "FINISHED"}], format="json")
+
+        response = self.client.get(self.changes_url, {"since": cursor})
+        self.assertEqual(
+            [(issue["id"], issue["progress"]) for issue in response.data["issues"]],
+            [(created[0]["id"], "FINISHED"), (created[1]["id"], "TODO")],
+        )
+
+    # Pagination du journal et contrôle d'accès
+    def test_changes_has_more_and_permissions(self):
+        first = collect_changes(self.project.id, 0, limit=2)
+        self.assertTrue(first["has_more"])
+        rest = collect_changes(self.project.id, first["cursor"], limit=2)
+        self.assertFalse(rest["has_more"])
+        self.assertEqual(rest["changed"]["comment"], [str(self.comment.uuid)])
+
+        response = self.client.get(self.changes_url, {"since": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.member)
+        self.assertEqual(self.client.get(self.changes_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    # Une ligne récente (transaction peut-être pas la seule en cours) retient le curseur,
+    # même si des lignes plus récentes sont déjà visibles
+    @override_settings(PROJECT_CHANGES={"SETTLE_SECONDS": 60, "RETENTION_DAYS": 30})
+    def test_recent_changes_hold_back_cursor(self):
+        old = timezone.now() - timedelta(minutes=5)
+        Change.objects.update(created_time=old)
+        cursor = self.client.get(self.changes_url).data["cursor"]
+        young = Issue.objects.create(
+            title="Récente", description="Desc", priority="LOW", balise="BUG", author=self.author, project=self.project
+        )
+        Change.objects.create(project=self.project, model="issue", object_id=str(self.issue.id), action="updated", created_time=old)
+
+        response = self.client.get(self.changes_url, {"since": cursor})
+        self.assertEqual(response.data["issues"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+        self.assertFalse(response.data["has_more"])
+
+        Change.objects.update(created_time=old)
+        response = self.client.get(self.changes_url, {"since": cursor})
+        self.assertEqual([issue["id"] for issue in response.data["issues"]], [self.issue.id, young.id])
+
+    # Compactage : le dernier état de chaque objet reste lisible depuis 0 ;
+    # un curseur antérieur à un tombstone purgé reçoit 410
+    def test_prune_project_changes(self):
+        stale_cursor = self.client.get(self.changes_url).data["cursor"]
+        for progress in ("INPROGRESS", "FINISHED"):
+            self.issue.progress = progress
+            self.issue.save()
+        other = Issue.objects.create(
+            title="Autre", description="Desc", priority="LOW", balise="BUG", author=self.author, project=self.project
+        )
+        other_id = other.id
+        other.delete()
+        Change.objects.filter(action="deleted").update(created_time=timezone.now() - timedelta(days=31))
+        cursor = self.client.get(self.changes_url, {"since": stale_cursor}).data["cursor"]
+
+        out = io.StringIO()
+        call_command("prune_project_changes", batch_size=1, stdout=out)
+        self.assertIn("3 ligne(s) remplacée(s) et 1 tombstone(s)", out.getvalue())
+        self.assertEqual(Change.objects.filter(model="issue").count(), 1)
+        self.project.refresh_from_db()
+        self.assertTrue(stale_cursor < self.project.changes_horizon <= cursor)
+
+        response = self.client.get(self.changes_url)
+        self.assertEqual([(issue["id"], issue["progress"]) for issue in response.data["issues"]], [(self.issue.id, "FINISHED")])
+        self.assertNotIn(other_id, response.data["deleted"]["issues"])
+        self.assertEqual(self.client.get(self.changes_url, {"since": stale_cursor}).status_code, status.HTTP_410_GONE)
+        self.assertEqual(self.client.get(self.changes_url, {"since": cursor}).status_code, status.HTTP_200_OK)
+
+
+class ProjectDetailCacheTests(ProjectAPITestCase):
+
+    def setUp(self):
+        # Les identifiants (projets, journal) sont réutilisés d'un test à l'autre
+        project_detail_cache.clear()
+        super().setUp()
+        self.outsider = create_user("outsider")
+        self.detail_url = reverse("project_view", args=[self.project.id])
+
+    def create_issue(self, title):
+        return create_issue(self.project, self.author, title=title)
+
+    # Le second appel est servi par le cache, sans charger contributeurs ni issues
+    def test_detail_served_from_cache(self):
+        self.create_issue("A")
+        first = self.client.get(self.detail_url)
+        with CaptureQueriesContext(connection) as context:
+            second = self.client.get(self.detail_url)
+        self.assertEqual(second.data, first.data)
+        self.assertFalse(any('"issues_issue"."title"' in query["sql"] for query in context.captured_queries))
+        self.assertEqual(project_detail_cache.stats(), {"hits": 1, "misses": 1})
+
+    # Issue, contributeur, écriture en masse ou modification du projet : nouvelle version
+    def test_cache_follows_changes(self):
+        self.client.get(self.detail_url)
+        issue = self.create_issue("A")
+        self.assertEqual([i["title"] for i in self.client.get(self.detail_url).data["issues"]], ["A"])
+
+        Contributor.objects.create(user=self.outsider, project=self.project)
+        self.assertEqual(len(self.client.get(self.detail_url).data["contributors"]), 2)
+
+        self.client.patch(reverse("issues_bulk", args=[self.project.id]), [{"id": issue.id, "title": "B"}], format="json")
+        self.assertEqual([i["title"] for i in self.client.get(self.detail_url).data["issues"]], ["B"])
+
+        self.client.put(self.detail_url, {"title": "Renommé"}, format="json")
+        self.assertEqual(self.client.get(self.detail_url).data["title"], "Renommé")
+
+    # Les permissions sont vérifiées avant le cache ; ?fields= ne passe pas par le cache
+    def test_cache_checks_permissions_and_skips_sparse_fields(self):
+        self.client.get(self.detail_url)
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(self.detail_url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.author)
+        response = self.client.get(self.detail_url, {"fields": "id,title"})
+        self.assertEqual(set(response.data), {"id", "title"})
+        self.assertEqual(set(self.client.get(self.detail_url).data), {
+            "id", "title", "description", "type", "author", "contributors", "contributors_count",
+            "contributors_next", "issues", "issues_count", "issues_next", "open_issue_count", "created_time"
+        })
+
+    # Listes imbriquées limitées par une requête fenêtrée, avec total et lien suivant
+    @override_settings(PROJECT_DETAIL_NESTED_LIMITS={"contributors": 1, "issues": 2})
+    def test_nested_lists_are_capped(self):
+        Contributor.objects.create(user=self.outsider, project=self.project)
+        issues = [self.create_issue(f"Issue {i}") for i in range(3)]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.detail_url)
+        self.assertEqual([issue["title"] for issue in response.data["issues"]], ["Issue 0", "Issue 1"])
+        self.assertEqual(response.data["issues_count"], 3)
+        self.assertEqual(len(response.data["contributors"]), 1)
+        self.assertEqual(response.data["contributors_count"], 2)
+        self.assertTrue(any("ROW_NUMBER()" in query["sql"] for query in context.captured_queries))
+
+        # Le lien suivant mène à la suite de chaque liste
+        response = self.client.get(response.data["issues_next"])
+        self.assertEqual([issue["id"] for issue in response.data["results"]], [issues[2].id])
+        response = self.client.get(self.client.get(self.detail_url).data["contributors_next"])
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([c["user"] for c in response.data["results"]], ["outsider"])
+        self.assertIsNone(response.data["next"])
+
+
+class ProjectStatsTests(ProjectAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.member = create_user("member")
+        Contributor.objects.create(user=self.member, project=self.project)
+        for priority, balise, assignee in (("LOW", "BUG", self.author), ("LOW", "TASK", self.member), ("HIGH", "BUG", self.member)):
+            create_issue(self.project, self.author, priority=priority, balise=balise, assignee=assignee)
+        self.stats_url = reverse("project_stats", args=[self.project.id])
+
+    # Regroupements calculés par quelques requêtes values().annotate()
+    @override_settings(PROJECT_STATS_CACHE={"TIMEOUT": 0})
+    def test_stats(self):
+        issue = Issue.objects.filter(assignee=self.member).first()
+        self.client.patch(reverse("issue_detail", args=[self.project.id, issue.id]), {"progress": "FINISHED"}, format="json")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.stats_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sum('"issues_issue"' in query["sql"] for query in context.captured_queries), 4)
+        self.assertEqual(response.data["total"], 3)
+        self.assertEqual(response.data["priority"], {"HIGH": 1, "LOW": 2})
+        self.assertEqual(response.data["balise"], {"BUG": 2, "TASK": 1})
+        self.assertEqual(response.data["progress"]["TODO"]["count"], 2)
+        self.assertGreaterEqual(response.data["progress"]["TODO"]["average_time_in_state"], 0)
+        self.assertIsNotNone(response.data["average_resolution_time"])
+        self.assertEqual(response.data["workload"], [
+            {"assignee": "author", "total": 1, "open": 1},
+            {"assignee": "member", "total": 2, "open": 1},
+        ])
+
+    # Le cache court est invalidé quand une issue est ajoutée au projet
+    @override_settings(PROJECT_STATS_CACHE={"TIMEOUT": 30})
+    def test_stats_cache(self):
+        self.assertEqual(self.client.get(self.stats_url).data["total"], 3)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.stats_url)
+        self.assertFalse(any('"issues_issue"' in query["sql"] for query in context.captured_queries))
+
+        Issue.objects.create(title="Issue", description="Desc", priority="LOW", balise="BUG", author=self.author, project=self.project)
+        self.assertEqual(self.client.get(self.stats_url).data["total"], 4)
+
+        self.client.force_authenticate(create_user("outsider"))
+        self.assertEqual(self.client.get(self.stats_url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ProjectSearchTests(ProjectAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.login = create_issue(
+            self.project, self.author, title="Échec de connexion", description="L'écran reste bloqué.", priority="HIGH"
+        )
+        self.export = create_issue(
+            self.project, self.author, title="Export CSV",
+            description="Ajouter la connexion au serveur distant dans l'export.", balise="FEATURE",
+        )
+        self.comment = Comment.objects.create(
+            title="Reproduit", description="Même échec sur mobile.", issue=self.export, author=self.author
+        )
+        other = create_project(self.author, title="Autre")
+        create_issue(other, self.author, title="Connexion", description="Autre projet")
+        self.search_url = reverse("project_search", args=[self.project.id])
+
+    def search(self, q, **params):
+        return self.client.get(self.search_url, {"q": q, **params})
+
+    # Index FTS : accents ignorés, titre mieux classé que la description, projet filtré
+    def test_search_ranked(self):
+        response = self.search("connexion")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([result["id"] for result in response.data["results"]], [self.login.id, self.export.id])
+        self.assertIn("[connexion]", response.data["results"][0]["snippet"].lower())
+
+        results = self.search("echec")
+        self.assertEqual(
+            {(result["type"], result["id"]) for result in results.data["results"]},
+            {("issue", self.login.id), ("comment", str(self.comment.uuid))},
+        )
+        # Le dernier mot est un préfixe ; la syntaxe FTS5 est neutralisée
+        self.assertEqual(self.search("expo").data["count"], 1)
+        self.assertEqual(self.search('connexion OR "').data["count"], 0)
+
+        page = self.search("connexion", limit=1)
+        self.assertEqual(page.data["count"], 2)
+        self.assertEqual(len(page.data["results"]), 1)
+        self.assertIsNotNone(page.data["next"])
+        self.assertEqual(self.search(" ").status_code, status.HTTP_400_BAD_REQUEST)
+
+    # L'index suit les écritures unitaires, en masse et les suppressions
+    def test_search_index_sync(self):
+        self.client.patch(
+            reverse("issue_detail", args=[self.project.id, self.login.id]), {"title": "Page blanche"}, format="json"
+        )
+        self.assertEqual(self.search("blanche").data["results"][0]["id"], self.login.id)
+        self.assertEqual(self.search("echec").data["count"], 1)
+
+        self.client.post(reverse("issues_bulk", args=[self.project.id]), [
+            {"title": "Lenteur", "description": "Tableau de bord", "priority": "LOW", "balise": "BUG"},
+        ], format="json")
+        self.assertEqual(self.search("tableau").data["count"], 1)
+
+        self.export.delete()
+        self.assertEqual(self.search("connexion").data["count"], 0)
+        self.assertEqual(self.search("mobile").data["count"], 0)
+
+        call_command("rebuild_search_index", stdout=io.StringIO())
+        self.assertEqual(self.search("blanche tableau").data["count"], 0)
+        self.assertEqual(self.search("bord").data["count"], 1)
+
+        self.client.force_authenticate(create_user("outsider"))
+        self.assertEqual(self.search("bord").status_code, status.HTTP_403_FORBIDDEN)
+
+    # PostgreSQL : les requêtes de recherche emploient l'expression des index GIN (migration 0013)
+    def test_postgres_search_uses_gin_indexes(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("Index GIN propres à PostgreSQL")
+        backend = PostgresSearchBackend()
+        query = backend.query(["echec"])
+        with connection.cursor() as cursor:
+            # Tables minuscules : le parcours séquentiel serait sinon préféré
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            for model, index in ((Issue, "issue_search_vector_idx"), (Comment, "comment_search_vector_idx")):
+                sql, params = backend.matching(model.objects.all(), query).query.sql_with_params()
+                cursor.execute(f"EXPLAIN {sql}", params)
+                self.assertIn(index, "\n".join(row[0] for row in cursor.fetchall()))
+
+    # Un SEARCH_BACKEND introuvable ou incomplet est signalé par manage.py check
+    def test_invalid_search_backend_check(self):
+        self.assertEqual(check_search_backend(None), [])
+        for backend in ("projects.tests.IncompleteSearchBackend", "issues.search.MissingBackend"):
+            with self.subTest(backend=backend), override_settings(SEARCH_BACKEND=backend):
+                self.assertEqual([error.id for error in check_search_backend(None)], ["issues.E001"])
+
+
+class BenchmarkServersCommandTests(TestCase):
+
+    def test_missing_servers_are_skipped(self):
+        User.objects.create_user(username="bench", password="Pass1234", birth_date="1990-01-01")
+        out = io.StringIO()
+        call_command("benchmark_servers", username="bench", wsgi="absent-wsgi {port}", asgi="absent-asgi {port}", stdout=out)
+        self.assertEqual(out.getvalue().count("introuvable"), 2)
+        with self.assertRaises(CommandError):
+            call_command("benchmark_servers", username="inconnu", stdout=io.StringIO())
+
+    # Le générateur de charge réutilise ses connexions (keep-alive) et lit les corps en entier
+    def test_load_generator(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            connections = set()
+
+            def do_GET(self):
+                Handler.connections.add(self.client_address)
+                body = b'{"ok": true}' if self.headers["Authorization"] == "Bearer token" else b"{}"
+                self.send_response(200 if body != b"{}" else 401)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            result = asyncio.run(load("127.0.0.1", server.server_port, "/", "token", 3, 0.3))
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(result["errors"], 0)
+        self.assertGreater(len(result["latencies"]), 3)
+        self.assertEqual(len(Handler.connections), 3)
@@ -2,11 +2,21 @@ from django.urls import path
 from .views import (
     ProjectListCreateView,
     ProjectDetailView,
-    ContributorView
+    ContributorView,
+    ProjectExportView,
+    ProjectImportView,
+    ProjectChangesView,
+    ProjectStatsView,
+    ProjectSearchView
 )
 
 urlpatterns = [
     path('', ProjectListCreateView.as_view(), name='project_list_create'),
     path('<int:project_id>/', ProjectDetailView.as_view(), name='project_view'),
     path('<int:project_id>/contributors/', ContributorView.as_view(), name='contributor_list_create'),
+    path('<int:project_id>/export/', ProjectExportView.as_view(), name='project_export'),
+    path('<int:project_id>/import/', ProjectImportView.as_view(), name='project_import'),
+    path('<int:project_id>/changes/', ProjectChangesView.as_view(), name='project_changes'),
+    path('<int:project_id>/stats/', ProjectStatsView.as_view(), name='project_stats'),
+    path('<int:project_id>/search/', ProjectSearchView.as_view(), name='project_search'),
 ]
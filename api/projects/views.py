@@ -1,23 +1,41 @@
 from django.shortcuts import render, get_object_or_404
+from django.http import StreamingHttpResponse
 from rest_framework import generics, status, serializers
 from .models import Project, Contributor
-from .serializers import ProjectSerializer, ProjectSerializerDetail, ContributorSerializer
+from .serializers import (
+    ProjectSerializer, ProjectSerializerDetail, ContributorSerializer,
+    ChangeCommentSerializer, ChangeContributorSerializer
+)
 from .permissions import IsAuthor, IsContributor, IsAuthorOrContributor, IsProjectAuthor
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import ValidationError, PermissionDenied, NotFound
+from rest_framework.exceptions import APIException, ValidationError, PermissionDenied, NotFound
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Q
+from django.db.models import Q, Count, Max
 from users.models import CustomUser
 from rest_framework.generics import GenericAPIView
-
-
-class ProjectListCreateView(generics.ListCreateAPIView):
+from rest_framework.pagination import LimitOffsetPagination
+from .membership import get_membership, membership_cache
+from .exports import EXPORT_FORMATS
+from .imports import SoftDeskImporter, ImportFormatError
+from .changes import collect_changes
+from .detail_cache import project_detail_cache
+from .stats import cached_project_stats
+from issues.models import Issue, Comment
+from issues.serializers import IssueSerializer
+from issues.search import SearchResults
+from api.pagination import CursorOrLimitOffsetPagination
+from api.conditional import ConditionalGetMixin, users_last_modified
+
+
+class ProjectListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET /api/projects/
 
     Récupère la liste de tous les projets de l'utilisateur connecté
     (qu’il soit contributeur ou auteur).
+    Pagination limit/offset par défaut, ou par curseur avec `?pagination=cursor&page_size=20`.
+    Réponse partielle avec `?fields=id,title` ou `?omit=description`.
 
     ---
     POST /api/projects/
@@ -48,20 +66,33 @@ class ProjectListCreateView(generics.ListCreateAPIView):
     serializer_class = ProjectSerializer
     # Un utilisateur doit être connecté et auteur OU contributeur du projet pour y accéder
     permission_classes = [IsAuthenticated, IsAuthorOrContributor]
+    # ?pagination=cursor pour paginer par curseur, limit/offset sinon
+    pagination_class = CursorOrLimitOffsetPagination
 
     def get_queryset(self):
         # Retourne uniquement les projets où l’utilisateur est contributeur ou auteur
-        return Project.objects.filter(contributors__user=self.request.user)
+        project_ids = membership_cache.get_project_ids(self.request.user.id)
+        return ProjectSerializer.setup_eager_loading(Project.objects.filter(id__in=project_ids), self.request)
+
+    def get_validator_state(self, request):
+        project_ids = membership_cache.get_project_ids(request.user.id)
+        state = Project.objects.filter(id__in=project_ids).aggregate(
+            last_modified=Max('updated_time'), count=Count('id')
+        )
+        return state['last_modified'], state['count']
 
     def perform_create(self, serializer):
         # Lors de la création, l’utilisateur connecté est défini comme auteur
         serializer.save(author=self.request.user)
 
 
-class ProjectDetailView(APIView):
+class ProjectDetailView(ConditionalGetMixin, APIView):
     """
     GET /api/projects/{project-id}/
     Récupère les détails d'un projet.
+    Contributeurs et issues imbriqués sont limités (PROJECT_DETAIL_NESTED_LIMITS) :
+    `contributors_count` / `issues_count` donnent le total et `*_next` la page suivante.
+    Réponse partielle avec `?fields=id,title` ou `?omit=issues,contributors`.
 
     PUT /api/projects/{project-id}/
     Met à jour les informations d'un projet.
@@ -81,20 +112,53 @@ class ProjectDetailView(APIView):
             return [IsAuthenticated(), IsAuthor()]
         return super().get_permissions()
 
-    def get_object(self, project_id):
+    def get_object(self, project_id, eager=False):
         # Récupère un projet par son ID ou renvoie 404
-        return get_object_or_404(Project, id=project_id)
+        # eager : charge aussi les relations affichées par le serializer détaillé
+        if not eager and getattr(self, 'project', None) is not None:
+            return self.project
+        queryset = Project.objects.all()
+        if eager:
+            queryset = self.serializer_class.setup_eager_loading(queryset, self.request)
+        return get_object_or_404(queryset, id=project_id)
+
+    def get_validator_state(self, request, project_id):
+        # Le détail inclut issues et contributeurs : leurs dernières modifications et
+        # leurs nombres entrent dans l'ETag (permissions vérifiées avant tout 304)
+        project = self.project = self.get_object(project_id)
+        self.check_object_permissions(request, project)
+        issues = project.issues.aggregate(last_modified=Max('updated_time'), count=Count('id'))
+        contributors = project.contributors.aggregate(count=Count('id'), last_id=Max('id'))
+        # Auteur et contributeurs sont affichés par leur username
+        self.users_last_modified = users_last_modified(
+            [project.author_id], project.contributors.values('user_id')
+        )
+        last_modified = max(filter(None, (project.updated_time, issues['last_modified'], self.users_last_modified)))
+        return last_modified, f"{issues['count']}:{contributors['count']}:{contributors['last_id']}"
 
     def get(self, request, project_id):
         # Consultation des détails d’un projet
+        # Les permissions sont vérifiées pour chaque utilisateur avant de servir le cache
         project = self.get_object(project_id)
         self.check_object_permissions(request, project)
-        serializer = self.serializer_class(project)
-        return Response(serializer.data)
+        if self.serializer_class.get_selected_fields(request) is not None:
+            # Réponse partielle (?fields= / ?omit=) : pas de cache
+            return Response(self.serialize(request, project_id))
+
+        key = project_detail_cache.key(project, request, self.users_last_modified)
+        data = project_detail_cache.get(key)
+        if data is None:
+            data = self.serialize(request, project_id)
+            project_detail_cache.set(key, data)
+        return Response(data)
+
+    def serialize(self, request, project_id):
+        project = self.get_object(project_id, eager=True)
+        return self.serializer_class(project, context={'request': request}).data
 
     def put(self, request, project_id):
         # Mise à jour des informations du projet (réservé à l’auteur)
-        project = self.get_object(project_id)
+        project = self.get_object(project_id, eager=True)
         self.check_object_permissions(request, project)
         serializer = self.serializer_class(project, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -113,6 +177,7 @@ class ContributorView(APIView):
     """
     GET /api/projects/{project-id}/contributors/
     Liste les contributeurs d’un projet.
+    Avec `?limit=20&offset=0`, la liste est paginée (lien "next" du détail du projet).
 
     POST /api/projects/{project-id}/contributors/
     Ajoute un nouveau contributeur (réservé à l’auteur du projet).
@@ -155,23 +220,28 @@ class ContributorView(APIView):
     permission_classes = [IsAuthenticated, IsAuthor]
 
     def get_queryset(self, project_id):
-        return Contributor.objects.filter(project_id=project_id)
+        return ContributorSerializer.setup_eager_loading(Contributor.objects.filter(project_id=project_id))
 
     def get(self, request, project_id):
         # Lister les contributeurs d’un projet
-        project = Project.objects.get(pk=project_id)
+        project = get_membership(request, project_id).project
         self.check_object_permissions(request, project)
 
-        contributors = self.get_queryset(project_id)
+        contributors = self.get_queryset(project_id).order_by('id')
+        if LimitOffsetPagination.limit_query_param in request.query_params:
+            paginator = LimitOffsetPagination()
+            page = paginator.paginate_queryset(contributors, request, view=self)
+            return paginator.get_paginated_response(ContributorSerializer(page, many=True).data)
         serializer = ContributorSerializer(contributors, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request, project_id):
         # Ajouter un contributeur
-        project = Project.objects.get(pk=project_id)
+        membership = get_membership(request, project_id)
+        project = membership.project
         self.check_object_permissions(request, project)
 
-        if project.author != request.user:
+        if not membership.is_author:
             raise PermissionDenied("Seul l'auteur du projet peut ajouter des contributeurs")
 
         serializer = ContributorSerializer(data=request.data, context={"project": project})
@@ -188,10 +258,11 @@ class ContributorView(APIView):
 
     def delete(self, request, project_id):
         # Supprimer un contributeur
-        project = Project.objects.get(pk=project_id)
+        membership = get_membership(request, project_id)
+        project = membership.project
         self.check_object_permissions(request, project)
 
-        if project.author != request.user:
+        if not membership.is_author:
             raise PermissionDenied("Seul l'auteur du projet peut supprimer des contributeurs")
 
         username = request.data.get("user")
@@ -208,7 +279,7 @@ class ContributorView(APIView):
         except Contributor.DoesNotExist:
             raise ValidationError({"user": "Cet utilisateur n’est pas contributeur de ce projet."})
 
-        if contributor.user == project.author:
+        if contributor.user_id == project.author_id:
             raise ValidationError("Vous ne pouvez pas supprimer l'auteur du projet.")
 
         contributor.delete()
@@ -219,3 +290,218 @@ class ContributorView(APIView):
         )
 
 
+class ProjectExportView(APIView):
+    """
+    GET /api/projects/{project-id}/export/?output=ndjson
+    GET /api/projects/{project-id}/export/?output=csv
+
+    Exporte le projet, ses issues et leurs commentaires (réservé aux contributeurs).
+    La réponse est envoyée en flux : les issues sont lues par paquets en base,
+    la mémoire utilisée ne dépend pas de la taille du projet.
+
+    ### Exemple de réponse (NDJSON, une ligne par enregistrement)
+    ```
+    {"record": "project", "id": 1, "title": "titre", "contributors": ["user1"], ...}
+    {"record": "issue", "id": 1, "title": "Bug", "comments": [{"uuid": "...", ...}], ...}
+    ```
+    """
+    permission_classes = [IsAuthenticated, IsAuthorOrContributor]
+
+    def get(self, request, project_id):
+        project = get_membership(request, project_id).project
+        self.check_object_permissions(request, project)
+
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Formats disponibles : {', '.join(EXPORT_FORMATS)}."})
+        export, content_type = EXPORT_FORMATS[output]
+
+        response = StreamingHttpResponse(export(project), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="project-{project.id}.{output}"'
+        return response
+
+
+class ProjectImportView(APIView):
+    """
+    POST /api/projects/{project-id}/import/
+    Importe des issues (et leurs commentaires) dans le projet (**réservé à l'auteur**).
+
+    Le corps est lu en flux au format NDJSON de l'export (la ligne "project" est ignorée)
+    et écrit par lots. Auteurs et assignés doivent être contributeurs du projet.
+    En cas d'erreur, les lots déjà écrits sont conservés : "line" indique
+    la dernière ligne importée, l'envoi peut reprendre à la ligne suivante.
+
+    ### Exemple de corps de requête
+    ```
+    {"record": "issue", "title": "Bug", "priority": "LOW", "balise": "BUG", "author": "user1", "comments": []}
+    ```
+
+    ### Exemple de réponse
+    ```json
+    {
+        "message": "Import terminé.",
+        "line": 1,
+        "counts": {"projects": 0, "contributors": 0, "issues": 1, "comments": 0}
+    }
+    ```
+    """
+    permission_classes = [IsAuthenticated, IsAuthor]
+    batch_size = 1000
+
+    def post(self, request, project_id):
+        project = get_membership(request, project_id).project
+        self.check_object_permissions(request, project)
+
+        checkpoint = {'line': 0}
+        importer = SoftDeskImporter(
+            project=project, batch_size=self.batch_size, on_checkpoint=checkpoint.update
+        )
+        try:
+            counts = importer.run(request.stream or [])
+        except ImportFormatError as e:
+            return Response(
+                {"message": str(e), "line": checkpoint['line'], "counts": importer.counts},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            {"message": "Import terminé.", "line": importer.line, "counts": counts},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class ChangesCursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Curseur expiré (journal purgé) : resynchroniser avec ?since=0."
+    default_code = 'cursor_expired'
+
+
+class ProjectChangesView(APIView):
+    """
+    GET /api/projects/{project-id}/changes/?since=<cursor>
+
+    Renvoie les issues, commentaires et contributeurs créés, modifiés ou supprimés
+    depuis le curseur (réservé aux contributeurs). Seul le dernier état de chaque objet
+    est renvoyé ; les suppressions apparaissent dans "deleted".
+    `?since=0` (ou absent) renvoie tout le contenu du projet. Tant que "has_more" vaut true,
+    rappeler l'endpoint avec le nouveau curseur. Les modifications des dernières secondes
+    (PROJECT_CHANGES['SETTLE_SECONDS']) sont servies à l'appel suivant.
+    Un curseur antérieur aux tombstones purgés (prune_project_changes) renvoie 410.
+
+    ### Exemple de réponse
+    ```json
+    {
+        "cursor": 42,
+        "has_more": false,
+        "issues": [{"id": 3, "title": "Bug", "progress": "FINISHED", ...}],
+        "comments": [{"uuid": "...", "issue": 3, "description": "...", ...}],
+        "contributors": [{"id": 7, "user": "user2"}],
+        "deleted": {"issues": [1], "comments": [], "contributors": []}
+    }
+    ```
+    """
+    permission_classes = [IsAuthenticated, IsAuthorOrContributor]
+
+    def get(self, request, project_id):
+        project = get_membership(request, project_id).project
+        self.check_object_permissions(request, project)
+
+        since = request.query_params.get('since', '0')
+        if not since.isdigit():
+            raise ValidationError({"since": "Le curseur doit être un entier positif."})
+        if 0 < int(since) < project.changes_horizon:
+            raise ChangesCursorExpired()
+        changes = collect_changes(project.id, int(since))
+        changed, deleted = changes['changed'], changes['deleted']
+
+        # Une requête par type d'objet modifié, quelle que soit la taille du projet
+        issues = IssueSerializer.setup_eager_loading(
+            Issue.objects.filter(project=project, id__in=changed['issue'])
+        ).order_by('id')
+        comments = ChangeCommentSerializer.setup_eager_loading(
+            Comment.objects.filter(issue__project=project, uuid__in=changed['comment'])
+        ).order_by('id')
+        contributors = ChangeContributorSerializer.setup_eager_loading(
+            Contributor.objects.filter(project=project, id__in=changed['contributor'])
+        ).order_by('id')
+        return Response({
+            "cursor": changes['cursor'],
+            "has_more": changes['has_more'],
+            "issues": IssueSerializer(issues, many=True).data,
+            "comments": ChangeCommentSerializer(comments, many=True).data,
+            "contributors": ChangeContributorSerializer(contributors, many=True).data,
+            "deleted": {
+                "issues": [int(issue_id) for issue_id in deleted['issue']],
+                "comments": deleted['comment'],
+                "contributors": [int(contributor_id) for contributor_id in deleted['contributor']],
+            },
+        })
+
+
+class ProjectStatsView(APIView):
+    """
+    GET /api/projects/{project-id}/stats/
+
+    Statistiques des issues du projet (réservé aux contributeurs), calculées en base :
+    répartition par priorité, balise et avancement, charge par assigné,
+    temps moyen passé dans l'état courant et délai moyen de résolution (en secondes).
+
+    ### Exemple de réponse
+    ```json
+    {
+        "project": 1,
+        "total": 3,
+        "priority": {"HIGH": 1, "LOW": 2},
+        "balise": {"BUG": 3},
+        "progress": {
+            "FINISHED": {"count": 1, "average_time_in_state": 3600.0},
+            "TODO": {"count": 2, "average_time_in_state": 86400.0}
+        },
+        "average_resolution_time": 7200.0,
+        "workload": [{"assignee": "user1", "total": 3, "open": 2}]
+    }
+    ```
+    """
+    permission_classes = [IsAuthenticated, IsAuthorOrContributor]
+
+    def get(self, request, project_id):
+        project = get_membership(request, project_id).project
+        self.check_object_permissions(request, project)
+        return Response(cached_project_stats(project))
+
+
+class ProjectSearchView(APIView):
+    """
+    GET /api/projects/{project-id}/search/?q=<mots>
+
+    Recherche plein texte dans les titres et descriptions des issues et commentaires
+    du projet (réservé aux contributeurs). Tous les mots doivent apparaître, le dernier
+    pouvant être un début de mot ; les accents sont ignorés.
+    Résultats classés par pertinence, paginés par `?limit=` et `?offset=`.
+
+    ### Exemple de réponse
+    ```json
+    {
+        "count": 2,
+        "next": null,
+        "previous": null,
+        "results": [
+            {"type": "issue", "id": 3, "issue": 3, "title": "Connexion impossible",
+             "snippet": "…écran de [connexion] bloqué…", "score": 2.41},
+            {"type": "comment", "id": "0b6f…", "issue": 3, "title": "Reproduit",
+             "snippet": "…même souci de [connexion]…", "score": 1.12}
+        ]
+    }
+    ```
+    """
+    permission_classes = [IsAuthenticated, IsAuthorOrContributor]
+
+    def get(self, request, project_id):
+        project = get_membership(request, project_id).project
+        self.check_object_permissions(request, project)
+
+        results = SearchResults(project.id, request.query_params.get('q'))
+        if not results.terms:
+            raise ValidationError({"q": "Indiquez au moins un mot à rechercher."})
+        paginator = LimitOffsetPagination()
+        page = paginator.paginate_queryset(results, request, view=self)
+        return paginator.get_paginated_response(page)
@@ -0,0 +1,13 @@
+from api.async_views import AsyncAPIView
+from .serializers import CustomUserSerializer
+
+
+class AsyncUserMeView(AsyncAPIView):
+    """
+    GET /api/async/users/me/
+
+    Variante asynchrone (ASGI) de GET /api/users/me/.
+    """
+
+    async def get(self, request):
+        return self.render(CustomUserSerializer(self.drf_request.user).data)
@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from api.caching import CacheNamespace
+from .models import CustomUser, UserSnapshot
+
+
+# Cache inter-requêtes des utilisateurs authentifiés : user_id -> valeurs de tous les champs
+# sauf le mot de passe, dans le cache CACHE_ALIAS : propre au processus avec un TTL court par
+# défaut, partagé par tous les processus (Redis, memcached) avec un TTL plus long.
+# L'utilisateur est reconstruit en UserSnapshot, en lecture seule et sans champ à relire.
+# Invalidé par les signaux de CustomUser (voir signals.py) et par CustomUser.objects.update()
+# (voir models.py) dans le cache de ce processus ; les autres processus avec un cache local et
+# toute écriture SQL hors de l'ORM voient la modification au plus tard après TIMEOUT secondes.
+class UserSnapshotCache:
+    defaults = {
+        'CACHE_ALIAS': 'default',
+        'TIMEOUT': 5,
+        'KEY_PREFIX': 'user_snapshot',
+    }
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def options(self):
+        return {**self.defaults, **getattr(settings, 'USER_SNAPSHOT_CACHE', {})}
+
+    @property
+    def namespace(self):
+        options = self.options
+        return CacheNamespace(options['CACHE_ALIAS'], options['KEY_PREFIX'])
+
+    @property
+    def fields(self):
+        # Dans l'ordre des champs du modèle, attendu par from_db
+        return [field.attname for field in CustomUser._meta.concrete_fields if field.attname != 'password']
+
+    def _snapshot(self, values):
+        if values is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        fields = self.fields
+        return UserSnapshot.from_db(DEFAULT_DB_ALIAS, fields, [values[name] for name in fields])
+
+    def get(self, user_id):
+        # Utilisateur reconstruit depuis le cache, ou None
+        if not self.options['TIMEOUT']:
+            return None
+        namespace = self.namespace
+        return self._snapshot(namespace.cache.get(namespace.key(user_id)))
+
+    async def aget(self, user_id):
+        # Variante pour les vues asynchrones : API asynchrone du cache (cache en base)
+        if not self.options['TIMEOUT']:
+            return None
+        namespace = self.namespace
+        return self._snapshot(await namespace.cache.aget(await namespace.akey(user_id)))
+
+    def load(self, **lookup):
+        # Lecture de tous les champs sauf le mot de passe, puis mise en cache
+        user = UserSnapshot.objects.defer('password').get(**lookup)
+        self.set(user)
+        return user
+
+    async def aload(self, **lookup):
+        user = await UserSnapshot.objects.defer('password').aget(**lookup)
+        await self.aset(user)
+        return user
+
+    def _values(self, user):
+        return {field: getattr(user, field) for field in self.fields}
+
+    def set(self, user):
+        if self.options['TIMEOUT']:
+            namespace = self.namespace
+            namespace.cache.set(namespace.key(user.pk), self._values(user), self.options['TIMEOUT'])
+
+    async def aset(self, user):
+        if self.options['TIMEOUT']:
+            namespace = self.namespace
+            await namespace.cache.aset(await namespace.akey(user.pk), self._values(user), self.options['TIMEOUT'])
+
+    def invalidate(self, *user_ids):
+        if not user_ids:
+            return
+        namespace = self.namespace
+        keys = [namespace.key(user_id) for user_id in user_ids]
+        namespace.cache.delete_many(keys)
+        # Une requête concurrente a pu remettre l'ancienne valeur avant le commit
+        transaction.on_commit(lambda: namespace.cache.delete_many(keys))
+
+    def clear(self):
+        self.namespace.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+user_snapshot_cache = UserSnapshotCache()
+
+
+# JWTAuthentication sans lecture de CustomUser à chaque requête : le token est vérifié
+# comme d'habitude, l'utilisateur vient de user_snapshot_cache (TTL court).
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        # La révocation au changement de mot de passe compare le hash : pas de cliché
+        if jwt_settings.CHECK_REVOKE_TOKEN or jwt_settings.USER_ID_FIELD != 'id':
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        user = user_snapshot_cache.get(user_id)
+        if user is None:
+            try:
+                user = user_snapshot_cache.load(id=user_id)
+            except CustomUser.DoesNotExist:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
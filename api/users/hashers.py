@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Hasheurs de mots de passe dont le coût vient de settings.PASSWORD_HASHING (par environnement).
+# Même nom d'algorithme que les hasheurs de Django : les mots de passe existants restent valides.
+# Quand le coût configuré change (ou l'algorithme préféré, premier de PASSWORD_HASHERS),
+# must_update() le signale et Django re-hache le mot de passe à la connexion suivante
+# (check_password de ModelBackend, utilisé par /api/token/).
+
+
+def hashing_option(name, default):
+    value = getattr(settings, 'PASSWORD_HASHING', {}).get(name)
+    return default if value is None else int(value)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return hashing_option('PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+
+    @property
+    def time_cost(self):
+        return hashing_option('ARGON2_TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return hashing_option('ARGON2_MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return hashing_option('ARGON2_PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+
+    @property
+    def rounds(self):
+        return hashing_option('BCRYPT_ROUNDS', hashers.BCryptSHA256PasswordHasher.rounds)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+
+    @property
+    def work_factor(self):
+        return hashing_option('SCRYPT_WORK_FACTOR', hashers.ScryptPasswordHasher.work_factor)
+
+
+# Option de coût principale de chaque algorithme (benchmark_auth --work-factors)
+COST_OPTIONS = {
+    'pbkdf2_sha256': 'PBKDF2_ITERATIONS',
+    'argon2': 'ARGON2_TIME_COST',
+    'bcrypt_sha256': 'BCRYPT_ROUNDS',
+    'scrypt': 'SCRYPT_WORK_FACTOR',
+}
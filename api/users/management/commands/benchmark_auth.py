@@ -0,0 +1,86 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.views import TokenObtainPairView
+from users.hashers import COST_OPTIONS
+from users.views import SignupView
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le coût du hasheur de mots de passe configuré (PASSWORD_HASHING) et le débit "
+        "des inscriptions (/api/signup/) et des connexions (/api/token/), dans une transaction "
+        "annulée à la fin. --work-factors compare plusieurs coûts pour dimensionner la capacité."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help="Requêtes par mesure")
+        parser.add_argument(
+            '--work-factors', type=int, nargs='*', default=[],
+            help="Coûts à comparer (itérations PBKDF2, time_cost Argon2, rounds bcrypt, N scrypt)",
+        )
+
+    def handle(self, *args, **options):
+        # Le p95 des connexions demande au moins deux mesures
+        if options['requests'] < 2:
+            raise CommandError("--requests doit valoir au moins 2")
+        algorithm = get_hasher().algorithm
+        option = COST_OPTIONS.get(algorithm)
+        factors = options['work_factors'] if option else []
+        self.stdout.write(f"Hasheur : {algorithm} ({self.describe(get_hasher())})")
+        self.stdout.write(
+            f"{'coût':<22}{'hachage (ms)':>14}{'inscriptions/s':>16}{'connexions/s':>14}{'p95 connexion (ms)':>20}"
+        )
+        for factor in factors or [None]:
+            overrides = {**settings.PASSWORD_HASHING, option: factor} if factor is not None else settings.PASSWORD_HASHING
+            with override_settings(PASSWORD_HASHING=overrides):
+                self.measure(self.describe(get_hasher()), options['requests'])
+        self.stdout.write("Un cœur traite environ 1000 / (hachage en ms) connexions par seconde.")
+
+    def describe(self, hasher):
+        # Paramètres de coût tels qu'ils apparaissent dans le hash
+        return ', '.join(
+            f"{name}={value}" for name, value in hasher.safe_summary(make_password('x', hasher=hasher)).items()
+            if name not in ('algorithm', 'salt', 'hash', 'checksum')
+        )
+
+    def measure(self, label, requests):
+        hash_times = []
+        for _ in range(max(3, requests // 4)):
+            start = time.perf_counter()
+            check_password('benchmark', make_password('benchmark'))
+            hash_times.append((time.perf_counter() - start) * 1000 / 2)
+
+        factory = APIRequestFactory()
+        signup, token = SignupView.as_view(), TokenObtainPairView.as_view()
+        with transaction.atomic():
+            signups = self.run(requests, lambda i: signup(factory.post('/api/signup/', {
+                'username': f'bench-auth-{i}', 'password': 'BenchPass123', 'birth_date': '1990-01-01',
+                'can_be_contacted': 'no', 'can_data_be_shared': 'no',
+            }, format='json')))
+            logins = self.run(requests, lambda i: token(factory.post('/api/token/', {
+                'username': f'bench-auth-{i}', 'password': 'BenchPass123',
+            }, format='json')))
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{label:<22}{statistics.median(hash_times):>14.1f}{requests / sum(signups) * 1000:>16.1f}"
+            f"{requests / sum(logins) * 1000:>14.1f}{statistics.quantiles(logins, n=20)[18]:>20.1f}"
+        )
+
+    def run(self, requests, call):
+        # Durées (ms) des requêtes, qui doivent toutes réussir
+        durations = []
+        for i in range(requests):
+            start = time.perf_counter()
+            response = call(i)
+            durations.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(f"Réponse {response.status_code} : {response.data}")
+        return durations
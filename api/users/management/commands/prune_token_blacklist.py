@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from users.models import RevokedToken
+from users.tokens import blacklist_stats, expiry_bucket
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime de la liste noire des refresh tokens les tranches déjà expirées, "
+        "par petits lots (une courte transaction par lot) pour ne pas bloquer les rafraîchissements."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0, help="Pause entre deux lots (secondes)")
+
+    def handle(self, *args, **options):
+        current = expiry_bucket(time.time())
+        expired = RevokedToken.objects.filter(expiry_bucket__lt=current)
+        deleted = 0
+        while True:
+            # Clés lues dans l'index de la tranche, puis supprimées par clé primaire
+            with transaction.atomic():
+                keys = list(expired.values_list('pk', flat=True)[:options['batch_size']])
+                if not keys:
+                    break
+                deleted += RevokedToken.objects.filter(pk__in=keys).delete()[0]
+            if options['pause']:
+                time.sleep(options['pause'])
+        stats = blacklist_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"{deleted} entrée(s) expirée(s) supprimée(s) ; {stats['size']} restante(s) "
+            f"sur {stats['buckets']} tranche(s)."
+        ))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('jti_hash', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('expiry_bucket', models.IntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expiry_bucket'], name='revoked_token_bucket_idx')],
+            },
+        ),
+    ]
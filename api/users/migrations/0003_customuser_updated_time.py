@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
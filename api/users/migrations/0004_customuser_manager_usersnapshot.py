@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:00
+
+import users.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_customuser_updated_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSnapshot',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('users.customuser',),
+            managers=[
+                ('objects', users.models.CustomUserManager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name='customuser',
+            managers=[
+                ('objects', users.models.CustomUserManager()),
+            ],
+        ),
+    ]
@@ -1,16 +1,68 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
 from datetime import date
 
 
+# update() n'envoie aucun signal : les clichés d'authentification (authentication.py)
+# des utilisateurs modifiés sont invalidés ici, par exemple après une désactivation en masse
+class CustomUserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        from .authentication import user_snapshot_cache
+        user_ids = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        user_snapshot_cache.invalidate(*user_ids)
+        return rows
+
+
+class CustomUserManager(UserManager.from_queryset(CustomUserQuerySet)):
+    pass
+
+
 class CustomUser(AbstractUser):
     birth_date = models.DateField()
     can_be_contacted = models.BooleanField(default=False)
     can_data_be_shared = models.BooleanField(default=False)
     created_time = models.DateTimeField(auto_now_add=True)
+    # Version du username affiché dans les réponses des autres ressources (ETag, cache du détail)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    objects = CustomUserManager()
 
     def age(self):
         today = date.today()
         return today.year - self.birth_date.year - (
             (today.month, today.day) < (self.birth_date.month, self.birth_date.day)
         )
+
+
+# Utilisateur authentifié reconstruit depuis le cache (authentication.py) : tous les champs
+# sauf le mot de passe, en lecture seule. Une écriture passe par une instance lue en base.
+class UserSnapshot(CustomUser):
+
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise TypeError("Cliché d'authentification en lecture seule : relire l'utilisateur en base")
+
+    def delete(self, *args, **kwargs):
+        raise TypeError("Cliché d'authentification en lecture seule : relire l'utilisateur en base")
+
+    def refresh_from_db(self, *args, **kwargs):
+        # Seul le mot de passe est différé : pas de lecture implicite depuis un cliché
+        raise TypeError("Cliché d'authentification en lecture seule : relire l'utilisateur en base")
+
+
+# Liste noire compacte des refresh tokens déjà utilisés (rotation, voir tokens.py) :
+# une empreinte de 8 octets du jti comme clé primaire et la tranche horaire d'expiration,
+# sans table des tokens émis. `manage.py prune_token_blacklist` supprime les tranches expirées.
+class RevokedToken(models.Model):
+    jti_hash = models.BigIntegerField(primary_key=True)
+    # exp // 3600 : toutes les entrées d'une tranche expirent ensemble
+    expiry_bucket = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expiry_bucket'], name='revoked_token_bucket_idx'),
+        ]
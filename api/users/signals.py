@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import user_snapshot_cache
+from .models import CustomUser
+
+
+# Cliché d'authentification (authentication.py) : toute écriture de l'utilisateur l'invalide
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    user_snapshot_cache.invalidate(instance.pk)
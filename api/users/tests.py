@@ -1,7 +1,19 @@
-from rest_framework.test import APITestCase
-from rest_framework import status
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
-from .models import CustomUser
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.testing import SoftDeskAPITestCase, create_issue, create_project, create_user
+from projects.models import Contributor
+from .authentication import user_snapshot_cache
+from .models import CustomUser, RevokedToken, UserSnapshot
+from .tokens import refresh_metrics
 
 
 class UserFlowTests(APITestCase):
@@ -85,3 +97,209 @@ class UserFlowTests(APITestCase):
         }, format="json")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertIn("detail", response.data)
+
+
+class UserIssuesTests(SoftDeskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = create_user("worker")
+        self.other = create_user("other")
+        self.projects = []
+        for i in range(3):
+            project = create_project(self.other, self.user, title=f"Projet {i}")
+            self.projects.append(project)
+            for progress in ("TODO", "FINISHED"):
+                create_issue(
+                    project, self.other, title=f"{project.title} {progress}", progress=progress, assignee=self.user
+                )
+        create_issue(self.projects[0], self.other, title="Pas pour moi", assignee=self.other)
+        # Plus contributeur : les issues encore assignées de ce projet disparaissent
+        Contributor.objects.filter(user=self.user, project=self.projects[2]).delete()
+        self.url = reverse("user_issues")
+        self.client.force_authenticate(self.user)
+
+    def test_my_issues_across_projects(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Une requête pour la page, sans requête par projet ni par issue
+        self.assertEqual(sum('FROM "issues_issue"' in query["sql"] for query in context.captured_queries), 1)
+        self.assertEqual(
+            [issue["title"] for issue in response.data["results"]],
+            ["Projet 1 FINISHED", "Projet 1 TODO", "Projet 0 FINISHED"],
+        )
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual([issue["title"] for issue in response.data["results"]], ["Projet 0 TODO"])
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get(self.url, {"progress": "TODO"})
+        self.assertEqual([issue["title"] for issue in response.data["results"]], ["Projet 1 TODO", "Projet 0 TODO"])
+        response = self.client.get(self.url, {"project": self.projects[0].id})
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(self.client.get(self.url, {"project": "abc"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get(self.url, {"progress": "TODO", "project": self.projects[0].id}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_my_issues_query_plan(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN est propre à SQLite")
+        for params in ({}, {"progress": "TODO"}, {"project": self.projects[0].id}, {"created_after": "2000-01-01"}):
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(self.url, params)
+            sql = next(query["sql"] for query in context.captured_queries if 'FROM "issues_issue"' in query["sql"])
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = " | ".join(row[-1] for row in cursor.fetchall())
+            self.assertNotIn("SCAN issues_issue", plan, params)
+            self.assertNotIn("TEMP B-TREE", plan, params)
+
+
+class UserSnapshotCacheTests(SoftDeskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = create_user("cached")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        self.me_url = reverse("user_me")
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, sum('"users_customuser"' in query["sql"] for query in context.captured_queries)
+
+    # Une seule lecture de l'utilisateur, puis plus aucune tant que le cliché est valide
+    def test_snapshot_saves_user_query(self):
+        self.assertEqual(self.user_queries()[1], 1)
+        response, queries = self.user_queries()
+        self.assertEqual(queries, 0)
+        self.assertEqual(response.data["username"], "cached")
+        self.assertEqual(user_snapshot_cache.stats(), {"hits": 1, "misses": 1})
+
+    # Les écritures de /api/users/me/ (et toute autre sauvegarde) invalident le cliché
+    def test_snapshot_invalidation(self):
+        self.user_queries()
+        response = self.client.patch(self.me_url, {"username": "renamed", "can_be_contacted": True}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response, queries = self.user_queries()
+        self.assertEqual(queries, 1)
+        self.assertEqual(response.data["username"], "renamed")
+        self.assertTrue(CustomUser.objects.get(pk=self.user.pk).check_password("Pass1234"))
+
+        # update() n'envoie pas de signal : le queryset invalide lui-même les clichés
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        user = CustomUser.objects.get(pk=self.user.pk)
+        user.is_active = True
+        user.save()
+        self.user_queries()
+        self.assertEqual(self.client.delete(self.me_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    # Le cliché est complet (aucune lecture différée) et refuse toute écriture
+    def test_snapshot_is_read_only(self):
+        self.user_queries()
+        snapshot = user_snapshot_cache.get(self.user.pk)
+        self.assertIsInstance(snapshot, UserSnapshot)
+        with self.assertNumQueries(0):
+            self.assertEqual((snapshot.email, snapshot.date_joined), (self.user.email, self.user.date_joined))
+        for write in (snapshot.save, snapshot.delete, snapshot.refresh_from_db):
+            with self.assertRaises(TypeError):
+                write()
+
+    # clear() change de génération : les autres clés de l'alias (appartenances...) sont conservées
+    def test_clear_keeps_other_keys(self):
+        self.user_queries()
+        cache = user_snapshot_cache.namespace.cache
+        cache.set("other", 1)
+        user_snapshot_cache.clear()
+        self.assertEqual(cache.get("other"), 1)
+        self.assertIsNone(user_snapshot_cache.get(self.user.pk))
+
+
+class TokenBlacklistTests(APITestCase):
+
+    def setUp(self):
+        refresh_metrics.clear()
+        self.user = CustomUser.objects.create_user(username="rotating", password="Pass1234", birth_date="1990-01-01")
+        response = self.client.post(reverse("token_obtain_pair"), {"username": "rotating", "password": "Pass1234"}, format="json")
+        self.refresh = response.data["refresh"]
+        self.refresh_url = reverse("token_refresh")
+
+    # Rotation : le refresh token présenté est révoqué, son rejeu est refusé
+    def test_refresh_rotation_blacklists_token(self):
+        response = self.client.post(self.refresh_url, {"refresh": self.refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data["refresh"], self.refresh)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+        replay = self.client.post(self.refresh_url, {"refresh": self.refresh}, format="json")
+        self.assertEqual(replay.status_code, status.HTTP_401_UNAUTHORIZED)
+        rotated = self.client.post(self.refresh_url, {"refresh": response.data["refresh"]}, format="json")
+        self.assertEqual(rotated.status_code, status.HTTP_200_OK)
+
+        # Utilisateur supprimé : 401 et non plus erreur serveur ; la révocation est annulée
+        self.user.delete()
+        response = self.client.post(self.refresh_url, {"refresh": rotated.data["refresh"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(RevokedToken.objects.count(), 2)
+
+        admin = CustomUser.objects.create_superuser(username="admin", password="Pass1234", birth_date="1990-01-01")
+        self.client.force_authenticate(admin)
+        metrics = self.client.get(reverse("token_metrics")).data
+        self.assertEqual(metrics["blacklist"], {"size": 2, "buckets": 1, "expired": 0})
+        self.assertEqual(metrics["refresh"]["count"], 4)
+        self.assertEqual(metrics["refresh"]["rejected"], 2)
+        self.client.force_authenticate(CustomUser.objects.create_user(username="lambda", password="Pass1234", birth_date="1990-01-01"))
+        self.assertEqual(self.client.get(reverse("token_metrics")).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_prune_expired_buckets(self):
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti_hash=i, expiry_bucket=10 + i % 3) for i in range(25)]
+            + [RevokedToken(jti_hash=100, expiry_bucket=10 ** 8)]
+        )
+        out = StringIO()
+        call_command("prune_token_blacklist", batch_size=10, stdout=out)
+        self.assertIn("25 entrée(s)", out.getvalue())
+        self.assertEqual(list(RevokedToken.objects.values_list("jti_hash", flat=True)), [100])
+
+
+class PasswordHashingTests(APITestCase):
+
+    def setUp(self):
+        self.token_url = reverse("token_obtain_pair")
+        self.credentials = {"username": "hashed", "password": "StrongPass123"}
+
+    def login(self):
+        response = self.client.post(self.token_url, self.credentials, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return CustomUser.objects.get(username="hashed").password
+
+    def test_rehash_on_login_when_cost_changes(self):
+        with override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, "PBKDF2_ITERATIONS": 1000}):
+            CustomUser.objects.create_user(birth_date="1990-01-01", **self.credentials)
+            self.assertTrue(self.login().startswith("pbkdf2_sha256$1000$"))
+        with override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, "PBKDF2_ITERATIONS": 2000}):
+            self.assertTrue(self.login().startswith("pbkdf2_sha256$2000$"))
+
+    def test_rehash_on_login_when_algorithm_changes(self):
+        pbkdf2 = {**settings.PASSWORD_HASHING, "PBKDF2_ITERATIONS": 1000, "SCRYPT_WORK_FACTOR": 2 ** 10}
+        with override_settings(PASSWORD_HASHING=pbkdf2):
+            CustomUser.objects.create_user(birth_date="1990-01-01", **self.credentials)
+        scrypt_first = ["users.hashers.ScryptPasswordHasher", "users.hashers.PBKDF2PasswordHasher"]
+        with override_settings(PASSWORD_HASHING=pbkdf2, PASSWORD_HASHERS=scrypt_first):
+            self.assertTrue(self.login().startswith("scrypt$"))
+            # Le mot de passe re-haché reste valide
+            self.assertTrue(self.login().startswith("scrypt$"))
+
+    def test_benchmark_auth_leaves_no_users(self):
+        out = StringIO()
+        with override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, "PBKDF2_ITERATIONS": 1000}):
+            call_command("benchmark_auth", requests=3, work_factors=[1000, 2000], stdout=out)
+        self.assertIn("iterations=2000", out.getvalue())
+        self.assertFalse(CustomUser.objects.filter(username__startswith="bench-auth-").exists())
@@ -0,0 +1,105 @@
+import hashlib
+import time
+from collections import deque
+from threading import Lock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .models import RevokedToken
+
+# Durée d'une tranche d'expiration de la liste noire (secondes)
+BUCKET_SECONDS = 3600
+
+
+def jti_hash(jti):
+    # 64 premiers bits du SHA-256 du jti, en entier signé (BigIntegerField)
+    return int.from_bytes(hashlib.sha256(jti.encode()).digest()[:8], 'big', signed=True)
+
+
+def expiry_bucket(timestamp):
+    return int(timestamp) // BUCKET_SECONDS
+
+
+def revoke(token):
+    # Insertion seule : une clé déjà présente signifie que le token a déjà servi.
+    # L'unicité de la clé primaire rend le rejeu concurrent impossible.
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(
+                jti_hash=jti_hash(token[jwt_settings.JTI_CLAIM]),
+                expiry_bucket=expiry_bucket(token['exp']),
+            )
+    except IntegrityError:
+        raise InvalidToken("Token is blacklisted")
+
+
+def blacklist_stats():
+    # Taille de la table et part des entrées expirées (à purger)
+    current = expiry_bucket(time.time())
+    buckets = RevokedToken.objects.aggregate(size=Count('pk'), buckets=Count('expiry_bucket', distinct=True))
+    expired = RevokedToken.objects.filter(expiry_bucket__lt=current).count()
+    return {**buckets, 'expired': expired}
+
+
+# Latence des rafraîchissements de token, mesurée dans le processus
+class RefreshMetrics:
+    window = 1000
+
+    def __init__(self):
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.count = self.rejected = 0
+            self.latencies = deque(maxlen=self.window)
+
+    def record(self, seconds, accepted):
+        with self._lock:
+            self.count += 1
+            self.rejected += not accepted
+            self.latencies.append(seconds * 1000)
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 3) if latencies else None
+
+        return {
+            'count': self.count,
+            'rejected': self.rejected,
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95),
+            'max_ms': round(latencies[-1], 3) if latencies else None,
+        }
+
+
+refresh_metrics = RefreshMetrics()
+
+
+# TokenRefreshSerializer avec liste noire : en rotation (ROTATE_REFRESH_TOKENS et
+# BLACKLIST_AFTER_ROTATION), le refresh token présenté est révoqué dans la même
+# transaction que l'émission du nouveau ; un token déjà utilisé est refusé (401).
+class BlacklistingTokenRefreshSerializer(TokenRefreshSerializer):
+
+    def validate(self, attrs):
+        start = time.perf_counter()
+        accepted = False
+        try:
+            with transaction.atomic():
+                if jwt_settings.ROTATE_REFRESH_TOKENS and jwt_settings.BLACKLIST_AFTER_ROTATION:
+                    revoke(self.token_class(attrs['refresh']))
+                data = super().validate(attrs)
+            accepted = True
+            return data
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        finally:
+            refresh_metrics.record(time.perf_counter() - start, accepted)
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import SignupView, UserMeView
+from .views import SignupView, UserMeView, UserIssuesView
 
 urlpatterns = [
     path('signup/', SignupView.as_view(), name='signup'),
     path('users/me/', UserMeView.as_view(), name='user_me'),
+    path('users/me/issues/', UserIssuesView.as_view(), name='user_issues'),
 ]
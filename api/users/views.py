@@ -2,8 +2,16 @@ from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from .models import CustomUser
 from .serializers import SignupSerializer, CustomUserSerializer
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework import generics
+from api.filters import IndexedFilterBackend
+from api.pagination import CreatedTimeCursorPagination
+from issues.models import Issue
+from issues.serializers import IssueSerializer
+from projects.models import Contributor
+from .tokens import blacklist_stats, refresh_metrics
 
 
 class SignupView(APIView):
@@ -136,9 +144,13 @@ class UserMeView(APIView):
         serializer = CustomUserSerializer(request.user)
         return Response(serializer.data)
 
+    def get_user(self, request):
+        # request.user est un cliché en lecture seule (authentication.py) : écritures sur l'utilisateur lu en base
+        return CustomUser.objects.get(pk=request.user.pk)
+
     def put(self, request):
         # Mise à jour complète du profil (tous les champs doivent être envoyés)
-        serializer = CustomUserSerializer(request.user, data=request.data, partial=False)
+        serializer = CustomUserSerializer(self.get_user(request), data=request.data, partial=False)
         if serializer.is_valid():
             serializer.save()  # Enregistre les modifications
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -147,7 +159,7 @@ class UserMeView(APIView):
 
     def patch(self, request):
         # Mise à jour partielle (un ou plusieurs champs seulement)
-        serializer = CustomUserSerializer(request.user, data=request.data, partial=True)
+        serializer = CustomUserSerializer(self.get_user(request), data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -155,9 +167,70 @@ class UserMeView(APIView):
 
     def delete(self, request):
         # Suppression définitive du compte de l’utilisateur connecté
-        user = request.user
+        user = self.get_user(request)
         user.delete()
         return Response(
             {"message": "Utilisateur supprimé avec succès"},
             status=status.HTTP_200_OK
         )
+
+
+class UserIssuesView(generics.ListAPIView):
+    """
+    GET /api/users/me/issues/
+
+    Issues assignées à l’utilisateur connecté, tous projets confondus,
+    limitées aux projets dont il est encore contributeur.
+    Pagination par curseur (`?cursor=`, `?page_size=`), des plus récentes aux plus anciennes.
+    Filtres : `?progress=`, `?project=<id>` (un seul à la fois), `?created_after=` / `?created_before=`.
+    Réponse partielle avec `?fields=id,title` ou `?omit=description`.
+
+    ### Exemple de réponse
+    ```json
+    {
+        "next": "http://localhost:8000/api/users/me/issues/?cursor=cD0yMDI1...",
+        "previous": null,
+        "results": [
+            {"id": 12, "title": "Bug de connexion", "project": 3, "progress": "TODO", ...}
+        ]
+    }
+    ```
+    """
+    serializer_class = IssueSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = CreatedTimeCursorPagination
+    filter_backends = [IndexedFilterBackend]
+    filter_fields = {'progress': 'progress', 'project': 'project'}
+    range_fields = {'created': 'created_time'}
+    ordering_fields = ('created_time',)
+    index_prefix = ('assignee',)
+
+    def get_queryset(self):
+        # Une seule requête : index (assignee, created_time, id), appartenance vérifiée
+        # par une sous-requête sur les contributeurs plutôt que par une permission par issue
+        user = self.request.user
+        member_projects = Contributor.objects.filter(user=user).values('project_id')
+        issues = Issue.objects.filter(assignee=user, project__in=member_projects).order_by('created_time', 'id')
+        return IssueSerializer.setup_eager_loading(issues, self.request)
+
+
+class TokenMetricsView(APIView):
+    """
+    GET /api/token/metrics/
+
+    Métriques de la liste noire des refresh tokens (réservé aux administrateurs) :
+    taille de la table, entrées expirées en attente de purge, et latence des
+    rafraîchissements traités par ce processus.
+
+    ### Exemple de réponse
+    ```json
+    {
+        "blacklist": {"size": 1520, "buckets": 168, "expired": 12},
+        "refresh": {"count": 340, "rejected": 2, "p50_ms": 3.1, "p95_ms": 7.8, "max_ms": 21.4}
+    }
+    ```
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"blacklist": blacklist_stats(), "refresh": refresh_metrics.stats()})